@@ -0,0 +1,77 @@
+"""
+Gate application benchmark
+
+Measures the time to apply a single mode and a two mode gate to an
+n-mode density matrix with the reference loop implementation
+(ops.apply_gate_loop) and the batched kernel (ops.apply_gate_BLAS)
+over a grid of mode numbers and cutoffs.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from qureed._math.fock import ops
+
+KERNELS = {
+    "loop": ops.apply_gate_loop,
+    "batched": ops.apply_gate_BLAS,
+}
+
+
+def measure(kernel, mat, state, modes, n, cutoff, repeat: int) -> float:
+    """
+    Returns the best time of repeat applications in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kernel(mat, state, modes, n, cutoff)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gate application.")
+    parser.add_argument("--modes", nargs="+", type=int, default=[2, 3, 4])
+    parser.add_argument("--cutoffs", nargs="+", type=int, default=[3, 5, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--max-elements",
+        type=int,
+        default=10**8,
+        help="Skip states with more density matrix elements",
+    )
+    parser.add_argument("--kernels", nargs="+", default=list(KERNELS), choices=KERNELS)
+    args = parser.parse_args()
+
+    print(
+        f"{'modes':>5} {'cutoff':>6} {'gate':>5} "
+        + " ".join(f"{k:>12}" for k in args.kernels)
+        + f" {'speedup':>8}"
+    )
+    for n in args.modes:
+        for cutoff in args.cutoffs:
+            if cutoff ** (2 * n) > args.max_elements:
+                continue
+            state = ops.vacuumStateMixed(n, cutoff)
+            gates = [("1", ops.displacement(0.3, 0.1, cutoff), [0])]
+            if n > 1:
+                bs = ops.beamsplitter(np.pi / 4, 0, cutoff).transpose((0, 2, 1, 3))
+                gates.append(("2", bs, [0, 1]))
+            for name, mat, modes in gates:
+                times = [
+                    measure(KERNELS[k], mat, state, modes, n, cutoff, args.repeat)
+                    for k in args.kernels
+                ]
+                speedup = times[0] / times[-1]
+                print(
+                    f"{n:>5} {cutoff:>6} {name:>5} "
+                    + " ".join(f"{t * 1e3:>10.3f}ms" for t in times)
+                    + f" {speedup:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
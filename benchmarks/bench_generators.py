@@ -0,0 +1,90 @@
+"""
+Gate generator benchmark
+
+Measures the time to generate the beam splitter with the serial loop
+recurrence (column by column in the input photon numbers) and with
+ops.beamsplitter, which runs the recurrence shell by shell in the total
+photon number and generates the rows of a shell in parallel.
+"""
+
+import argparse
+import time
+
+import numba
+import numpy as np
+from numba import njit
+
+from qureed._math.fock import ops
+
+
+@njit(cache=True)
+def beamsplitter_loop(theta, phi, cutoff):
+    """
+    Serial recurrence over the input photon numbers p and q
+    """
+    sqrt_values = np.sqrt(np.arange(cutoff, dtype=np.complex128))
+    cos_theta = np.cos(theta)
+    sin_theta_complex = np.sin(theta) * np.exp(1j * phi)
+    B = np.zeros((cutoff, cutoff, cutoff, cutoff), dtype=np.complex128)
+    B[0, 0, 0, 0] = 1.0
+    for p in range(1, cutoff):
+        for m in range(p + 1):
+            n = p - m
+            B[m, n, p, 0] = (1 / sqrt_values[p]) * (
+                cos_theta * sqrt_values[m] * B[m - 1, n, p - 1, 0]
+                + sin_theta_complex * sqrt_values[n] * B[m, n - 1, p - 1, 0]
+            )
+    for p in range(cutoff):
+        for q in range(1, cutoff):
+            for m in range(max(0, p + q - cutoff + 1), min(cutoff, p + q + 1)):
+                n = p + q - m
+                B[m, n, p, q] = (1 / sqrt_values[q]) * (
+                    -np.conj(sin_theta_complex) * sqrt_values[m] * B[m - 1, n, p, q - 1]
+                    + cos_theta * sqrt_values[n] * B[m, n - 1, p, q - 1]
+                )
+    return B
+
+
+KERNELS = {
+    "loop": beamsplitter_loop,
+    "shells": ops.beamsplitter,
+}
+
+
+def measure(kernel, cutoff, repeat: int) -> float:
+    """
+    Returns the best time of repeat generations in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kernel(np.pi / 5, 0.3, cutoff)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the gate generators.")
+    parser.add_argument("--cutoffs", nargs="+", type=int, default=[10, 20, 30, 40])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for kernel in KERNELS.values():
+        np.testing.assert_allclose(
+            kernel(np.pi / 5, 0.3, 6), ops.beamsplitter(np.pi / 5, 0.3, 6)
+        )
+    print(f"threads: {numba.get_num_threads()}, layer: {numba.threading_layer()}")
+    print(
+        f"{'cutoff':>6} " + " ".join(f"{k:>12}" for k in KERNELS) + f" {'speedup':>8}"
+    )
+    for cutoff in args.cutoffs:
+        times = [measure(k, cutoff, args.repeat) for k in KERNELS.values()]
+        print(
+            f"{cutoff:>6} "
+            + " ".join(f"{t * 1e3:>10.3f}ms" for t in times)
+            + f" {times[0] / times[-1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Scheduler benchmark
+
+Measures the event throughput of the scheduler implementations with the
+classic hold model: the queue is filled with N pending events, then every
+operation pops the earliest event and schedules a new one in the future,
+so the number of pending events stays constant.
+"""
+
+import argparse
+import random
+import time
+
+from qureed.simulation import CalendarQueueScheduler, HeapScheduler
+from qureed.simulation.simulation import SimulationEvent
+
+SCHEDULERS = {
+    "heap": HeapScheduler,
+    "calendar": CalendarQueueScheduler,
+}
+
+
+class BenchmarkDevice:
+    """
+    Placeholder device, events only need a hashable device
+    """
+
+
+def hold(scheduler, pending: int, operations: int, devices) -> float:
+    """
+    Runs the hold model and returns processed events per second
+    """
+    rng = random.Random(42)
+    mean_separation = 1_000_000
+    for _ in range(pending):
+        scheduler.push(
+            SimulationEvent(
+                int(rng.expovariate(1 / (mean_separation * pending))),
+                rng.choice(devices),
+            )
+        )
+    start = time.perf_counter()
+    for _ in range(operations):
+        event = scheduler.pop()
+        scheduler.push(
+            SimulationEvent(
+                event.event_time + int(rng.expovariate(1 / mean_separation)) + 1,
+                event.device,
+            )
+        )
+    elapsed = time.perf_counter() - start
+    return operations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the DES schedulers.")
+    parser.add_argument("--min-exponent", type=int, default=3)
+    parser.add_argument("--max-exponent", type=int, default=7)
+    parser.add_argument(
+        "--operations", type=int, default=100_000, help="Hold operations per run"
+    )
+    parser.add_argument(
+        "--schedulers", nargs="+", default=list(SCHEDULERS), choices=SCHEDULERS
+    )
+    args = parser.parse_args()
+
+    devices = [BenchmarkDevice() for _ in range(100)]
+    print(f"{'pending':>10} " + " ".join(f"{s:>14}" for s in args.schedulers))
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        pending = 10**exponent
+        rates = []
+        for name in args.schedulers:
+            scheduler = SCHEDULERS[name]()
+            rates.append(hold(scheduler, pending, args.operations, devices))
+            del scheduler
+        print(f"{pending:>10} " + " ".join(f"{r:>10.0f} ev/s" for r in rates))
+
+
+if __name__ == "__main__":
+    main()
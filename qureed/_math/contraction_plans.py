@@ -0,0 +1,145 @@
+"""
+Contraction plan cache for einsum based state reductions
+
+Building the subscript string and searching for the optimal contraction
+path is done once per (operation, number of modes, target modes, dtype,
+shapes), later calls reuse the stored plan.
+"""
+
+import string
+from dataclasses import dataclass
+
+import numpy as np
+
+from qureed._math.lru import LRUCache
+
+indices = string.ascii_lowercase
+
+
+@dataclass(frozen=True)
+class ContractionPlan:
+    """
+    Subscripts and the precomputed contraction path
+    """
+
+    subscripts: str
+    path: list
+
+
+class ContractionPlanCache(LRUCache):
+    """
+    Bounded LRU cache of contraction plans
+    """
+
+    def plan(self, operation: str, n: int, modes, build, *operands):
+        """
+        Returns the plan of the operation, build(n, modes) returns the
+        subscripts of the operation when the plan is not cached
+        """
+        if modes is not None:
+            modes = tuple(modes)
+        dtype = np.result_type(*operands)
+        shapes = tuple(operand.shape for operand in operands)
+        key = (operation, n, modes, dtype, shapes)
+
+        def create():
+            subscripts = build(n, modes)
+            path, _ = np.einsum_path(subscripts, *operands, optimize="optimal")
+            return ContractionPlan(subscripts, path)
+
+        return self.get_or_create(key, create)
+
+    def contract(self, operation: str, n: int, modes, build, *operands):
+        """
+        Contracts the operands following the cached plan
+        """
+        plan = self.plan(operation, n, modes, build, *operands)
+        return np.einsum(plan.subscripts, *operands, optimize=plan.path)
+
+
+plan_cache = ContractionPlanCache(maxsize=1024)
+
+
+def trace_subscripts(n, modes=None):
+    """
+    Full trace of an n-mode density matrix
+    """
+    # pylint: disable=unused-argument
+    return "".join(indices[i] * 2 for i in range(n))
+
+
+def partial_trace_subscripts(n, modes):
+    """
+    Traces the modes out of an n-mode density matrix
+    """
+    left_str = [
+        indices[2 * i] + indices[2 * i] if i in modes else indices[2 * i : 2 * i + 2]
+        for i in range(n)
+    ]
+    out_str = ["" if i in modes else indices[2 * i : 2 * i + 2] for i in range(n)]
+    return "".join(left_str + ["->"] + out_str)
+
+
+def reduced_dm_subscripts(n, modes):
+    """
+    Density matrix of the modes, all other modes are traced out
+    """
+    keep_indices = indices[: 2 * len(modes)]
+    trace_indices = indices[2 * len(modes) : len(modes) + n]
+
+    ind = [i * 2 for i in trace_indices]
+    ctr = 0
+
+    for m in range(n):
+        if m in modes:
+            ind.insert(m, keep_indices[2 * ctr : 2 * (ctr + 1)])
+            ctr += 1
+
+    return "".join(ind) + "->" + keep_indices
+
+
+def mix_subscripts(n, modes=None):
+    """
+    Outer product of an n-mode ket with its conjugate
+    """
+    # pylint: disable=unused-argument
+    left_str = [indices[i] for i in range(0, 2 * n, 2)]
+    right_str = [indices[i] for i in range(1, 2 * n, 2)]
+    out_str = [indices[: 2 * n]]
+    return "".join(left_str + [","] + right_str + ["->"] + out_str)
+
+
+def gate_subscripts(n, modes):
+    """
+    Application of an operator with shape (out1, in1, ...) to the modes
+    of an n-mode density matrix
+    """
+    size = len(modes)
+    in_str = indices[: n * 2]
+
+    j = iter(range(n * 2))
+    out_str = "".join(
+        [
+            indices[n * 2 + next(j)] if i // 2 in modes else indices[i]
+            for i in range(n * 2)
+        ]
+    )
+
+    left_str = "".join(
+        [
+            out_str[modes[i // 2] * 2] if (i % 2) == 0 else in_str[modes[i // 2] * 2]
+            for i in range(size * 2)
+        ]
+    )
+    right_str = "".join(
+        [
+            (
+                out_str[modes[i // 2] * 2 + 1]
+                if (i % 2) == 0
+                else in_str[modes[i // 2] * 2 + 1]
+            )
+            for i in range(size * 2)
+        ]
+    )
+
+    return "".join([left_str, ",", in_str, ",", right_str, "->", out_str])
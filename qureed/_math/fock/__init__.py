@@ -7,6 +7,8 @@ from .ops import (
     coherent_state,
     adagger,
     a,
+    annihilation_power,
+    creation_power,
     mean_photon_number,
     fock_probability,
     squeezing,
@@ -18,3 +20,5 @@ from .ops import (
     apply_gate_einsum,
     tensor,
 )
+from .cache import OperatorCache
+from .sectors import SectorState
@@ -0,0 +1,190 @@
+"""
+Batched gate generators and gate application
+
+The generators accept arrays of parameters, which are broadcast against
+each other, and return the operators stacked along a leading batch axis.
+Recurrence based generators run the scalar kernel for every point in a
+single compiled loop, so a sweep is one call instead of one Python call
+per point.
+
+Batched states carry the batch as their first axis, kets have the shape
+(batch, trunc, ...) and density matrices (batch, trunc, trunc, ...).
+Operators either have a batch axis of the same size or none.
+"""
+
+import numpy as np
+from numba import njit
+
+from qureed._math.fock.ops import beamsplitter, displacement, squeezing
+
+
+def broadcast(*parameters):
+    """
+    Broadcasts the parameters into flat float arrays of equal length
+    """
+    arrays = np.broadcast_arrays(*[np.asarray(p, dtype=np.float64) for p in parameters])
+    return [np.ascontiguousarray(a).ravel() for a in arrays]
+
+
+def phase_batch(theta, cutoff):
+    """
+    Phase shifters with shape (batch, cutoff, cutoff)
+    """
+    (theta,) = broadcast(theta)
+    diagonal = np.exp(1j * theta[:, None] * np.arange(cutoff))
+    operators = np.zeros((len(theta), cutoff, cutoff), dtype=np.complex128)
+    operators[:, np.arange(cutoff), np.arange(cutoff)] = diagonal
+    return operators
+
+
+@njit(cache=True)
+def _displacement_batch(r, phi, cutoff):
+    operators = np.zeros((len(r), cutoff, cutoff), dtype=np.complex128)
+    for i in range(len(r)):
+        operators[i] = displacement(r[i], phi[i], cutoff)
+    return operators
+
+
+def displacement_batch(r, phi, cutoff):
+    """
+    Displacements with shape (batch, cutoff, cutoff)
+    """
+    return _displacement_batch(*broadcast(r, phi), cutoff)
+
+
+@njit(cache=True)
+def _squeezing_batch(r, phi, cutoff):
+    operators = np.zeros((len(r), cutoff, cutoff), dtype=np.complex128)
+    for i in range(len(r)):
+        operators[i] = squeezing(r[i], phi[i], cutoff)
+    return operators
+
+
+def squeezing_batch(r, phi, cutoff):
+    """
+    Squeezers with shape (batch, cutoff, cutoff)
+    """
+    return _squeezing_batch(*broadcast(r, phi), cutoff)
+
+
+@njit(cache=True)
+def _beamsplitter_batch(theta, phi, cutoff):
+    shape = (len(theta), cutoff, cutoff, cutoff, cutoff)
+    operators = np.zeros(shape, dtype=np.complex128)
+    for i in range(len(theta)):
+        operators[i] = beamsplitter(theta[i], phi[i], cutoff)
+    return operators
+
+
+def beamsplitter_batch(theta, phi, cutoff):
+    """
+    Beam splitters with shape (batch, cutoff, cutoff, cutoff, cutoff),
+    the element axes are ordered as those of ops.beamsplitter
+    """
+    return _beamsplitter_batch(*broadcast(theta, phi), cutoff)
+
+
+def _matrix(operator, size, batched):
+    """
+    Views an operator with shape ([batch,] out1, in1, ...) as
+    ([batch,] dim, dim) matrices
+    """
+    offset = 1 if batched else 0
+    order = [2 * i + offset for i in range(size)]
+    order += [2 * i + 1 + offset for i in range(size)]
+    if batched:
+        order = [0] + order
+    dim = int(np.prod([operator.shape[i] for i in order[offset : offset + size]]))
+    shape = (operator.shape[0], dim, dim) if batched else (dim, dim)
+    return np.transpose(operator, order).reshape(shape)
+
+
+def apply_gate_ket_batch(mat, state, modes, batched=True):
+    """
+    Applies the operator with shape ([batch,] out1, in1, ...) to the
+    modes of every ket in the batch with one stacked matrix product
+    """
+    n = state.ndim - 1
+    size = len(modes)
+    matview = _matrix(mat, size, batched)
+    order = [0] + [i + 1 for i in modes] + [i + 1 for i in range(n) if i not in modes]
+    shape = [state.shape[i] for i in order]
+    view = np.transpose(state, order).reshape((state.shape[0], matview.shape[-1], -1))
+    ret = np.matmul(matview, view).reshape(shape)
+    return np.transpose(ret, np.argsort(order))
+
+
+def apply_gate_dm_batch(mat, state, modes, batched=True):
+    """
+    Applies the operator with shape ([batch,] out1, in1, ...) to the
+    modes of every density matrix in the batch from both sides
+    """
+    n = (state.ndim - 1) // 2
+    size = len(modes)
+    matview = _matrix(mat, size, batched)
+    dim = matview.shape[-1]
+    rest = [i + 1 for i in range(2 * n) if i // 2 not in modes]
+    order = [0] + [2 * i + 1 for i in modes] + rest + [2 * i + 2 for i in modes]
+    shape = [state.shape[i] for i in order]
+    view = np.transpose(state, order).reshape((state.shape[0], dim, -1))
+    ret = np.matmul(matview, view).reshape((state.shape[0], -1, dim))
+    ret = np.matmul(ret, np.swapaxes(matview.conj(), -1, -2)).reshape(shape)
+    return np.transpose(ret, np.argsort(order))
+
+
+def mix_batch(state):
+    """
+    Density matrices of a batch of kets
+    """
+    n = state.ndim - 1
+    batch = state.shape[0]
+    dm = np.einsum(
+        "bi,bj->bij", state.reshape((batch, -1)), state.reshape((batch, -1)).conj()
+    )
+    dm = dm.reshape((batch,) + state.shape[1:] * 2)
+    order = [0] + [i + 1 + j * n for i in range(n) for j in (0, 1)]
+    return np.transpose(dm, order)
+
+
+def apply_channel_batch(state, kraus_ops, modes):
+    """
+    Applies the channel given by its Kraus operators to the modes of
+    every density matrix in the batch
+    """
+    superoperator = 0
+    for kraus in kraus_ops:
+        superoperator = superoperator + np.tensordot(kraus, kraus.conj(), axes=0)
+    # (out, in, out', in') per mode -> (out1, out1', in1, in1', ...)
+    size = len(modes)
+    order = []
+    for i in range(size):
+        order += [2 * i, 2 * size + 2 * i]
+    for i in range(size):
+        order += [2 * i + 1, 2 * size + 2 * i + 1]
+    superoperator = np.transpose(superoperator, order)
+    n = (state.ndim - 1) // 2
+    dims = [state.shape[2 * i + 1] for i in modes]
+    dim = int(np.prod(dims)) ** 2
+    superoperator = superoperator.reshape((dim, dim))
+    rest = [i + 1 for i in range(2 * n) if i // 2 not in modes]
+    order = [0] + [2 * i + 1 + j for i in modes for j in (0, 1)] + rest
+    shape = [state.shape[i] for i in order]
+    view = np.transpose(state, order).reshape((state.shape[0], dim, -1))
+    ret = np.matmul(superoperator, view).reshape(shape)
+    return np.transpose(ret, np.argsort(order))
+
+
+def trace_batch(state, pure):
+    """
+    Traces of the batched kets or density matrices
+    """
+    batch = state.shape[0]
+    if pure:
+        flat = state.reshape((batch, -1))
+        return np.einsum("bi,bi->b", flat, flat.conj()).real
+    n = (state.ndim - 1) // 2
+    dim = int(np.prod(state.shape[1::2]))
+    order = [0] + [2 * i + 1 for i in range(n)] + [2 * i + 2 for i in range(n)]
+    return np.trace(
+        np.transpose(state, order).reshape((batch, dim, dim)), axis1=1, axis2=2
+    ).real
@@ -0,0 +1,48 @@
+"""
+Operator cache for the Fock gate generators
+
+Interferometer meshes apply the same gates many times, the cache
+keeps the most recently used operators so they are generated once.
+"""
+
+import numpy as np
+
+# pylint: disable=unused-import
+from qureed._math.lru import CacheInfo, InvalidCacheSizeException, LRUCache
+
+
+class OperatorCache(LRUCache):
+    """
+    Bounded LRU cache of generated operators.
+
+    Operators are keyed by (generator, parameters, cutoff, dtype) and
+    returned as read-only arrays, since the same array is shared by all
+    callers. Scalar parameters are keyed by their plain Python value,
+    operators of array parameters are generated without the cache.
+    """
+
+    def get(self, generator, *parameters, cutoff: int, dtype=np.complex128):
+        """
+        Returns generator(*parameters, cutoff) cast to dtype
+        """
+        dtype = np.dtype(dtype)
+        if any(np.ndim(p) > 0 for p in parameters):
+            return np.asarray(generator(*parameters, cutoff), dtype=dtype)
+        parameters = tuple(_plain(p) for p in parameters)
+
+        def create():
+            operator = np.asarray(generator(*parameters, cutoff), dtype=dtype)
+            operator.flags.writeable = False
+            return operator
+
+        return self.get_or_create((generator, parameters, cutoff, dtype), create)
+
+
+def _plain(parameter):
+    """
+    Hashable Python value of a scalar parameter, numpy scalars and
+    0-d arrays included
+    """
+    if np.iscomplexobj(parameter):
+        return complex(parameter)
+    return float(parameter)
@@ -1,10 +1,21 @@
 import string
-from itertools import chain, product
+from functools import lru_cache
+from itertools import product
+
+import os
 
 import numpy as np
-from numba import njit, prange
+from numba import config, njit, prange
 from scipy.linalg import expm as matrixExp
 from scipy.special import factorial
+from qureed._math.contraction_plans import (
+    gate_subscripts,
+    mix_subscripts,
+    partial_trace_subscripts,
+    plan_cache,
+    reduced_dm_subscripts,
+    trace_subscripts,
+)
 from qureed._math.states import FockState
 
 r"""
@@ -14,7 +25,17 @@ https://arxiv.org/pdf/2004.11002.pdf
 """
 
 
+# Parallel kernels launched from the executor threads make the TBB layer
+# hang at interpreter exit, OpenMP is preferred unless a layer was chosen
+if config.THREADING_LAYER == "default" and (
+    "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ
+):
+    config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
 def_type = np.complex128
+# Supported state precisions, operators are generated in double
+# precision and cast to the precision of the state
+precisions = (np.complex64, np.complex128)
 indices = string.ascii_lowercase
 
 
@@ -90,37 +111,77 @@ def sliceExp(axes, ind, n):
     return [ind[i] if i in axes else slice(None, None, None) for i in range(n)]
 
 
-@njit
-def a(cutoff):
+@njit(cache=True)
+def a(cutoff, dtype=np.complex128):
     r"""
     The annihilation operator :math:`a`.
     """
-    data = np.sqrt(np.arange(1, cutoff, dtype=np.complex128))
+    data = np.sqrt(np.arange(1, cutoff, dtype=dtype))
 
     return np.diag(data, 1)
 
 
-@njit
 def fock_operator(n, cut):
-    op = adagger(cut)
-    if n == 1:
-        return op
-    else:
-        for _ in prange(n - 1):
-            op = op @ op
-        return op
+    r"""
+    The operator :math:`(a^\dagger)^n`, which prepares the
+    number state :math:`\ket{n}` (unnormalized) from the vacuum
+    """
+    return creation_power(n, cut)
 
 
-@njit
-def adagger(cutoff):
+@lru_cache(maxsize=32)
+def ladder_table(cutoff):
+    r"""
+    Read only table of the powers of the annihilation operator,
+    table[n] is :math:`a^n`. The powers are shifted diagonals
+    :math:`(a^n)_{k, k+n} = \sqrt{(k+n)!/k!}`, every diagonal
+    follows from the previous one.
+    """
+    table = np.zeros((cutoff, cutoff, cutoff), dtype=def_type)
+    k = np.arange(cutoff)
+    coefficients = np.ones(cutoff)
+    for n in range(cutoff):
+        if n > 0:
+            coefficients = coefficients[:-1] * np.sqrt(k[: cutoff - n] + n)
+        table[n, k[: cutoff - n], k[: cutoff - n] + n] = coefficients
+    table.flags.writeable = False
+    return table
+
+
+def annihilation_power(n, cutoff):
+    r"""
+    The operator :math:`a^n`, read only
+    """
+    if n >= cutoff:
+        return np.zeros((cutoff, cutoff), dtype=def_type)
+    return ladder_table(cutoff)[n]
+
+
+def creation_power(n, cutoff):
+    r"""
+    The operator :math:`(a^\dagger)^n`, read only
+    """
+    return annihilation_power(n, cutoff).T
+
+
+@njit(cache=True)
+def adagger(cutoff, dtype=np.complex128):
     r"""
     The creation operator :math:`a^\dagger`
     """
-    return np.conjugate(a(cutoff)).T
+    data = np.sqrt(np.arange(1, cutoff, dtype=dtype))
 
+    return np.diag(np.conjugate(data), -1)
 
-@njit
+
+@njit(cache=True, parallel=True)
 def beamsplitter(theta, phi, cutoff, dtype=np.complex128):
+    """
+    Beam splitter matrix elements, the recurrences only
+    visit the entries which conserve the photon number.
+    Entries with the total photon number N only depend on those
+    with N - 1, the rows of a photon number shell run in parallel.
+    """
     sqrt_values = np.sqrt(np.arange(cutoff, dtype=dtype))
     cos_theta = np.cos(theta)
     sin_theta_complex = np.sin(theta) * np.exp(1j * phi)
@@ -137,52 +198,64 @@ def beamsplitter(theta, phi, cutoff, dtype=np.complex128):
     B = np.zeros((cutoff, cutoff, cutoff, cutoff), dtype=dtype)
     B[0, 0, 0, 0] = 1.0  # equation 73
 
-    for m in range(cutoff):  # equation 74
-        for n in range(cutoff - m):
-            p = m + n
-            if 0 < p < cutoff:
-                B[m, n, p, 0] = (1 / sqrt_values[p]) * (
-                    V[0, 2] * sqrt_values[m] * B[m - 1, n, p - 1, 0]
-                    + V[1, 2] * sqrt_values[n] * B[m, n - 1, p - 1, 0]
-                )
-
-    for m in range(cutoff):  # equation 75
-        for n in range(cutoff):
-            for p in range(cutoff):
-                q = m + n - p
-                if 0 < q < cutoff:
-                    B[m, n, p, q] = (1 / sqrt_values[q]) * (
-                        V[0, 3] * sqrt_values[m] * B[m - 1, n, p, q - 1]
-                        + V[1, 3] * sqrt_values[n] * B[m, n - 1, p, q - 1]
-                    )
+    for total in range(1, 2 * cutoff - 1):
+        low = max(0, total - cutoff + 1)
+        high = min(cutoff, total + 1)
+        for m in prange(low, high):
+            n = total - m
+            for p in range(low, high):
+                q = total - p
+                if q == 0:
+                    # equation 74
+                    value = 0j
+                    if m > 0:
+                        value += V[0, 2] * sqrt_values[m] * B[m - 1, n, p - 1, 0]
+                    if n > 0:
+                        value += V[1, 2] * sqrt_values[n] * B[m, n - 1, p - 1, 0]
+                    B[m, n, p, 0] = value / sqrt_values[p]
+                else:
+                    # equation 75
+                    value = 0j
+                    if m > 0:
+                        value += V[0, 3] * sqrt_values[m] * B[m - 1, n, p, q - 1]
+                    if n > 0:
+                        value += V[1, 3] * sqrt_values[n] * B[m, n - 1, p, q - 1]
+                    B[m, n, p, q] = value / sqrt_values[q]
     return B
 
 
+@njit(cache=True)
 def phase(theta, cutoff):
-    return np.array(np.diag([np.exp(1j * n * theta) for n in range(cutoff)]))
+    return np.diag(np.exp(1j * theta * np.arange(cutoff)))
 
 
-def vacuum_state(n, cutoff):
-    state = np.zeros([cutoff for i in range(n)], dtype=np.complex128)
+def vacuum_state(n, cutoff, dtype=np.complex128):
+    state = np.zeros([cutoff for i in range(n)], dtype=dtype)
     state.ravel()[0] = 1.0 + 0.0j
     return state
 
 
-@njit
+@njit(cache=True)
 def fock_state(n, cutoff):
-    return np.array([1.0 + 0.0j if i == n else 0.0 + 0.0j for i in range(cutoff)])
+    state = np.zeros(cutoff, dtype=np.complex128)
+    if n < cutoff:
+        state[n] = 1.0
+    return state
 
 
+@njit(cache=True)
 def coherent_state(r, phi, cutoff):
+    r"""
+    Amplitudes :math:`e^{-|\alpha|^2/2} \alpha^n / \sqrt{n!}`, built as
+    a cumulative product so large cutoffs do not overflow the factorial
+    """
     alpha = r * np.exp(1j * phi)
-    normalization = np.exp(-(alpha.real**2 + alpha.imag**2) / 2)
-
-    return normalization * np.array(
-        [alpha**n / np.sqrt(factorial(n)) for n in range(cutoff)]
-    )
+    ratios = np.ones(cutoff, dtype=np.complex128)
+    ratios[1:] = alpha / np.sqrt(np.arange(1, cutoff))
+    return np.exp(-(r**2) / 2) * np.cumprod(ratios)
 
 
-@njit
+@njit(cache=True)
 def displacement(r, phi, cutoff, dtype=np.complex128):
     r"""Calculates the matrix elements of the displacement gate using a recurrence
     relation.
@@ -204,11 +277,10 @@ def displacement(r, phi, cutoff, dtype=np.complex128):
     for m in range(1, cutoff):
         D[m, 0] = mu[0] / sqrt[m] * D[m - 1, 0]
 
-    for m in range(cutoff):
-        for n in range(1, cutoff):
-            D[m, n] = (
-                mu[1] / sqrt[n] * D[m, n - 1] + sqrt[m] / sqrt[n] * D[m - 1, n - 1]
-            )
+    # Every column follows from the previous one
+    for n in range(1, cutoff):
+        D[:, n] = mu[1] / sqrt[n] * D[:, n - 1]
+        D[1:, n] += sqrt[1:] / sqrt[n] * D[:-1, n - 1]
 
     return D
 
@@ -227,7 +299,7 @@ def mean_photon_number(
     return np.sum(n * probs).real
 
 
-@njit
+@njit(cache=True)
 def squeezing(r, phi, cutoff, dtype=np.complex128):
     r"""Calculates the matrix elements of the squeezing gate using a recurrence
     relation.
@@ -257,17 +329,18 @@ def squeezing(r, phi, cutoff, dtype=np.complex128):
     for m in range(2, cutoff, 2):
         S[m, 0] = sqrt[m - 1] / sqrt[m] * R[0, 0] * S[m - 2, 0]
 
-    for m in range(0, cutoff):
-        for n in range(1, cutoff):
-            if (m + n) % 2 == 0:
-                S[m, n] = (
-                    sqrt[n - 1] / sqrt[n] * R[1, 1] * S[m, n - 2]
-                    + sqrt[m] / sqrt[n] * R[0, 1] * S[m - 1, n - 1]
-                )
+    # Every column follows from the two previous ones, only entries
+    # with even m + n are populated
+    for n in range(1, cutoff):
+        if n > 1:
+            S[n % 2 :: 2, n] = sqrt[n - 1] / sqrt[n] * R[1, 1] * S[n % 2 :: 2, n - 2]
+        start = 2 - n % 2
+        previous = S[start - 1 : -1 : 2, n - 1]
+        S[start::2, n] += sqrt[start::2] / sqrt[n] * R[0, 1] * previous
     return S
 
 
-@njit
+@njit(cache=True)
 def kerr(k, cutoff):
     n = np.arange(cutoff)
     ret = np.diag(np.exp(1j * k * n**2))
@@ -293,48 +366,52 @@ def apply_gate_einsum(mat, state, modes, n):
     Gate application based on einsum.
     Assumes the input matrix has shape (out1, in1, ...)
     """
-    # pylint: disable=unused-argument
-
-    size = len(modes)
 
     if n == 1:
         return np.dot(mat, np.dot(state, mat.conj().T))
 
-    in_str = indices[: n * 2]
-
-    j = genOfRange(n * 2)
-    out_str = "".join(
-        [
-            indices[n * 2 + next(j)] if i // 2 in modes else indices[i]
-            for i in range(n * 2)
-        ]
+    return plan_cache.contract(
+        "gate", n, modes, gate_subscripts, mat, state, mat.conj()
     )
 
-    j = genOfRange(size * 2)
-    left_str = "".join(
-        [
-            out_str[modes[i // 2] * 2] if (i % 2) == 0 else in_str[modes[i // 2] * 2]
-            for i in range(size * 2)
-        ]
-    )
-    right_str = "".join(
-        [
-            out_str[modes[i // 2] * 2 + 1]
-            if (i % 2) == 0
-            else in_str[modes[i // 2] * 2 + 1]
-            for i in range(size * 2)
-        ]
-    )
 
-    einstring = "".join([left_str, ",", in_str, ",", right_str, "->", out_str])
-    return np.einsum(einstring, mat, state, mat.conj())
+def apply_gate_BLAS(mat, state, modes, n, trunc):
+    """
+    Gate application based on indexing and matrix multiplication.
+    Assumes the input matrix has shape (out1, in1, ...).
+
+    The state is transposed into |mode[0]>...|mode[k]> |rest> <mode[0]|...<mode[k]|
+    and viewed as a (dim, rest * dim) matrix, so the operator is applied from
+    the left and from the right with two BLAS matrix products over all spectator
+    indices at once.
+    """
+
+    # pylint: disable=unused-argument
+    size = len(modes)
+    dim = int(np.prod([state.shape[2 * i] for i in modes]))
+
+    transpose_list = [2 * i for i in range(size)] + [2 * i + 1 for i in range(size)]
+    matview = np.transpose(mat, transpose_list).reshape((dim, dim))
+
+    rest = [i for i in range(n * 2) if not i // 2 in modes]
+    transpose_list = [2 * i for i in modes] + rest + [2 * i + 1 for i in modes]
+    view = np.transpose(state, transpose_list).reshape((dim, -1))
 
+    ret = np.dot(matview, view).reshape((-1, dim))
+    ret = np.dot(ret, matview.conj().T)
+    ret = ret.reshape([state.shape[i] for i in transpose_list])
 
-def apply_gate_BLAS(mat, state, modes, n, trunc):
+    return np.transpose(ret, np.argsort(transpose_list))
+
+
+def apply_gate_loop(mat, state, modes, n, trunc):
     """
     Gate application based on custom indexing and matrix multiplication.
     Assumes the input matrix has shape (out1, in1, ...).
 
+    Reference implementation, iterates over all spectator indices,
+    use apply_gate_BLAS instead.
+
     This implementation uses indexing and BLAS. As per stack overflow,
     einsum doesn't actually use BLAS but rather a c implementation. In theory
     if reshaping is efficient this should be faster.
@@ -375,11 +452,35 @@ def apply_gate_BLAS(mat, state, modes, n, trunc):
     return np.transpose(ret, untranspose_list)
 
 
-def proj(i, j, trunc):
+def apply_gate_ket(mat, state, modes, n, trunc):
+    """
+    Gate application to a pure state of shape (trunc,) * n, the modes may
+    also be truncated differently. Assumes the input matrix has shape
+    (out1, in1, ...).
+
+    The target modes are moved to the front of the ket, which is then
+    viewed as a (trunc**size, trunc**(n - size)) matrix and multiplied
+    by the operator in a single matrix product.
+    """
+    # pylint: disable=unused-argument
+    size = len(modes)
+    dim = int(np.prod([state.shape[i] for i in modes]))
+
+    transpose_list = [2 * i for i in range(size)] + [2 * i + 1 for i in range(size)]
+    matview = np.transpose(mat, transpose_list).reshape((dim, dim))
+
+    rest = [i for i in range(n) if i not in modes]
+    view = np.transpose(state, list(modes) + rest).reshape((dim, -1))
+    ret = np.dot(matview, view).reshape([state.shape[i] for i in list(modes) + rest])
+
+    return np.transpose(ret, np.argsort(list(modes) + rest))
+
+
+def proj(i, j, trunc, dtype=def_type):
     r"""
     The projector :math:`P = \ket{j}\bra{i}`.
     """
-    P = np.zeros((trunc, trunc), dtype=def_type)
+    P = np.zeros((trunc, trunc), dtype=dtype)
     P[j][i] = 1.0 + 0.0j
     return P
 
@@ -389,22 +490,14 @@ def lossChannel(T, trunc):
     The Kraus operators for the loss channel :math:`\mathcal{N}(T)`.
     """
 
-    TToAdaggerA = np.array(
-        np.diag([T ** (i / 2) for i in range(trunc)]), dtype=def_type
-    )
-
-    def aToN(n):
-        """the nth matrix power of the annihilation operator matrix a"""
-        return np.linalg.matrix_power(a(trunc), n)
+    # E_n = ((1 - T)/T)^(n/2) a^n T^(N/2) / sqrt(n!), the entry (k, k + n)
+    # carries T^((k + n)/2), so T^(-n/2) cancels and T = 0 is regular
+    rows = (T ** (np.arange(trunc) / 2))[:, None]
+    table = ladder_table(trunc)
 
     def E(n):
         """the loss channel amplitudes in the Fock basis"""
-        return ((1 - T) / T) ** (n / 2) * np.dot(
-            aToN(n) / np.sqrt(factorial(n)), TToAdaggerA
-        )
-
-    if T == 0:
-        return [proj(i, 0, trunc) for i in range(trunc)]
+        return np.sqrt((1 - T) ** n / factorial(n)) * rows * table[n]
 
     return [E(n) for n in range(trunc)]
 
@@ -413,19 +506,9 @@ def reduced_dm(
     state,
     modes,
 ):
-    keep_indices = indices[: 2 * len(modes)]
-    trace_indices = indices[2 * len(modes) : len(modes) + state._modes]
-
-    ind = [i * 2 for i in trace_indices]
-    ctr = 0
-
-    for m in range(state._modes):
-        if m in modes:
-            ind.insert(m, keep_indices[2 * ctr : 2 * (ctr + 1)])
-            ctr += 1
-
-    indStr = "".join(ind) + "->" + keep_indices
-    return np.einsum(indStr, state.dm())
+    return plan_cache.contract(
+        "reduced_dm", state._num_modes, modes, reduced_dm_subscripts, state.dm()
+    )
 
 
 def homodyne(state, phi, mode, hbar):
@@ -443,9 +526,9 @@ def homodyne(state, phi, mode, hbar):
 
 
 def calculate_trace(state):
-    eqn_indices = [[indices[idx]] * 2 for idx in range(state._num_modes)]
-    eqn = "".join(chain.from_iterable(eqn_indices))
-    return np.einsum(eqn, state.dm()).real
+    return plan_cache.contract(
+        "trace", state._num_modes, None, trace_subscripts, state.dm()
+    ).real
 
 
 def partial_trace(state, n, modes):
@@ -454,22 +537,17 @@ def partial_trace(state, n, modes):
 
     Expects state to be in mixed state form.
     """
-    left_str = [
-        indices[2 * i] + indices[2 * i] if i in modes else indices[2 * i : 2 * i + 2]
-        for i in range(n)
-    ]
-    out_str = ["" if i in modes else indices[2 * i : 2 * i + 2] for i in range(n)]
-    einstr = "".join(left_str + ["->"] + out_str)
-
-    return np.einsum(einstr, state)
+    return plan_cache.contract(
+        "partial_trace", n, modes, partial_trace_subscripts, state
+    )
 
 
-def vacuumStateMixed(n, trunc):
+def vacuumStateMixed(n, trunc, dtype=def_type):
     r"""
     The `n`-mode mixed vacuum state :math:`\ket{00\dots 0}\bra{00\dots 0}`
     """
 
-    state = np.zeros([trunc for i in range(n * 2)], dtype=def_type)
+    state = np.zeros([trunc for i in range(n * 2)], dtype=dtype)
     state.ravel()[0] = 1.0 + 0.0j
     return state
 
@@ -482,7 +560,8 @@ def thermalState(nbar, trunc):
         st = fock_state(0, trunc)
         state = np.outer(st, st.conjugate())
     else:
-        coeff = np.array([nbar**n / (nbar + 1) ** (n + 1) for n in range(trunc)])
+        n = np.arange(trunc)
+        coeff = nbar**n / (nbar + 1) ** (n + 1)
         state = np.diag(coeff)
 
     return state
@@ -499,20 +578,71 @@ def cubicPhase(gamma, hbar, trunc):
     return ret
 
 
-def apply_channel(state: FockState, kraus_ops, modes):
-    """Master channel application function. Applies a channel represented by
+def apply_channel(state, kraus_ops, modes, out=None, tol=1e-14):
+    r"""Master channel application function. Applies a channel represented by
     Kraus operators.
 
+    The Kraus operators are stacked into the superoperator
+    :math:`S = \sum_k K_k \otimes K_k^*`, which is applied to the state viewed
+    as a (dim**2, rest) matrix in a single matrix product.
+
     .. note::
             Always results in a mixed state.
 
     Args:
+        state (FockState or array): the state, arrays are density matrices
         kraus_ops (list<array>): A list of Kraus operators
         modes (list<non-negative int>): The modes to apply the channel to
-    """
+        out (array): C-contiguous buffer of the density matrix size which receives
+            the result, the returned array is a view into it. Besides the buffer
+            only one slice of the state along a mode, which is not acted on,
+            is copied at a time.
+        tol (float): Kraus operators with squared norm below tol times the total
+            squared norm are dropped
 
-    states = [apply_gate_einsum(k, state, modes, state._num_modes) for k in kraus_ops]
-    return sum(states)
+    Returns:
+        array: density matrix with indices (out1, in1, out2, in2, ...)
+    """
+    if isinstance(state, FockState):
+        data = state.dm()
+    else:
+        data = state
+    n = data.ndim // 2
+    size = len(modes)
+    shape = [data.shape[2 * i + j] for i in modes for j in (0, 1)]
+    dim = int(np.prod(shape[::2]))
+
+    # Stack the Kraus operators as (kraus, out, in) matrices
+    transpose_list = [0] + [2 * i + 1 for i in range(size)]
+    transpose_list += [2 * i + 2 for i in range(size)]
+    kraus = np.stack([np.asarray(k).reshape(shape) for k in kraus_ops])
+    kraus = np.transpose(kraus, transpose_list).reshape((-1, dim, dim))
+    norms = np.einsum("kab,kab->k", kraus, kraus.conj()).real
+    kraus = kraus[norms > tol * norms.sum()]
+
+    superoperator = np.einsum("kab,kcd->acbd", kraus, kraus.conj())
+    superoperator = superoperator.reshape((dim * dim, dim * dim))
+
+    rest = [i for i in range(n * 2) if not i // 2 in modes]
+    transpose_list = [2 * i for i in modes] + [2 * i + 1 for i in modes]
+    if not rest:
+        view = np.transpose(data, transpose_list).reshape((dim * dim, 1))
+        ret = np.dot(superoperator, view).reshape(data.shape)
+        return np.transpose(ret, np.argsort(transpose_list))
+
+    # The first remaining index is kept leading, the product runs over its
+    # slices so only one slice of the permuted state is copied at a time
+    transpose_list = rest[:1] + transpose_list + rest[1:]
+    view = np.transpose(data, transpose_list)
+    chunks = view.shape[0]
+    if out is None:
+        out = np.empty(data.size, dtype=np.result_type(superoperator, data))
+    ret = out.reshape((chunks, dim * dim, -1))
+    for k in range(chunks):
+        np.dot(superoperator, view[k].reshape((dim * dim, -1)), out=ret[k])
+    ret = ret.reshape(view.shape)
+
+    return np.transpose(ret, np.argsort(transpose_list))
 
 
 def norm(state: FockState):
@@ -542,36 +672,29 @@ def mix(state, n):
     shape of the input state.
     """
 
-    left_str = [indices[i] for i in range(0, 2 * n, 2)]
-    right_str = [indices[i] for i in range(1, 2 * n, 2)]
-    out_str = [indices[: 2 * n]]
-    einstr = "".join(left_str + [","] + right_str + ["->"] + out_str)
-    return np.einsum(einstr, state, state.conj())
+    return plan_cache.contract("mix", n, None, mix_subscripts, state, state.conj())
 
 
-@njit
+@njit(cache=True)
 def matrix_power(matrix, n):
     """
-    Multiplies a square matrix by itself n times using Numba, ensuring both matrices have the same data type.
+    Raises a square matrix to the non-negative power n by repeated
+    squaring, O(log n) matrix products.
 
     Parameters:
     matrix (np.ndarray): A square NumPy array representing the matrix, can be float64 or complex128.
-    n (int): The number of times the matrix is to be multiplied by itself.
+    n (int): The power.
 
     Returns:
-    np.ndarray: The resulting matrix after n multiplications, in complex128 if input is complex or float64 otherwise.
-    """
-    # Ensure both matrices are of the same complex data type if matrix contains complex numbers
-    if np.iscomplexobj(matrix):
-        matrix = matrix.astype(np.complex128)
-        result = np.eye(
-            matrix.shape[0], dtype=np.complex128
-        )  # Initialize result as a complex identity matrix
-    else:
-        result = np.eye(
-            matrix.shape[0], dtype=matrix.dtype
-        )  # Use the same dtype as the input matrix
+    np.ndarray: The matrix power, in the data type of the input.
+    """
+    matrix = np.ascontiguousarray(matrix)
+    result = np.eye(matrix.shape[0], dtype=matrix.dtype)
 
-    for _ in range(n):
-        result = np.dot(result, matrix)
+    while n > 0:
+        if n % 2 == 1:
+            result = np.dot(result, matrix)
+        n //= 2
+        if n > 0:
+            matrix = np.dot(matrix, matrix)
     return result
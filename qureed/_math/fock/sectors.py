@@ -0,0 +1,228 @@
+"""
+Photon number sector representation
+
+Passive linear optics conserves the total photon number, so most of the
+entries of a dense (cutoff,) * n ket are structurally zero. A SectorState
+stores one amplitude vector per occupied total photon number. Operators
+which shift the photon number by a fixed amount (beam splitters, phase
+shifters, creation operators) are applied sector by sector, every other
+operator needs the dense ket.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from qureed._math.lru import LRUCache
+from qureed._math.states import FockState
+
+
+def _compositions(total, n, cutoff):
+    """
+    All occupations of n modes with the given total, each below cutoff
+    """
+    if n == 1:
+        return [(total,)] if total < cutoff else []
+    occupations = []
+    for first in range(min(total, cutoff - 1) + 1):
+        for rest in _compositions(total - first, n - 1, cutoff):
+            occupations.append((first,) + rest)
+    return occupations
+
+
+@lru_cache(maxsize=256)
+def sector_basis(total, n, cutoff):
+    """
+    Basis of the sector with the given total photon number
+
+    Returns:
+        tuple: (array of occupations with shape (k, n), dict occupation -> index)
+    """
+    occupations = _compositions(total, n, cutoff)
+    basis = np.array(occupations, dtype=np.int64).reshape((len(occupations), n))
+    return basis, {occupation: i for i, occupation in enumerate(occupations)}
+
+
+def photon_shift(operator, size, cutoff, tol=1e-12):
+    """
+    Returns the change of the total photon number caused by the operator
+    with shape (out1, in1, ...) on size modes, None if it is not fixed
+    """
+    dim = cutoff**size
+    transpose_list = [2 * i for i in range(size)] + [2 * i + 1 for i in range(size)]
+    matrix = np.transpose(np.asarray(operator), transpose_list).reshape((dim, dim))
+    totals = np.indices((cutoff,) * size).reshape((size, dim)).sum(axis=0)
+    shifts = np.unique((totals[:, None] - totals[None, :])[np.abs(matrix) > tol])
+    if len(shifts) == 0:
+        return 0
+    if len(shifts) == 1:
+        return int(shifts[0])
+    return None
+
+
+class TransitionCache(LRUCache):
+    """
+    Bounded LRU cache of the sparsity structure of sector gates.
+
+    The structure depends only on the sector, the modes and the photon
+    shift, the operator entries are gathered into it on every application.
+    """
+
+    def get(self, total, n, cutoff, modes, shift):
+        """
+        Returns (rows, columns, operator elements) of the sector gate
+        """
+        modes = tuple(modes)
+
+        def create():
+            return _transitions(total, n, cutoff, modes, shift)
+
+        return self.get_or_create((total, n, cutoff, modes, shift), create)
+
+
+def _transitions(total, n, cutoff, modes, shift):
+    size = len(modes)
+    dim = cutoff**size
+    basis, _ = sector_basis(total, n, cutoff)
+    _, target_index = sector_basis(total + shift, n, cutoff)
+    local = basis[:, modes]
+    local_in = np.ravel_multi_index(local.T, (cutoff,) * size)
+    local_total = local.sum(axis=1) + shift
+
+    outputs = np.indices((cutoff,) * size).reshape((size, dim)).T
+    rows, columns, elements = [], [], []
+    for out_index, output in enumerate(outputs):
+        columns_out = np.flatnonzero(local_total == output.sum())
+        if len(columns_out) == 0:
+            continue
+        targets = basis[columns_out]
+        targets[:, modes] = output
+        rows.append([target_index[tuple(target)] for target in targets.tolist()])
+        columns.append(columns_out)
+        elements.append(out_index * dim + local_in[columns_out])
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    return (
+        np.concatenate(rows).astype(np.int64),
+        np.concatenate(columns),
+        np.concatenate(elements),
+    )
+
+
+transition_cache = TransitionCache(maxsize=1024)
+
+
+class SectorState(FockState):
+    """
+    Pure state stored as amplitude vectors of the occupied photon number
+    sectors, the dense ket is only built when it is requested
+    """
+
+    def __init__(self, sectors, num_modes, cutoff_dim, hbar=2):
+        super().__init__(None, num_modes, cutoff_dim, hbar=hbar, pure=True)
+        self.sectors = sectors
+
+    @classmethod
+    def vacuum(cls, num_modes, cutoff_dim, hbar=2, dtype=np.complex128):
+        """
+        Returns the vacuum of num_modes modes
+        """
+        return cls({0: np.ones(1, dtype=dtype)}, num_modes, cutoff_dim, hbar)
+
+    @property
+    def dtype(self):
+        return next(iter(self.sectors.values())).dtype
+
+    def apply(self, operator, modes, shift):
+        """
+        Applies the operator with shape (out1, in1, ...) to the modes,
+        shift is the photon number shift of the operator (see photon_shift)
+        """
+        size = len(modes)
+        dim = self._cutoff**size
+        transpose_list = [2 * i for i in range(size)] + [2 * i + 1 for i in range(size)]
+        elements = np.transpose(operator, transpose_list).reshape(dim * dim)
+        elements = elements.astype(self.dtype, copy=False)
+
+        sectors = {}
+        for total, amplitudes in self.sectors.items():
+            if total + shift < 0:
+                continue
+            target_basis, _ = sector_basis(total + shift, self._num_modes, self._cutoff)
+            if len(target_basis) == 0:
+                continue
+            rows, columns, gathered = transition_cache.get(
+                total, self._num_modes, self._cutoff, modes, shift
+            )
+            gate = sparse.csr_matrix(
+                (elements[gathered], (rows, columns)),
+                shape=(len(target_basis), len(amplitudes)),
+            )
+            sectors[total + shift] = gate @ amplitudes
+        return SectorState(sectors, self._num_modes, self._cutoff, self._hbar)
+
+    def norm(self) -> float:
+        """
+        Squared norm of the state
+        """
+        return float(sum(np.vdot(a, a).real for a in self.sectors.values()))
+
+    def scaled(self, factor):
+        """
+        Returns the state multiplied by factor
+        """
+        sectors = {total: a * factor for total, a in self.sectors.items()}
+        return SectorState(sectors, self._num_modes, self._cutoff, self._hbar)
+
+    def sector_probs(self):
+        """
+        Probabilities of the total photon numbers
+        """
+        return {total: np.vdot(a, a).real for total, a in self.sectors.items()}
+
+    def fock_prob(self, occupation):
+        """
+        Probability of the Fock basis state with the given occupation
+        """
+        occupation = tuple(occupation)
+        amplitudes = self.sectors.get(sum(occupation))
+        if amplitudes is None:
+            return 0.0
+        _, index = sector_basis(sum(occupation), self._num_modes, self._cutoff)
+        if occupation not in index:
+            return 0.0
+        return abs(amplitudes[index[occupation]]) ** 2
+
+    def ket(self) -> np.ndarray:
+        r"""The dense ket, built once on request."""
+        if self._data is None:
+            data = np.zeros((self._cutoff,) * self._num_modes, dtype=self.dtype)
+            for total, amplitudes in self.sectors.items():
+                basis, _ = sector_basis(total, self._num_modes, self._cutoff)
+                data[tuple(basis.T)] = amplitudes
+            self._data = data
+        return self._data
+
+    def dm(self) -> np.ndarray:
+        self.ket()
+        return super().dm()
+
+    def all_fock_probs(self):
+        self.ket()
+        return super().all_fock_probs()
+
+    def reduced_dm(self, modes):
+        self.ket()
+        return super().reduced_dm(modes)
+
+    def mean_photon(self, mode, **kwargs):
+        # pylint: disable=unused-argument
+        if isinstance(mode, (list, tuple)):
+            mode = mode[0]
+        mean = 0.0
+        for total, amplitudes in self.sectors.items():
+            basis, _ = sector_basis(total, self._num_modes, self._cutoff)
+            mean += np.sum(np.abs(amplitudes) ** 2 * basis[:, mode])
+        return mean
@@ -0,0 +1 @@
+from .ops import GaussianOperator
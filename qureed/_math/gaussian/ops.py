@@ -0,0 +1,196 @@
+"""
+Gaussian state operations
+
+States are described by the means and the covariance matrix of the
+quadratures in the (x1, ..., xn, p1, ..., pn) ordering, with
+x = sqrt(hbar / 2) (a + a^dagger). Gates are symplectic transformations
+of the quadratures, the conventions follow the Fock operators in
+qureed._math.fock.ops.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+from math import factorial
+
+import numpy as np
+
+
+@dataclass
+class GaussianOperator:
+    """
+    Symplectic transformation and displacement on the quadratures
+    (x1, ..., xk, p1, ..., pk) of the modes the operator is applied to
+    """
+
+    symplectic: np.ndarray
+    displacement: np.ndarray
+
+    @property
+    def num_modes(self) -> int:
+        return len(self.displacement) // 2
+
+
+def vacuum(n, hbar=2):
+    """
+    Means and covariance matrix of the n-mode vacuum
+    """
+    return np.zeros(2 * n), hbar / 2 * np.identity(2 * n)
+
+
+def passive(unitary):
+    r"""
+    Symplectic matrix of the passive transformation :math:`a \to U a`
+    """
+    unitary = np.asarray(unitary)
+    x, y = unitary.real, unitary.imag
+    return np.block([[x, -y], [y, x]])
+
+
+def phase(theta):
+    return GaussianOperator(passive([[np.exp(1j * theta)]]), np.zeros(2))
+
+
+def beamsplitter(theta, phi):
+    cos, sin = np.cos(theta), np.sin(theta)
+    unitary = [
+        [cos, -np.exp(-1j * phi) * sin],
+        [np.exp(1j * phi) * sin, cos],
+    ]
+    return GaussianOperator(passive(unitary), np.zeros(4))
+
+
+def squeezing(r, phi):
+    rotation = np.array([[np.cos(phi), np.sin(phi)], [np.sin(phi), -np.cos(phi)]])
+    symplectic = np.cosh(r) * np.identity(2) - np.sinh(r) * rotation
+    return GaussianOperator(symplectic, np.zeros(2))
+
+
+def displacement(r, phi, hbar=2):
+    alpha = r * np.exp(1j * phi)
+    means = np.sqrt(2 * hbar) * np.array([alpha.real, alpha.imag])
+    return GaussianOperator(np.identity(2), means)
+
+
+def quadrature_indices(modes, n):
+    """
+    Indices of the x and p quadratures of the modes
+    """
+    return list(modes) + [n + m for m in modes]
+
+
+def apply_operator(means, cov, operator: GaussianOperator, modes):
+    """
+    Applies the operator to the modes in place, costs O(n) per mode
+    the operator acts on
+    """
+    idx = quadrature_indices(modes, len(means) // 2)
+    S = operator.symplectic
+    means[idx] = S @ means[idx] + operator.displacement
+    cov[idx, :] = S @ cov[idx, :]
+    cov[:, idx] = cov[:, idx] @ S.T
+
+
+def reset(means, cov, modes, hbar=2):
+    """
+    Traces the modes out and replaces them by the vacuum in place
+    """
+    idx = quadrature_indices(modes, len(means) // 2)
+    means[idx] = 0
+    cov[idx, :] = 0
+    cov[:, idx] = 0
+    cov[idx, idx] = hbar / 2
+
+
+def reduced(means, cov, modes):
+    """
+    Means and covariance matrix of the modes
+    """
+    idx = quadrature_indices(modes, len(means) // 2)
+    return means[idx], cov[np.ix_(idx, idx)]
+
+
+def mean_photon(means, cov, mode, hbar=2):
+    """
+    Mean photon number of the mode
+    """
+    n = len(means) // 2
+    x, p = mode, n + mode
+    second_moments = cov[x, x] + cov[p, p] + means[x] ** 2 + means[p] ** 2
+    return second_moments / (2 * hbar) - 0.5
+
+
+def hafnian(A, loop=False):
+    """
+    (Loop) hafnian of the symmetric matrix A, exponential in its size
+    """
+    m = len(A)
+    if not loop and m % 2:
+        return 0
+
+    @lru_cache(maxsize=None)
+    def haf(mask):
+        if mask == 0:
+            return 1
+        i = (mask & -mask).bit_length() - 1
+        rest = mask & ~(1 << i)
+        total = A[i, i] * haf(rest) if loop else 0
+        others = rest
+        while others:
+            j = (others & -others).bit_length() - 1
+            total += A[i, j] * haf(rest & ~(1 << j))
+            others &= others - 1
+        return total
+
+    return haf((1 << m) - 1)
+
+
+def _q_matrix(cov, hbar=2):
+    n = len(cov) // 2
+    identity = np.identity(n)
+    x = cov[:n, :n] * 2 / hbar
+    xp = cov[:n, n:] * 2 / hbar
+    p = cov[n:, n:] * 2 / hbar
+    aidaj = (x + p + 1j * (xp - xp.T) - 2 * identity) / 4
+    aiaj = (x - p + 1j * (xp + xp.T)) / 4
+    return np.block([[aidaj, aiaj.conj()], [aiaj, aidaj.conj()]]) + np.identity(2 * n)
+
+
+def density_matrix_element(means, cov, i, j, hbar=2, tol=1e-12):
+    r"""
+    Fock density matrix element :math:`\langle i|\rho|j\rangle`,
+    i and j are the photon numbers of all modes
+    """
+    n = len(means) // 2
+    q = _q_matrix(cov, hbar)
+    q_inv = np.linalg.inv(q)
+    x_matrix = np.block(
+        [[np.zeros((n, n)), np.identity(n)], [np.identity(n), np.zeros((n, n))]]
+    )
+    A = x_matrix @ (np.identity(2 * n) - q_inv)
+    alpha = (means[:n] + 1j * means[n:]) / np.sqrt(2 * hbar)
+    beta = np.concatenate([alpha, alpha.conj()])
+
+    rpt = list(i) + list(j)
+    rows = np.repeat(np.arange(2 * n), rpt)
+    A_rpt = A[np.ix_(rows, rows)]
+    loop = np.linalg.norm(beta) > tol
+    if loop:
+        gamma = beta - A @ beta.conj()
+        np.fill_diagonal(A_rpt, gamma[rows])
+    haf = hafnian(A_rpt, loop=loop)
+
+    prefactor = np.exp(-0.5 * beta @ q_inv @ beta.conj()) / np.sqrt(np.linalg.det(q))
+    return prefactor * haf / np.sqrt(np.prod([factorial(k) for k in rpt]))
+
+
+def fock_probabilities(means, cov, cutoff, hbar=2):
+    """
+    Photon number probabilities of all modes up to the cutoff,
+    returned as an array of shape (cutoff,) * n
+    """
+    n = len(means) // 2
+    probs = np.zeros((cutoff,) * n)
+    for pattern in product(range(cutoff), repeat=n):
+        probs[pattern] = density_matrix_element(means, cov, pattern, pattern, hbar).real
+    return probs
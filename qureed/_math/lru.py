@@ -0,0 +1,66 @@
+"""
+Bounded least recently used cache shared by the math caches
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    Thread safe LRU cache with hit and miss statistics
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize <= 0:
+            raise InvalidCacheSizeException("Cache size must be positive")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key, factory):
+        """
+        Returns the cached entry, entries are created by factory() on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = factory()
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Hit and miss statistics
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """
+        Drops all entries and resets the statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class InvalidCacheSizeException(Exception):
+    """
+    Raised when the cache can not hold any entries
+    """
@@ -1,9 +1,13 @@
 import abc
-import string
 
 import numpy as np
 
-indices = string.ascii_lowercase
+from qureed._math.contraction_plans import (
+    mix_subscripts,
+    plan_cache,
+    reduced_dm_subscripts,
+)
+from qureed._math.gaussian import ops as gaussian_ops
 
 
 class State(abc.ABC):
@@ -28,7 +32,7 @@ class FockState(State):
             for each mode in the state
     """
 
-    def __init__(self, state_data, num_modes, cutoff_dim, hbar=2):
+    def __init__(self, state_data, num_modes, cutoff_dim, hbar=2, pure=False):
         # pylint: disable=too-many-arguments
 
         super().__init__(num_modes, hbar)
@@ -36,8 +40,18 @@ class FockState(State):
         self._data = state_data
         self._cutoff = cutoff_dim
         self._num_modes = num_modes
+        self._pure = pure
         self._basis = "fock"
 
+    @property
+    def is_pure(self):
+        r"""Whether the state is stored as a ket.
+
+        Returns:
+            bool: True if the state is pure
+        """
+        return self._pure
+
     @property
     def cutoff_dim(self):
         r"""The numerical truncation of the Fock space used by the underlying state.
@@ -48,8 +62,31 @@ class FockState(State):
         """
         return self._cutoff
 
+    @property
+    def dims(self):
+        r"""The truncation of every mode, modes may be truncated differently.
+
+        Returns:
+            list[int]: the dimension of each mode
+        """
+        if self._data is None:
+            return [self._cutoff] * self._num_modes
+        return list(self._data.shape[:: 1 if self._pure else 2])
+
+    def ket(self) -> np.ndarray:
+        r"""The ket of a pure state, None for mixed states."""
+        if self._pure:
+            return self._data
+        return None
+
     def dm(self) -> np.ndarray:
-        return self._data
+        r"""The density matrix, computed from the ket for pure states.
+        Indices are ordered (out1, in1, out2, in2, ...)."""
+        if not self._pure:
+            return self._data
+        return plan_cache.contract(
+            "mix", self._num_modes, None, mix_subscripts, self._data, self._data.conj()
+        )
 
     def all_fock_probs(self):
         r"""Probabilities of all possible Fock basis states for the current circuit state.
@@ -67,6 +104,9 @@ class FockState(State):
                 containing the Fock state probabilities, where :math:`D` is the Fock basis cutoff truncation
         """
 
+        if self._pure:
+            return np.abs(self._data) ** 2
+
         dm = self.dm()
         num_axes = len(dm.shape)
         evens = [k for k in range(0, num_axes, 2)]
@@ -77,28 +117,87 @@ class FockState(State):
             np.reshape(np.transpose(dm, transpose_list), [flat_size, flat_size])
         ).real
 
-        return np.reshape(probs, [self._cutoff] * self._num_modes)
+        return np.reshape(probs, self.dims)
 
     def reduced_dm(
         self,
         modes,
     ):
-        keep_indices = indices[: 2 * len(modes)]
-        trace_indices = indices[2 * len(modes) : len(modes) + self._num_modes]
+        r"""Density matrix of the modes, pure states are reduced
+        from the ket without building the full density matrix."""
+        if isinstance(modes, int):
+            modes = [modes]
+        if self._pure:
+            rest = [m for m in range(self._num_modes) if m not in modes]
+            reduced = np.tensordot(self._data, self._data.conj(), axes=(rest, rest))
+            k = reduced.ndim // 2
+            return np.transpose(reduced, [i + j * k for i in range(k) for j in (0, 1)])
+        return plan_cache.contract(
+            "reduced_dm", self._num_modes, modes, reduced_dm_subscripts, self.dm()
+        )
+
+    def mean_photon(self, mode, **kwargs):
+        # pylint: disable=unused-argument
+        if isinstance(mode, int):
+            mode = [mode]
+        n = np.arange(self.dims[mode[0]])
+        probs = np.diagonal(self.reduced_dm(mode))
+        return np.sum(n * probs).real
+
+
+class GaussianState(State):
+    r"""Class for the representation of Gaussian states by the means and the
+    covariance matrix of the quadratures, ordered (x1, ..., xn, p1, ..., pn).
+
+    Args:
+        means (array): the quadrature means
+        cov (array): the quadrature covariance matrix
+        num_modes (int): the number of modes in the state
+        hbar (float): (default 2) The value of :math:`\hbar` in the definition of :math:`\x` and :math:`\p`
+    """
+
+    def __init__(self, means, cov, num_modes, hbar=2):
+        super().__init__(num_modes, hbar)
+        self._means = means
+        self._cov = cov
 
-        ind = [i * 2 for i in trace_indices]
-        ctr = 0
+    def means(self) -> np.ndarray:
+        r"""The quadrature means."""
+        return self._means
 
-        for m in range(self._num_modes):
-            if m in modes:
-                ind.insert(m, keep_indices[2 * ctr : 2 * (ctr + 1)])
-                ctr += 1
+    def cov(self) -> np.ndarray:
+        r"""The quadrature covariance matrix."""
+        return self._cov
 
-        indStr = "".join(ind) + "->" + keep_indices
-        return np.einsum(indStr, self.dm())
+    def reduced_gaussian(self, modes):
+        r"""The Gaussian state of the modes, all other modes are traced out."""
+        means, cov = gaussian_ops.reduced(self._means, self._cov, modes)
+        return GaussianState(means, cov, len(modes), self._hbar)
 
     def mean_photon(self, mode, **kwargs):
         # pylint: disable=unused-argument
-        n = np.arange(self._cutoff)
-        probs = np.diagonal(self.reduced_dm(mode))
-        return np.sum(n * probs).real
+        if isinstance(mode, (list, tuple)):
+            mode = mode[0]
+        return gaussian_ops.mean_photon(self._means, self._cov, mode, self._hbar)
+
+    def fock_prob(self, occupation, modes=None):
+        r"""Probability of the photon numbers in occupation, measured on
+        the modes (all modes by default)."""
+        state = self if modes is None else self.reduced_gaussian(modes)
+        occupation = list(occupation)
+        return gaussian_ops.density_matrix_element(
+            state._means, state._cov, occupation, occupation, self._hbar
+        ).real
+
+    def all_fock_probs(self, cutoff, modes=None):
+        r"""Probabilities of all Fock basis states below the cutoff, of the
+        modes (all modes by default). The cost grows exponentially with the
+        number of photons, the modes should be restricted for large states.
+
+        Returns:
+            array: array of shape (cutoff,) * number of modes
+        """
+        state = self if modes is None else self.reduced_gaussian(modes)
+        return gaussian_ops.fock_probabilities(
+            state._means, state._cov, cutoff, self._hbar
+        )
@@ -8,16 +8,25 @@ from typing import List
 
 class Backend(ABC):
     """
-    All Backends are singletons
+    All Backends are singletons, unless they are
+    created for a specific simulation context
     """
 
     _instances = {}
 
     def __new__(cls, *args, **kwargs):
+        if kwargs.get("context") is not None:
+            return super(Backend, cls).__new__(cls)
         if cls not in cls._instances:
             cls._instances[cls] = super(Backend, cls).__new__(cls)
         return cls._instances[cls]
 
+    def release_mode(self, mode: int):
+        """
+        Called when the mode is released, backends which keep
+        a state trace the mode out. The index may be reused.
+        """
+
 
 class FockBackend(Backend):
     """
@@ -67,7 +76,10 @@ class FockBackend(Backend):
         """
 
     @abstractmethod
-    def apply_operator(self, operator, modes: List[int]):
+    def apply_operator(
+        self, operator, modes: List[int], trace_preserving: bool = False
+    ):
         """
-        Should Apply the operator to the correct mode
+        Should Apply the operator to the correct mode,
+        trace preserving operators do not require renormalization
         """
@@ -3,7 +3,11 @@ This module integrated first fock backend into the qureed backend
 """
 import cmath
 
+import numpy as np
+
 from qureed._math.fock import a, adagger, beamsplitter, displacement, phase, squeezing
+from qureed._math.fock import batch
+from qureed._math.fock.cache import OperatorCache
 from qureed.backend.backend import FockBackend
 from qureed.experiment import Experiment
 
@@ -13,8 +17,14 @@ class FockBackendFirst(FockBackend):
     First Fock Backend integration
     """
 
-    def __init__(self):
-        self.experiment = Experiment()
+    def __init__(self, context=None):
+        if context is None:
+            self.experiment = Experiment.get_default_instance()
+        else:
+            self.experiment = context.experiment
+        if not hasattr(self, "operator_cache"):
+            # Backend singleton is reinitialized on every call
+            self.operator_cache = OperatorCache()
         self.number_of_modes = 0
 
     def initialize(self):
@@ -42,36 +52,63 @@ class FockBackendFirst(FockBackend):
         """
         Return the creation operator
         """
-        return adagger(self.experiment.cutoff)
+        return adagger(self.experiment.cutoff, self.experiment.dtype)
 
     def destroy(self, mode):
         """
         Return the annihilatio operator
         """
-        return a(self.experiment.cutoff)
+        return a(self.experiment.cutoff, self.experiment.dtype)
 
     def squeeze(self, z: complex, mode):
         """
-        Return the squeezing operator
-        """
-        return squeezing(abs(z), cmath.phase(z), self.experiment.cutoff)
+        Return the squeezing operator, arrays of parameters
+        return the stacked batch of operators
+        """
+        if np.ndim(z) > 0:
+            operators = batch.squeezing_batch(
+                np.abs(z), np.angle(z), self.experiment.cutoff
+            )
+            return operators.astype(self.experiment.dtype, copy=False)
+        return self.operator_cache.get(
+            squeezing,
+            abs(z),
+            cmath.phase(z),
+            cutoff=self.experiment.cutoff,
+            dtype=self.experiment.dtype,
+        )
 
     def displace(self, alpha: float, phi: float, mode):
         """
-        Returns the displace operator
+        Returns the displace operator, arrays of parameters
+        return the stacked batch of operators
         """
-        return displacement(alpha, phi, self.experiment.cutoff)
+        if np.ndim(alpha) > 0 or np.ndim(phi) > 0:
+            operators = batch.displacement_batch(alpha, phi, self.experiment.cutoff)
+            return operators.astype(self.experiment.dtype, copy=False)
+        return self.operator_cache.get(
+            displacement,
+            alpha,
+            phi,
+            cutoff=self.experiment.cutoff,
+            dtype=self.experiment.dtype,
+        )
 
     def phase_shift(self, theta: float, mode):
-        return phase(theta, self.experiment.cutoff)
+        if np.ndim(theta) > 0:
+            operators = batch.phase_batch(theta, self.experiment.cutoff)
+            return operators.astype(self.experiment.dtype, copy=False)
+        return self.operator_cache.get(
+            phase, theta, cutoff=self.experiment.cutoff, dtype=self.experiment.dtype
+        )
 
     def number(self, mode):
         pass
 
-    def apply_operator(self, operator, modes):
+    def apply_operator(self, operator, modes, trace_preserving: bool = False):
         print(f"apply_operator: {modes}")
         print([*modes])
-        self.experiment.add_operation(operator, modes)
+        self.experiment.add_operation(operator, modes, trace_preserving)
 
     def initialize_number_state(self, n: int, mode: int):
         """
@@ -79,8 +116,26 @@ class FockBackendFirst(FockBackend):
         """
         self.experiment.state_init(n, mode)
 
-    def beam_splitter(self, theta=0, phi=0):
+    def release_mode(self, mode: int):
         """
-        Returns the beamsplitter operator
+        Traces the mode out of the experiment state
+        """
+        self.experiment.release_mode(mode)
+
+    def beam_splitter(self, theta=0, phi=0):
         """
-        return beamsplitter(theta, phi, self.experiment.cutoff).transpose((0, 2, 1, 3))
+        Returns the beamsplitter operator, arrays of parameters
+        return the stacked batch of operators
+        """
+        if np.ndim(theta) > 0 or np.ndim(phi) > 0:
+            operators = batch.beamsplitter_batch(theta, phi, self.experiment.cutoff)
+            operators = operators.astype(self.experiment.dtype, copy=False)
+            return operators.transpose((0, 1, 3, 2, 4))
+        operator = self.operator_cache.get(
+            beamsplitter,
+            theta,
+            phi,
+            cutoff=self.experiment.cutoff,
+            dtype=self.experiment.dtype,
+        )
+        return operator.transpose((0, 2, 1, 3))
@@ -0,0 +1,138 @@
+"""
+This module implements the Gaussian backend, the state is kept
+as the means and the covariance matrix of the quadratures
+"""
+
+import cmath
+import threading
+
+from qureed._math.gaussian import ops
+from qureed._math.gaussian.ops import GaussianOperator
+from qureed._math.states import GaussianState
+from qureed.backend.backend import FockBackend
+from qureed.experiment.operation import Operation
+
+
+class GaussianBackend(FockBackend):
+    """
+    Gaussian Backend
+
+    Offers the Fock backend operator interface, operators are symplectic
+    transformations of the quadratures. Memory grows as O(n^2) with the
+    number of modes. Operators are queued and applied in order when
+    the simulation executes the backend.
+    """
+
+    def __init__(self, context=None, hbar=2):
+        if hasattr(self, "operations"):
+            # Backend singleton is reinitialized on every call
+            return
+        self.context = context
+        self.hbar = hbar
+        self.number_of_modes = 0
+        self.dimensions = 10
+        self.operations = []
+        self.state = None
+        self._lock = threading.Lock()
+
+    def initialize(self):
+        """
+        Initialization method is run befor the simulation
+        """
+        self.operations = []
+        self.state = None
+
+    def set_number_of_modes(self, number_of_modes):
+        """
+        Set the number of modes
+        """
+        self.number_of_modes = number_of_modes
+
+    def set_dimensions(self, dimensions):
+        """
+        Default cutoff of the Fock probability extraction
+        """
+        self.dimensions = dimensions
+
+    def create(self, mode):
+        raise NonGaussianOperatorException("Creation operator is not Gaussian")
+
+    def destroy(self, mode):
+        raise NonGaussianOperatorException("Annihilation operator is not Gaussian")
+
+    def number(self, mode):
+        raise NonGaussianOperatorException("Number operator is not Gaussian")
+
+    def squeeze(self, z: complex, mode):
+        """
+        Return the squeezing operator
+        """
+        return ops.squeezing(abs(z), cmath.phase(z))
+
+    def displace(self, alpha: float, phi: float, mode):
+        """
+        Returns the displace operator
+        """
+        return ops.displacement(alpha, phi, self.hbar)
+
+    def phase_shift(self, theta: float, mode):
+        return ops.phase(theta)
+
+    def beam_splitter(self, theta=0, phi=0):
+        """
+        Returns the beamsplitter operator
+        """
+        return ops.beamsplitter(theta, phi)
+
+    def apply_operator(self, operator, modes, trace_preserving: bool = False):
+        """
+        Queues the Gaussian operator, symplectic operators preserve the trace
+        """
+        if not isinstance(operator, GaussianOperator):
+            raise NonGaussianOperatorException(
+                f"Gaussian backend can not apply {type(operator).__name__}"
+            )
+        with self._lock:
+            self.operations.append(Operation(operator, list(modes), True))
+
+    def release_mode(self, mode: int):
+        """
+        Queues the reset of the mode to the vacuum, None marks the release
+        """
+        with self._lock:
+            self.operations.append(Operation(None, [mode], True))
+
+    def initialize_number_state(self, n: int, mode: int):
+        """
+        Only the vacuum is a Gaussian number state
+        """
+        if n != 0:
+            raise NonGaussianOperatorException(f"Number state |{n}> is not Gaussian")
+
+    def execute(self) -> GaussianState:
+        """
+        Applies the queued operators to the vacuum, O(n) per operator
+        """
+        means, cov = ops.vacuum(self.number_of_modes, self.hbar)
+        for operation in self.operations:
+            if operation.operator is None:
+                ops.reset(means, cov, operation.modes, self.hbar)
+                continue
+            ops.apply_operator(means, cov, operation.operator, operation.modes)
+        self.state = GaussianState(means, cov, self.number_of_modes, self.hbar)
+        return self.state
+
+    def fock_probabilities(self, modes, cutoff=None):
+        """
+        Photon number probabilities of the modes up to the cutoff
+        """
+        if cutoff is None:
+            cutoff = self.dimensions
+        return self.state.all_fock_probs(cutoff, modes=modes)
+
+
+class NonGaussianOperatorException(Exception):
+    """
+    Exception for the case, when the Gaussian backend
+    is asked for an operator which is not Gaussian
+    """
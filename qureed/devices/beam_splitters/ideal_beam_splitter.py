@@ -93,8 +93,8 @@ class IdealBeamSplitter(GenericDevice):
     gui_name = "Ideal Beam Splitter"
     gui_documentation = "ideal_beam_splitter.md"
 
-    def __init__(self, name=None, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self.incomming_photons = []
         self.scheduled_event_time = None
 
@@ -130,13 +130,13 @@ class IdealBeamSplitter(GenericDevice):
                 mpmath.mpf(10) * mpmath.mpf(event.std_dev) ** 2 for event in new_events
             )
             print(f"Delay Time: {delay_time}")
-            new_scheduled_time = mpmath.mpf(time) + delay_time
+            new_scheduled_time = time + self.simulation.from_seconds(delay_time)
             if (
                 self.scheduled_event_time is None
                 or new_scheduled_time > self.scheduled_event_time
             ):
                 self.scheduled_event_time = new_scheduled_time
-                simulation = Simulation.get_instance()
+                simulation = self.simulation
                 simulation.schedule_event(
                     self.scheduled_event_time, self, process_now=True
                 )
@@ -144,6 +144,9 @@ class IdealBeamSplitter(GenericDevice):
     @schedule_next_event
     def process_delayed_events(self, time):
         results = []
+        processing_time = self.simulation.from_seconds(
+            IdealBeamSplitter.processing_time
+        )
         if len(self.incomming_photons) == 1:
             pe = self.incomming_photons[0]
             env1 = pe.kwargs["signals"][pe.port].contents
@@ -163,12 +166,8 @@ class IdealBeamSplitter(GenericDevice):
                 sig2 = GenericQuantumSignal()
                 sig2.set_contents(env1)
 
-            results.append(
-                ("C", sig1, pe.mean_time + IdealBeamSplitter.processing_time)
-            )
-            results.append(
-                ("D", sig2, pe.mean_time + IdealBeamSplitter.processing_time)
-            )
+            results.append(("C", sig1, pe.mean_time + processing_time))
+            results.append(("D", sig2, pe.mean_time + processing_time))
 
         elif len(self.incomming_photons) > 1:
             for i in range(len(self.incomming_photons)):
@@ -202,14 +201,14 @@ class IdealBeamSplitter(GenericDevice):
                             (
                                 "C",
                                 sig1,
-                                p1.mean_time + IdealBeamSplitter.processing_time,
+                                p1.mean_time + processing_time,
                             )
                         )
                         results.append(
                             (
                                 "D",
                                 sig2,
-                                p2.mean_time + IdealBeamSplitter.processing_time,
+                                p2.mean_time + processing_time,
                             )
                         )
         self.incomming_photons = []
@@ -69,15 +69,14 @@ class ClockTrigger(GenericDevice):
     power_peak = 0
     reference = None
 
-    def __init__(self, name=None, frequency=None, time=0, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, frequency=None, time=0, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self._triger_count = 0
         self.frequency = frequency
         self.time = time
         self.pulse_num = -1
         self.delay = 0
-        self.simulation = Simulation.get_instance()
-        self.simulation.schedule_event(time, self)
+        self.simulation.schedule_event(self.simulation.from_seconds(time), self)
 
     @ensure_output_compute
     @coordinate_gui
@@ -95,7 +94,7 @@ class ClockTrigger(GenericDevice):
     @schedule_next_event
     def des_action(self, time=None, *args, **kwargs):
         if self.frequency is not None:
-            dt = 1 / self.frequency
+            dt = self._period()
             signal = GenericBoolSignal()
             signal.set_bool(True)
             result = [("trigger", signal, time + dt)]
@@ -114,14 +113,14 @@ class ClockTrigger(GenericDevice):
             if not self.pulse_num == 0:
                 self.pulse_num -= 1
         if "delay" in signals:
-            self.delay = signals["delay"].contents
+            self.delay = self.simulation.from_seconds(signals["delay"].contents)
             self.simulation.schedule_event(self.delay, self)
         if self._should_trigger(time):
             if self.frequency is None:
                 raise Exception("Frequency not set")
             else:
                 if not self.pulse_num == 0:
-                    self.simulation.schedule_event(time + 1 / self.frequency, self)
+                    self.simulation.schedule_event(time + self._period(), self)
                     self.pulse_num -= 1
                 signal = GenericBoolSignal()
                 signal.set_bool(True)
@@ -129,6 +128,12 @@ class ClockTrigger(GenericDevice):
                 result = [("trigger", signal, time)]
                 return result
 
+    def _period(self):
+        """
+        Trigger period in simulation time units
+        """
+        return self.simulation.from_seconds(1 / self.frequency)
+
     def _should_trigger(self, time) -> bool:
         if self.frequency is None:
             return False
@@ -136,17 +141,16 @@ class ClockTrigger(GenericDevice):
         if time < self.delay:
             return False
 
-        # Define a tolerance value to account for floating-point inaccuracies
-        tolerance = 1e-9
+        # Tolerance of the time base accounts for floating-point inaccuracies,
+        # integer time bases compare exactly
+        tolerance = self.simulation.get_time_base().tolerance
+        period = self._period()
 
         # Calculate the difference and the modulus
         diff = time - self.delay
-        mod_result = diff % (1 / self.frequency)
+        mod_result = diff % period
 
         # Check if the modulus result is close to zero within the tolerance
-        if (
-            abs(mod_result) < tolerance
-            or abs(mod_result - (1 / self.frequency)) < tolerance
-        ):
+        if abs(mod_result) < tolerance or abs(mod_result - period) < tolerance:
             return True
         return False
@@ -50,10 +50,9 @@ class SimpleTrigger(GenericDevice):
     power_peak = 0
     reference = None
 
-    def __init__(self, name=None, time=0, uid=None):
-        super().__init__(name=name, uid=uid)
-        self.time = time
-        self.simulation = Simulation.get_instance()
+    def __init__(self, name=None, time=0, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
+        self.time = time if time is None else self.simulation.from_seconds(time)
         self.simulation.schedule_event(0, self)
 
     @ensure_output_compute
@@ -77,7 +76,8 @@ class SimpleTrigger(GenericDevice):
     @schedule_next_event
     def des(self, time=None, *args, **kwargs):
         if "time" in kwargs.get("signals"):
-            self.time = kwargs["signals"]["time"].contents
+            time_signal = kwargs["signals"]["time"]
+            self.time = self.simulation.from_seconds(time_signal.contents)
             self.simulation.schedule_event(self.time, self)
         if (self.time is None and time == 0) or time == self.time:
             signal = GenericBoolSignal()
@@ -60,7 +60,10 @@ class IdealDetector(GenericDevice):
     @coordinate_gui
     @wait_input_compute
     def compute_outputs(self, *args, **kwargs):
-        pass
+        # The detected mode is not used by any other device
+        signal = self.ports["input"].signal
+        if signal is not None and signal.mode_id is not None:
+            self.context.mode_manager.discard(signal.mode_id)
 
     @log_action
     @schedule_next_event
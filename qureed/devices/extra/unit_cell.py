@@ -71,5 +71,5 @@ class UnitCell(GenericDevice):
         env = kwargs["signals"]["input"].signal.contents
         signal = GenericQuantumSigna()
         signal.set_contents(content=env)
-        result = [("output", signal, time + 1)]
+        result = [("output", signal, time + self.simulation.from_seconds(1))]
         return results
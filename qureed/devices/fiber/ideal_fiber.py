@@ -75,8 +75,8 @@ class IdealFiber(GenericFiber):
 
     reference = None
 
-    def __init__(self, name=None, frequency=None, time=0, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, frequency=None, time=0, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self.length = None
 
     @ensure_output_compute
@@ -107,5 +107,5 @@ class IdealFiber(GenericFiber):
             env = kwargs["signals"]["input"].contents
             signal = GenericQuantumSignal()
             signal.set_contents(content=env)
-            result = [("output", signal, time + t)]
+            result = [("output", signal, time + self.simulation.from_seconds(t))]
             return result
@@ -12,15 +12,24 @@ from typing import Dict, Type
 from qureed.devices.port import Port
 from qureed.extra import Loggers, get_custom_logger
 from qureed.signals.generic_signal import GenericSignal
-from qureed.simulation import DeviceInformation, ModeManager, Simulation
+from qureed.simulation import (
+    DeviceInformation,
+    ModeManager,
+    Simulation,
+    SimulationContext,
+)
+from qureed.simulation.trace import TraceEventKind
+
+logger = get_custom_logger(Loggers.Devices)
 
 
 def log_action(method):
     @functools.wraps(method)
     def wrapper(self, time, *args, **kwargs):
-        # Convert mpf to float for formatting
-        l = get_custom_logger(Loggers.Devices)
-        time_as_float = float(time)
+        if self.simulation.fast_mode:
+            return method(self, time, *args, **kwargs)
+        # Convert simulation time to seconds for formatting
+        time_as_float = self.simulation.to_seconds(time)
         # Correctly format the string before passing to l.info
         if self.name is not None:
             formatted_message = "[{:-3e}s] *{}* ({}) is computing".format(
@@ -32,7 +41,7 @@ def log_action(method):
             )
 
         # Now, pass the formatted_message to the log
-        l.info(formatted_message)
+        logger.info(formatted_message)
         return method(self, time, *args, **kwargs)
 
     return wrapper
@@ -88,6 +97,40 @@ def coordinate_gui(method):
     return wrapper
 
 
+def _log_scheduling(device, next_device, time):
+    """
+    Logs the scheduling of a new event
+    """
+    time_as_float = device.simulation.to_seconds(time)
+    if device.name is None:
+        if next_device.name is None:
+            formatted_message = "<{:.3e}s> {} is scheduling new event for {}".format(
+                time_as_float,
+                device.__class__.__name__,
+                next_device.__class__.__name__,
+            )
+        else:
+            formatted_message = (
+                "<{:.3e}s> {} is scheduling new event for {} ({})".format(
+                    time_as_float,
+                    device.__class__.__name__,
+                    next_device.name,
+                    next_device.__class__.__name__,
+                )
+            )
+    else:
+        formatted_message = (
+            "<{:.3e}s> {} ({}) is scheduling new event for {} ({})".format(
+                time_as_float,
+                device.name,
+                device.__class__.__name__,
+                next_device.name,
+                next_device.__class__.__name__,
+            )
+        )
+    logger.info(formatted_message)
+
+
 def schedule_next_event(method):
     """
     Schedules the next device event, if it exists
@@ -98,45 +141,22 @@ def schedule_next_event(method):
         results = method(self, time, *args, **kwargs)
         if results is None:
             return
+        simulation = self.simulation
+        trace = simulation.trace
         for output_port, signal, time in results:
-            next_device, port = self.get_next_device_and_port(output_port)
-            if not next_device is None:
-                time_as_float = float(time)
-                l = get_custom_logger(Loggers.Devices)
-                if self.name is None:
-                    if next_device.name is None:
-                        formatted_message = (
-                            "<{:.3e}s> {} is scheduling new event for {}".format(
-                                time_as_float,
-                                self.__class__.__name__,
-                                next_device.__class__.__name__,
-                                time_as_float,
-                            )
-                        )
-                    else:
-                        formatted_message = (
-                            "<{:.3e}s> {} is scheduling new event for {} ({})".format(
-                                time_as_float,
-                                self.__class__.__name__,
-                                next_device.name,
-                                next_device.__class__.__name__,
-                                time_as_float,
-                            )
-                        )
-                else:
-                    formatted_message = (
-                        "<{:.3e}s> {} ({}) is scheduling new event for {} ({})".format(
-                            time_as_float,
-                            self.name,
-                            self.__class__.__name__,
-                            next_device.name,
-                            next_device.__class__.__name__,
-                            time_as_float,
-                        )
-                    )
-                l.info(formatted_message)
-                signals = {port: signal}
-                self.simulation.schedule_event(time, next_device, signals=signals)
+            next_device, port = simulation.route(self, output_port)
+            if next_device is None:
+                continue
+            if trace is not None:
+                trace.record(
+                    TraceEventKind.SCHEDULE,
+                    simulation.to_seconds(time),
+                    self,
+                    next_device,
+                )
+            if not simulation.fast_mode:
+                _log_scheduling(self, next_device, time)
+            simulation.schedule_signal(time, next_device, port, signal)
 
     return wrapper
 
@@ -146,9 +166,10 @@ class GenericDevice(ABC):  # pylint: disable=too-few-public-methods
     Generic Device class used to implement every device
     """
 
-    def __init__(self, name=None, uid=None):
+    def __init__(self, name=None, uid=None, context=None):
         """
-        Initialization method
+        Initialization method, the device is bound to the given
+        context, the active context or the default context
         """
         self.name = name
         self.ports = deepcopy(self.__class__.ports)
@@ -157,12 +178,14 @@ class GenericDevice(ABC):  # pylint: disable=too-few-public-methods
         for port in self.ports.keys():
             self.ports[port].device = self
 
-        simulation = Simulation.get_instance()
+        if context is None:
+            context = SimulationContext.get_current()
+        self.context = context
+        self.simulation = context.simulation
         ref = DeviceInformation(name=name, obj_ref=self, uid=uid)
         self.ref = ref
-        simulation.register_device(ref)
+        self.simulation.register_device(ref)
         self.coordinator = None
-        self.simulation = Simulation.get_instance()
 
     def register_signal(
         self, signal: GenericSignal, port_label: str, override: bool = False
@@ -197,6 +220,7 @@ class GenericDevice(ABC):  # pylint: disable=too-few-public-methods
 
         signal.register_port(port, self)
         port.signal = signal
+        self.simulation.invalidate_routing()
 
     @property
     @abstractmethod
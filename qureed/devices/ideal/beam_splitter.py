@@ -80,8 +80,8 @@ class IdealBeamSplitter(GenericDevice):
         ),
     }
 
-    def __init__(self, name=None, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self.incomming_photons = []
         self.scheduled_event_time = None
 
@@ -116,13 +116,13 @@ class IdealBeamSplitter(GenericDevice):
         self.incomming_photons.extend(new_events)
         if new_events:
             delay_time = max(10 * event.std_dev**2 for event in new_events)
-            new_scheduled_time = time + delay_time
+            new_scheduled_time = time + self.simulation.from_seconds(delay_time)
             if (
                 scheduled_event_time is None
                 or new_scheduled_time > self.scheduled_event_time
             ):
                 self.scheduled_event_time = new_scheduled_time
-                simulation = Simulation.get_instance()
+                simulation = self.simulation
                 simulation.schedule_event(
                     self.scheduled_event_time, self, process_now=True
                 )
@@ -52,7 +52,6 @@ class IdealSinglePhotonSource(GenericDevice):
     def __init__(self, wavelength=1550, name=None):
         super().__init__(name)
         self.wavelength = wavelength
-        self.simulation = Simulation.get_instance()
 
     @ensure_output_compute
     @wait_input_compute
@@ -43,7 +43,7 @@ class PhotonDistribution(GenericDevice):
     @wait_input_compute
     @coordinate_gui
     def compute_outputs(self, *args, **kwargs):
-        mm = ModeManager()
+        mm = self.context.mode_manager
         m_id = self.ports["IN"].signal.mode_id
         mode = mm.get_mode(m_id)
         probabilities = np.real(np.diag(mode))
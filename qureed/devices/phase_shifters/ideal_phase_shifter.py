@@ -61,8 +61,8 @@ class IdealPhaseShifter(GenericDevice):
     power_average = 0
     reference = None
 
-    def __init__(self, name=None, time=0, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, time=0, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self.theta = 0
 
     def set_theta(self, theta):
@@ -78,8 +78,12 @@ class IdealPhaseShifter(GenericDevice):
     @coordinate_gui
     @wait_input_compute
     def compute_outputs(self, *args, **kwargs):
-        simulation = Simulation.get_instance()
-        if simulation.simulation_type is SimulationType.FOCK:
+        simulation = self.simulation
+        if simulation.simulation_type in (
+            SimulationType.FOCK,
+            SimulationType.GAUSSIAN,
+        ):
+            # The Gaussian backend offers the same operator interface
             self.simulate_fock()
 
     def simulate_fock(self):
@@ -87,11 +91,11 @@ class IdealPhaseShifter(GenericDevice):
         Fock Simulation
         """
         logger.info("Beam Splitter - %s - executing", self.name)
-        simulation = Simulation.get_instance()
+        simulation = self.simulation
         backend = simulation.get_backend()
 
         # Get the mode manager
-        mm = ModeManager()
+        mm = self.context.mode_manager
         # Generate new mode
         theta = self.ports["theta"].signal.contents
         mode = self.ports["input"].signal.mode_id
@@ -104,7 +108,9 @@ class IdealPhaseShifter(GenericDevice):
 
         # Initialize photon number state in the mode
         operator = backend.phase_shift(theta, mm.get_mode_index(mode))
-        backend.apply_operator(operator, [mm.get_mode_index(mode)])
+        backend.apply_operator(
+            operator, [mm.get_mode_index(mode)], trace_preserving=True
+        )
 
         logger.info(
             "Phase Shifter - %s - assisning mode %s to signal on port %s",
@@ -35,6 +35,8 @@ class Port:
             return
         signal = self.signal
         self.signal = None
+        if self.device is not None:
+            self.device.simulation.invalidate_routing()
         ports = signal.ports
         other_ports = [p for p in ports if p is not self]
         for p in other_ports:
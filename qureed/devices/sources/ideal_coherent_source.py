@@ -76,8 +76,8 @@ class IdealCoherentSource(GenericDevice):
 
     reference = None
 
-    def __init__(self, name=None, frequency=None, time=0, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, frequency=None, time=0, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self.alpha = None
         self.phi = None
 
@@ -98,19 +98,23 @@ class IdealCoherentSource(GenericDevice):
     @coordinate_gui
     @wait_input_compute
     def compute_outputs(self, *args, **kwargs):
-        simulation = Simulation.get_instance()
-        if simulation.simulation_type is SimulationType.FOCK:
+        simulation = self.simulation
+        if simulation.simulation_type in (
+            SimulationType.FOCK,
+            SimulationType.GAUSSIAN,
+        ):
+            # The Gaussian backend offers the same operator interface
             self.simulate_fock()
 
     def simulate_fock(self):
         """
         Fock Simulation
         """
-        simulation = Simulation.get_instance()
+        simulation = self.simulation
         backend = simulation.get_backend()
 
         # Get the mode manager
-        mm = ModeManager()
+        mm = self.context.mode_manager
         # Generate new mode
         mode = mm.create_new_mode()
         # Displacement parameters
@@ -119,7 +123,9 @@ class IdealCoherentSource(GenericDevice):
 
         # Initialize photon number state in the mode
         operator = backend.displace(alpha, phi, mm.get_mode_index(mode))
-        backend.apply_operator(operator, [mm.get_mode_index(mode)])
+        backend.apply_operator(
+            operator, [mm.get_mode_index(mode)], trace_preserving=True
+        )
 
         self.ports["output"].signal.set_contents(timestamp=0, mode_id=mode)
         self.ports["output"].signal.set_computed()
@@ -67,8 +67,8 @@ class IdealNPhotonSource(GenericDevice):
     power_average = 0
     reference = None
 
-    def __init__(self, name=None, time=0, uid=None):
-        super().__init__(name=name, uid=uid)
+    def __init__(self, name=None, time=0, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
         self.photon_num = None
 
     def set_photon_num(self, photon_num: int):
@@ -84,7 +84,7 @@ class IdealNPhotonSource(GenericDevice):
     @coordinate_gui
     @wait_input_compute
     def compute_outputs(self, *args, **kwargs):
-        simulation = Simulation.get_instance()
+        simulation = self.simulation
         if simulation.simulation_type is SimulationType.FOCK:
             self.simulate_fock()
 
@@ -92,11 +92,11 @@ class IdealNPhotonSource(GenericDevice):
         """
         Fock Simulation
         """
-        simulation = Simulation.get_instance()
+        simulation = self.simulation
         backend = simulation.get_backend()
 
         # Get the mode manager
-        mm = ModeManager()
+        mm = self.context.mode_manager
         # Generate new mode
         mode = mm.create_new_mode()
         # How many photons should be created
@@ -53,7 +53,7 @@ class IdealSinglePhotonSource(GenericDevice):
     @coordinate_gui
     @wait_input_compute
     def compute_outputs(self, *args, **kwargs):
-        mm = ModeManager()
+        mm = self.context.mode_manager
         m_id = mm.create_new_mode()
         AD = adagger(mm.simulation.dimensions)
         A = a(mm.simulation.dimensions)
@@ -20,7 +20,7 @@ from qureed.signals import (
     GenericQuantumSignal,
     GenericSignal,
 )
-from qureed.simulation import ModeManager, Simulation
+from qureed.simulation import ModeManager, Simulation, SimulationType
 
 
 class IdealSqueezedPhotonSource(GenericDevice):
@@ -74,7 +74,10 @@ class IdealSqueezedPhotonSource(GenericDevice):
     @coordinate_gui
     @wait_input_compute
     def compute_outputs(self, *args, **kwargs):
-        mm = ModeManager()
+        if self.simulation.simulation_type is SimulationType.GAUSSIAN:
+            self.simulate_gaussian()
+            return
+        mm = self.context.mode_manager
         m_id = mm.create_new_mode()
         AD = adagger(mm.simulation.dimensions)
         A = a(mm.simulation.dimensions)
@@ -98,3 +101,18 @@ class IdealSqueezedPhotonSource(GenericDevice):
             content_type=QuantumContentType.FOCK, mode_id=m_id
         )
         self.ports["output"].signal.set_computed()
+
+    def simulate_gaussian(self):
+        """
+        Gaussian Simulation, squeezes the vacuum of a new mode
+        """
+        backend = self.simulation.get_backend()
+        mm = self.context.mode_manager
+        mode = mm.create_new_mode()
+        r = self.ports["squeezing"].signal.contents
+        phi = self.ports["offset"].signal.contents
+        operator = backend.squeeze(r * np.exp(1j * phi), mm.get_mode_index(mode))
+        backend.apply_operator(operator, [mm.get_mode_index(mode)], True)
+
+        self.ports["output"].signal.set_contents(timestamp=0, mode_id=mode)
+        self.ports["output"].signal.set_computed()
@@ -41,9 +41,9 @@ class FloatVariable(GenericDevice):
 
     values = {"value": None}
 
-    def __init__(self, name=None, uid=None):
-        super().__init__(name=name, uid=uid)
-        self.simulation.schedule_event(-1, self)
+    def __init__(self, name=None, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
+        self.simulation.schedule_event(self.simulation.from_seconds(-1), self)
 
     @ensure_output_compute
     @coordinate_gui
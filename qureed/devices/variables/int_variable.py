@@ -39,11 +39,10 @@ class IntVariable(GenericDevice):
     power_peak = 0
     reference = None
 
-    def __init__(self, name=None, time=-1, uid=None):
-        super().__init__(name=name, uid=uid)
-        self.time = time
-        self.simulation = Simulation.get_instance()
-        self.simulation.schedule_event(time, self)
+    def __init__(self, name=None, time=-1, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
+        self.time = self.simulation.from_seconds(time)
+        self.simulation.schedule_event(self.time, self)
 
     values = {"value": None}
 
@@ -1 +1,2 @@
 from .experiment_manager import Experiment
+from .operation import Operation
@@ -1,32 +1,61 @@
 import numpy as np
 
+from qureed._math.fock import batch as batched
 from qureed._math.fock import ops
+from qureed._math.fock.sectors import SectorState, photon_shift
 from qureed._math.states import FockState
+from qureed.experiment import jax_backend
+from qureed.experiment.fusion import fuse_operations
+from qureed.experiment.operation import Operation
+from qureed.kernel import FockKernel
+from qureed.kernel.fock_kernel.fock_kernel import FactorizedState
 
 
 class Experiment:
-    """Singleton object"""
+    """
+    Singleton object, experiments created with a context
+    are independent of the singleton
+    """
 
     __instance = None
 
-    def __new__(cls, *args, **kwargs):
+    def __new__(cls, *args, context=None, **kwargs):
+        if context is not None:
+            return super(Experiment, cls).__new__(cls)
         if not cls.__instance:
             cls.__instance = super(Experiment, cls).__new__(cls)
         return cls.__instance
 
-    def __init__(self, num_modes=2, hbar=2, cutoff=10):
+    def __init__(self, num_modes=2, hbar=2, cutoff=10, context=None):
         # Prevent reinitialization if the instance already exists
         if hasattr(self, "initialized"):
             return
+        self.context = context
         self.data = None
         self.init_modes = 1
         self.cutoff = cutoff
         self.num_modes = num_modes
         self.hbar = hbar
         self.state_preparations = []
+        self.mixed_preparations = []
         self.operations = []
         self.channels = []
+        self.releases = []
+        self.timeline = []
         self.state = None
+        self.pure = True
+        self.fusion = True
+        self.sector_representation = False
+        self.dtype = ops.def_type
+        self.truncations = {}
+        self.factorized = False
+        self.kernel = None
+        self.jax = False
+        self.removed_contractions = 0
+        self.renormalize_interval = None
+        self.truncation_error = 0.0
+        self._retained_trace = 1.0
+        self._unnormalized = 0
         self.initialized = True  # Mark the instance as initialized
 
     def reset(self):
@@ -39,9 +68,13 @@ class Experiment:
         self.num_modes = 0
         self.hbar = 2
         self.state_preparations = []
+        self.mixed_preparations = []
         self.operations = []
         self.channels = []
+        self.releases = []
+        self.timeline = []
         self.state = None
+        self.pure = True
 
     def update_mode_number(self, num_modes):
         self.num_modes = num_modes
@@ -55,24 +88,171 @@ class Experiment:
     @staticmethod
     def get_instance():
         """
-        Returns the singleton Experiment object. Raises an exception if the instance hasn't been created yet.
+        Returns the Experiment object of the active context or the singleton
+        Experiment object. Raises an exception if the instance hasn't been created yet.
         """
+        # pylint: disable=import-outside-toplevel
+        from qureed.simulation.context import SimulationContext
+
+        context = SimulationContext.get_active()
+        if context is not None:
+            return context.experiment
         if not Experiment.__instance:
             raise Exception("Experiment instance not created yet")
         return Experiment.__instance
 
-    def add_operation(self, operator, modes):
-        self.operations.append((operator, modes))
+    @staticmethod
+    def get_default_instance():
+        """
+        Returns the singleton Experiment object, creating it if needed
+        """
+        if not Experiment.__instance:
+            Experiment()
+        return Experiment.__instance
+
+    def add_operation(self, operator, modes, trace_preserving: bool = False):
+        """
+        Queues the operator, the state is renormalized after operators
+        which are not tagged as trace preserving
+        """
+        self.operations.append(Operation(operator, modes, trace_preserving))
+        self.timeline.append(("operation", self.operations[-1]))
+
+    def set_renormalize_interval(self, interval=None):
+        """
+        Trace preserving operations do not renormalize the state, the
+        trace is checked after every interval of them and at the end of
+        the execution (None). The lost trace is reported in truncation_error.
+        """
+        self.renormalize_interval = interval
+
+    def set_fusion(self, fusion: bool = True):
+        """
+        Enables fusion of operations on identical modes before execution,
+        the number of removed contractions is kept in removed_contractions
+        """
+        self.fusion = fusion
+
+    def set_sector_representation(self, enabled: bool = True):
+        """
+        Stores the pure state by total photon number sectors, operators
+        which do not shift the photon number by a fixed amount
+        (displacement, squeezing, ...) convert it to the dense ket
+        """
+        self.sector_representation = enabled
+
+    def set_precision(self, dtype=np.complex128):
+        """
+        Precision of the state, complex64 halves the memory and the
+        bandwidth of the evolution. Operators are generated in double
+        precision and cast to the precision of the state.
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in [np.dtype(p) for p in ops.precisions]:
+            raise UnsupportedPrecisionException(
+                f"State precision {dtype} is not supported, "
+                + "use complex64 or complex128"
+            )
+        self.dtype = dtype.type
+
+    def set_jax(self, enabled: bool = True):
+        """
+        Executes the experiment as a jit compiled JAX function of the
+        operators, compiled circuits are cached by structure and cutoff
+        and reused when only the parameters change. Batched operators
+        are mapped over with vmap.
+        """
+        self.jax = enabled
+
+    def set_truncation(self, mode: int, truncation: int = None):
+        """
+        Truncates the mode at its own cutoff, experiments with mode
+        truncations are executed on the Fock kernel. None restores the
+        common cutoff.
+        """
+        if truncation is None:
+            self.truncations.pop(mode, None)
+        else:
+            self.truncations[mode] = truncation
+
+    def set_factorized(self, enabled: bool = True):
+        """
+        Executes the experiment on the Fock kernel, which keeps one factor
+        per group of entangled modes instead of the joint state
+        """
+        self.factorized = enabled
+
+    def add_channel(self, kraus_ops, modes):
+        """
+        Channel given by its Kraus operators,
+        the state is promoted to a density matrix when it is applied
+        """
+        self.channels.append((kraus_ops, modes))
+        self.timeline.append(("channel", self.channels[-1]))
+
+    def release_mode(self, mode: int):
+        """
+        Traces the mode out of the state and resets it to the vacuum,
+        the index can be reused by a new mode. Experiments with released
+        modes are executed in the order of the queued calls on the
+        factorized Fock kernel, so the released mode is split off.
+        """
+        self.releases.append(mode)
+        self.timeline.append(("release", mode))
 
     def prepare_experiment(self):
-        ground_state = ops.vacuumStateMixed(self.num_modes, trunc=self.cutoff)
+        """
+        Prepares the vacuum state, the state is kept as a ket
+        until a channel or a mixed preparation is applied
+        """
+        self.pure = True
+        self.kernel = None
+        if self.truncations or self.factorized or self.releases:
+            self.kernel = FockKernel(context=self.context)
+            self.kernel.reset(self.dtype)
+            for mode in range(self.num_modes):
+                self.kernel.add_mode(self.truncations.get(mode, self.cutoff))
+            self.state = None
+            return self.state
+        if self.sector_representation and not self.mixed_preparations:
+            self.state = SectorState.vacuum(
+                self.num_modes, self.cutoff, self.hbar, self.dtype
+            )
+            return self.state
+        ground_state = ops.vacuum_state(self.num_modes, self.cutoff, self.dtype)
+        self._set_state(ground_state)
+        return self.state
+
+    def _set_state(self, data):
         self.state = FockState(
-            ground_state,
-            self.num_modes,
+            state_data=np.asarray(data, dtype=self.dtype),
+            num_modes=self.num_modes,
             cutoff_dim=self.cutoff,
             hbar=self.hbar,
+            pure=self.pure,
         )
-        return self.state
+
+    def densify(self):
+        """
+        Converts the sector state into the dense ket and the
+        factorized kernel state into the joint state
+        """
+        if isinstance(self.state, SectorState):
+            self._set_state(self.state.ket())
+        elif isinstance(self.state, FactorizedState):
+            self.state = self.state.densify()
+
+    def promote(self):
+        """
+        Converts the pure state into a density matrix
+        """
+        if not self.pure:
+            return
+        self.pure = False
+        if self.kernel is not None:
+            # Kernel factors are promoted when a channel acts on them
+            return
+        self._set_state(ops.mix(self.state.ket(), self.num_modes))
 
     def prepare_multimode(self, data, modes):
         r"""
@@ -101,83 +281,336 @@ class Experiment:
 
             self.data = np.transpose(self.data, index_permutation)
 
-        self.state = FockState(
-            state_data=self.data,
-            num_modes=self.num_modes,
-            cutoff_dim=self.cutoff,
-            hbar=self.hbar,
-        )
+        self.pure = False
+        self._set_state(self.data)
 
     def alloc(self, n=1):
         """allocate a number of modes at the end of the state."""
         # base_shape = [self._trunc for i in range(n)]
 
-        vac = ops.vacuumStateMixed(n, self.cutoff)
+        vac = ops.vacuumStateMixed(n, self.cutoff, self.dtype)
 
         self.data = ops.tensor(self.state.dm(), vac, self.num_modes)
-        self.state = FockState(
-            state_data=self.data,
-            num_modes=self.num_modes,
-            cutoff_dim=self.cutoff,
-            hbar=self.hbar,
-        )
+        self.pure = False
+        self._set_state(self.data)
 
     def state_init(self, photon_number, modes):
         self.state_preparations.append((photon_number, modes))
+        self.timeline.append(("prepare", self.state_preparations[-1]))
+
+    def mixed_state_init(self, density_matrix, mode):
+        """
+        Prepares the mode in the given single mode density matrix
+        """
+        self.mixed_preparations.append((density_matrix, mode))
+        self.timeline.append(("mixed", self.mixed_preparations[-1]))
 
     def _state_init(self, state_preparation: int, modes):
         vector = ops.fock_state(state_preparation, self.cutoff)
         self.data = np.outer(vector, vector.conjugate())
-        self.state = FockState(
-            state_data=self.data,
-            num_modes=self.num_modes,
-            cutoff_dim=self.cutoff,
-            hbar=self.hbar,
-        )
+        self.pure = False
+        self._set_state(self.data)
         #        self.prepare_multimode(np.outer(vector, vector.conjugate()), modes)
 
         self.alloc()
 
+    def batch_size(self):
+        """
+        Operators with a leading batch axis, shape (batch, out1, in1, ...),
+        make the experiment evolve a batch of states. Returns the size
+        of the batch or None.
+        """
+        sizes = {
+            np.shape(operation.operator)[0]
+            for operation in self.operations
+            if np.ndim(operation.operator) == 2 * len(operation.modes) + 1
+        }
+        if len(sizes) > 1:
+            raise BatchSizeException(
+                f"Batched operators have different batch sizes {sorted(sizes)}"
+            )
+        return sizes.pop() if sizes else None
+
     def execute(self):
+        batch = self.batch_size()
+        if self.jax:
+            self._execute_jax(batch)
+            return
+        if batch is not None:
+            self._execute_batch(batch)
+            return
         self.prepare_experiment()
-        if len(self.state_preparations) > 0:
+        self.truncation_error = 0.0
+        self._retained_trace = 1.0
+        self._unnormalized = 0
+        self.removed_contractions = 0
+        if self.releases:
+            self._execute_timeline()
+        else:
             for photon_number, modes in self.state_preparations:
-                operator = ops.fock_operator(photon_number, self.cutoff)
+                self._prepare_number(photon_number, modes)
+            for density_matrix, mode in self.mixed_preparations:
+                self._prepare_mixed(density_matrix, mode)
+            self._apply_operations(self.operations)
+            buffers = []
+            for channel, modes in self.channels:
+                self._apply_channel(channel, modes, buffers)
+
+        if self._unnormalized > 0:
+            self.renormalize()
+        if self.kernel is not None:
+            self.pure = self.kernel.pure
+            self.state = self.kernel.get_state()
 
-                new_st = ops.apply_gate_BLAS(
-                    operator, self.state.dm(), modes, self.num_modes, self.cutoff
+    def _execute_batch(self, batch):
+        """
+        Evolves a batch of states through the circuit in one pass,
+        unbatched operators act on every state of the batch. The state
+        is a list of the states, truncation_error an array. Batches are
+        kept as dense kets or density matrices.
+        """
+        if self.mixed_preparations or self.releases:
+            raise BatchSizeException(
+                "Batched execution does not support mixed preparations "
+                + "and released modes"
+            )
+        self.kernel = None
+        self.pure = True
+        self.removed_contractions = 0
+        vacuum = ops.vacuum_state(self.num_modes, self.cutoff, self.dtype)
+        self.data = np.repeat(vacuum[None], batch, axis=0)
+        retained = np.ones(batch)
+        unnormalized = 0
+
+        def normalize():
+            trace = batched.trace_batch(self.data, self.pure)
+            scale = np.sqrt(trace) if self.pure else trace
+            self.data = self.data / scale.reshape((-1,) + (1,) * (self.data.ndim - 1))
+            return trace
+
+        def apply(operator, modes, trace_preserving):
+            nonlocal retained, unnormalized
+            if not trace_preserving and unnormalized > 0:
+                retained = retained * normalize()
+                unnormalized = 0
+            operator = np.asarray(operator, dtype=self.dtype)
+            is_batched = operator.ndim == 2 * len(modes) + 1
+            if self.pure:
+                self.data = batched.apply_gate_ket_batch(
+                    operator, self.data, modes, is_batched
+                )
+            else:
+                self.data = batched.apply_gate_dm_batch(
+                    operator, self.data, modes, is_batched
                 )
+            if trace_preserving:
+                unnormalized += 1
+            else:
+                normalize()
+
+        for photon_number, modes in self.state_preparations:
+            apply(ops.fock_operator(photon_number, self.cutoff), modes, False)
+        for operation in self.operations:
+            apply(operation.operator, operation.modes, operation.trace_preserving)
+        for channel, modes in self.channels:
+            if self.pure:
+                self.data = batched.mix_batch(self.data)
+                self.pure = False
+            channel = [np.asarray(kraus, dtype=self.dtype) for kraus in channel]
+            self.data = batched.apply_channel_batch(self.data, channel, modes)
+            unnormalized += 1
+        if unnormalized > 0:
+            retained = retained * normalize()
+        self.truncation_error = 1 - retained
+        self.state = [
+            FockState(
+                state_data=data,
+                num_modes=self.num_modes,
+                cutoff_dim=self.cutoff,
+                hbar=self.hbar,
+                pure=self.pure,
+            )
+            for data in self.data
+        ]
+
+    def _execute_jax(self, batch):
+        """
+        Evolves the state with the compiled circuit, batches are
+        returned as for the batched execution
+        """
+        self.kernel = None
+        self.removed_contractions = 0
+        self.data, self.pure, retained = jax_backend.execute(self)
+        self.truncation_error = 1 - retained
+        if batch is None:
+            self.truncation_error = float(self.truncation_error)
+            self._set_state(self.data)
+            return
+        self.state = [
+            FockState(
+                state_data=data,
+                num_modes=self.num_modes,
+                cutoff_dim=self.cutoff,
+                hbar=self.hbar,
+                pure=self.pure,
+            )
+            for data in self.data
+        ]
+
+    def _execute_timeline(self):
+        """
+        Executes the queued calls in order, consecutive operations are fused
+        """
+        operations = []
+        buffers = []
+        for kind, item in self.timeline:
+            if kind == "operation":
+                operations.append(item)
+                continue
+            self._apply_operations(operations)
+            operations = []
+            if kind == "prepare":
+                self._prepare_number(*item)
+            elif kind == "mixed":
+                self._prepare_mixed(*item)
+            elif kind == "channel":
+                self._apply_channel(*item, buffers)
+            else:
+                self._release(item)
+        self._apply_operations(operations)
+
+    def _prepare_number(self, photon_number, modes):
+        operator = ops.fock_operator(photon_number, self.cutoff)
+        self._apply_operator(operator, modes, trace_preserving=False)
+
+    def _prepare_mixed(self, density_matrix, mode):
+        self.promote()
+        if isinstance(mode, list):
+            mode = mode[0]
+        density_matrix = np.asarray(density_matrix, dtype=self.dtype)
+        if self.kernel is not None:
+            self.kernel.prepare(mode, density_matrix)
+            return
+        reduced_state = ops.partial_trace(self.state.dm(), self.num_modes, [mode])
+        self.data = ops.tensor(
+            reduced_state, density_matrix, self.num_modes - 1, pos=mode
+        )
+        self._set_state(self.data)
+
+    def _apply_operations(self, operations):
+        if self.fusion:
+            operations, removed = fuse_operations(operations, self.cutoff)
+            self.removed_contractions += removed
+        for operation in operations:
+            self._apply_operator(
+                operation.operator, operation.modes, operation.trace_preserving
+            )
+
+    def _apply_channel(self, channel, modes, buffers):
+        self.promote()
+        channel = [np.asarray(kraus, dtype=self.dtype) for kraus in channel]
+        if self.kernel is not None:
+            self.kernel.apply_channel(channel, modes)
+            self._unnormalized += 1
+            return
+        if len(buffers) < 2:
+            buffers.append(np.empty(self.state.dm().shape, dtype=self.dtype))
+        # Channels alternate between two buffers
+        buffers.reverse()
+        self.data = ops.apply_channel(
+            self.state, kraus_ops=channel, modes=modes, out=buffers[0]
+        )
+        self._set_state(self.data)
+        self._unnormalized += 1
 
-                new_st = new_st / ops.calculate_trace(self.state)
+    def _release(self, mode):
+        """
+        Traces the mode out, the kernel keeps it as a separate vacuum factor
+        """
+        if self._unnormalized > 0:
+            self.renormalize()
+        vacuum = np.zeros(self.kernel.truncation(mode), dtype=self.dtype)
+        vacuum[0] = 1
+        self.kernel.prepare(mode, vacuum)
 
-                self.state = FockState(
-                    state_data=new_st,
-                    num_modes=self.num_modes,
-                    cutoff_dim=self.cutoff,
-                )
+    def _apply_operator(self, operator, modes, trace_preserving):
+        """
+        Applies the operator to the ket or the density matrix, the state
+        is renormalized only after operators which are not trace preserving
+        """
+        if not trace_preserving and self._unnormalized > 0:
+            # Leakage of the preceding trace preserving operators
+            self.renormalize()
+        operator = np.asarray(operator, dtype=self.dtype)
+        if isinstance(self.state, SectorState):
+            shift = photon_shift(operator, len(modes), self.cutoff)
+            if shift is None:
+                # Mixes photon number sectors, continue with the dense ket
+                self.densify()
+        if self.kernel is not None:
+            self.kernel.apply_operator(operator, modes)
+        elif isinstance(self.state, SectorState):
+            self.state = self.state.apply(operator, modes, shift)
+        elif self.pure:
+            new_st = ops.apply_gate_ket(
+                operator, self.state.ket(), modes, self.num_modes, self.cutoff
+            )
+            self._set_state(new_st)
+        else:
+            new_st = ops.apply_gate_BLAS(
+                operator, self.state.dm(), modes, self.num_modes, self.cutoff
+            )
+            self._set_state(new_st)
+        if not trace_preserving:
+            self._normalize()
+            return
+        self._unnormalized += 1
+        if (
+            self.renormalize_interval is not None
+            and self._unnormalized >= self.renormalize_interval
+        ):
+            self.renormalize()
+
+    def _normalize(self) -> float:
+        """
+        Divides the state by its trace and returns the trace
+        """
+        if self.kernel is not None:
+            trace = self.kernel.normalize()
+        elif isinstance(self.state, SectorState):
+            trace = self.state.norm()
+            self.state = self.state.scaled(1 / np.sqrt(trace))
+        elif self.pure:
+            ket = self.state.ket()
+            trace = np.vdot(ket, ket).real
+            self._set_state(ket / np.sqrt(trace))
+        else:
+            trace = ops.calculate_trace(self.state)
+            self._set_state(self.state.dm() / trace)
+        return trace
+
+    def renormalize(self):
+        """
+        Renormalizes the state after trace preserving operations,
+        the trace lost to the Fock cutoff accumulates in truncation_error
+        """
+        self._retained_trace *= self._normalize()
+        self.truncation_error = 1 - self._retained_trace
+        self._unnormalized = 0
 
-        if len(self.operations) > 0:
-            for operator, modes in self.operations:
-                new_st = ops.apply_gate_BLAS(
-                    operator, self.state.dm(), modes, self.num_modes, self.cutoff
-                )
-                new_st = new_st / ops.calculate_trace(self.state)
 
-                self.state = FockState(
-                    state_data=new_st,
-                    num_modes=self.num_modes,
-                    cutoff_dim=self.cutoff,
-                )
-        if len(self.channels) > 0:
-            for channel, modes in self.channels:
-                self.data = ops.apply_channel(
-                    self.state, kraus_ops=channel, modes=modes
-                )
-                self.state = FockState(
-                    state_data=self.data,
-                    num_modes=self.num_modes,
-                    cutoff_dim=self.cutoff,
-                )
+class BatchSizeException(Exception):
+    """
+    Exception for the case, when the batched operators
+    can not be executed as one batch
+    """
+
+
+class UnsupportedPrecisionException(Exception):
+    """
+    Exception for the case, when the state precision is not
+    a supported complex type
+    """
 
 
 class ExperimentInitializedException(Exception):
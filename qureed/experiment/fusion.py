@@ -0,0 +1,80 @@
+"""
+Gate fusion
+
+Every operation applied by Experiment.execute is a full pass over the
+state. Before execution consecutive operations acting on the same set
+of modes are multiplied into a single operator. Operations acting on
+disjoint modes commute, so an operation can be moved past them to
+reach an earlier operation on the same modes.
+"""
+
+import numpy as np
+
+from qureed.experiment.operation import Operation
+
+
+def to_matrix(operator, modes, cutoff):
+    """
+    Returns the operator as a (dim, dim) matrix over the sorted modes
+    """
+    size = len(modes)
+    dim = cutoff**size
+    order = np.argsort(modes)
+    transpose_list = [2 * i for i in order] + [2 * i + 1 for i in order]
+    matrix = np.transpose(operator, transpose_list).reshape((dim, dim))
+    return matrix, tuple(sorted(modes))
+
+
+def from_matrix(matrix, size, cutoff):
+    """
+    Returns the matrix in the (out1, in1, out2, in2, ...) operator layout
+    """
+    if size == 1:
+        return matrix
+    operator = matrix.reshape([cutoff] * (2 * size))
+    transpose_list = [j for i in range(size) for j in (i, size + i)]
+    return np.transpose(operator, transpose_list)
+
+
+def fuse_operations(operations, cutoff):
+    """
+    Fuses operations on identical mode sets.
+
+    Args:
+        operations (list<Operation>): operations in order of application
+        cutoff (int): Fock basis truncation
+
+    Returns:
+        tuple: fused operations and the number of removed full state contractions
+    """
+    # Each block is [operation, matrix], matrix is None until fused
+    blocks = []
+    for operation in operations:
+        mode_set = set(operation.modes)
+        target = None
+        for block in reversed(blocks):
+            block_modes = set(block[0].modes)
+            if block_modes == mode_set:
+                target = block
+                break
+            if block_modes & mode_set:
+                break
+        if target is None:
+            blocks.append([operation, None])
+            continue
+        first = target[0]
+        if target[1] is None:
+            target[1], modes = to_matrix(first.operator, first.modes, cutoff)
+            target[0] = Operation(first.operator, list(modes), first.trace_preserving)
+        matrix, _ = to_matrix(operation.operator, operation.modes, cutoff)
+        target[1] = matrix @ target[1]
+        target[0].trace_preserving = (
+            target[0].trace_preserving and operation.trace_preserving
+        )
+
+    fused = []
+    for operation, matrix in blocks:
+        if matrix is not None:
+            operation.operator = from_matrix(matrix, len(operation.modes), cutoff)
+        fused.append(operation)
+    return fused, len(operations) - len(fused)
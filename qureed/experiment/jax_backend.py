@@ -0,0 +1,246 @@
+"""
+JAX execution backend for the Experiment
+
+The circuit of an experiment is reduced to its structure, the kinds and
+modes of the preparations, operations and channels. The evolution of
+the vacuum through that structure is traced once into a function of the
+operator arrays, jit compiled and cached by structure, cutoff, number
+of modes and precision. Evaluating the same circuit with new operators
+(new parameters) reuses the compiled function without Python dispatch
+per gate. Operators with a leading batch axis are mapped over with vmap.
+
+JAX is imported when the backend is first used.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed._math.lru import LRUCache
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    One step of the circuit structure, kind is prepare, operation or
+    channel. batched marks operators with a leading batch axis.
+    """
+
+    kind: str
+    modes: tuple
+    trace_preserving: bool = True
+    batched: bool = False
+
+
+def _jax():
+    # pylint: disable=import-outside-toplevel
+    try:
+        import jax
+        import jax.numpy as jnp
+    except ImportError as exc:
+        raise JaxUnavailableException("The JAX backend requires jax") from exc
+    return jax, jnp
+
+
+def _matrix(jnp, operator, size):
+    """
+    Views the operator with shape (out1, in1, ...) as a (dim, dim) matrix
+    """
+    order = [2 * i for i in range(size)] + [2 * i + 1 for i in range(size)]
+    dim = int(np.prod(operator.shape[::2]))
+    return jnp.transpose(operator, order).reshape((dim, dim))
+
+
+def _apply_ket(jnp, operator, state, modes):
+    n = state.ndim
+    matview = _matrix(jnp, operator, len(modes))
+    order = list(modes) + [i for i in range(n) if i not in modes]
+    shape = [state.shape[i] for i in order]
+    view = jnp.transpose(state, order).reshape((matview.shape[0], -1))
+    ret = (matview @ view).reshape(shape)
+    return jnp.transpose(ret, np.argsort(order))
+
+
+def _apply_dm(jnp, operator, state, modes):
+    n = state.ndim // 2
+    matview = _matrix(jnp, operator, len(modes))
+    dim = matview.shape[0]
+    rest = [i for i in range(2 * n) if i // 2 not in modes]
+    order = [2 * i for i in modes] + rest + [2 * i + 1 for i in modes]
+    shape = [state.shape[i] for i in order]
+    view = jnp.transpose(state, order).reshape((dim, -1))
+    ret = (matview @ view).reshape((-1, dim)) @ matview.conj().T
+    return jnp.transpose(ret.reshape(shape), np.argsort(order))
+
+
+def _apply_channel(jnp, kraus_ops, state, modes):
+    n = state.ndim // 2
+    dim = int(np.prod([state.shape[2 * i] for i in modes]))
+    kraus = jnp.stack([_matrix(jnp, k, len(modes)) for k in kraus_ops])
+    superoperator = jnp.einsum("kab,kcd->acbd", kraus, kraus.conj())
+    superoperator = superoperator.reshape((dim * dim, dim * dim))
+    order = [2 * i for i in modes] + [2 * i + 1 for i in modes]
+    order += [i for i in range(2 * n) if i // 2 not in modes]
+    shape = [state.shape[i] for i in order]
+    view = jnp.transpose(state, order).reshape((dim * dim, -1))
+    ret = (superoperator @ view).reshape(shape)
+    return jnp.transpose(ret, np.argsort(order))
+
+
+def _mix(jnp, state):
+    n = state.ndim
+    dm = jnp.tensordot(state, state.conj(), axes=0)
+    return jnp.transpose(dm, [i + j * n for i in range(n) for j in (0, 1)])
+
+
+def _trace(jnp, state, pure):
+    if pure:
+        return jnp.vdot(state, state).real
+    n = state.ndim // 2
+    dim = int(np.prod(state.shape[::2]))
+    order = [2 * i for i in range(n)] + [2 * i + 1 for i in range(n)]
+    return jnp.trace(jnp.transpose(state, order).reshape((dim, dim))).real
+
+
+def build_evolution(structure, num_modes, cutoff, dtype):
+    """
+    Returns evolve(operators) -> (state, retained trace) and whether the
+    state stays pure, operators holds one array (a list of Kraus
+    operators for channels) per step
+    """
+    _, jnp = _jax()
+
+    def evolve(operators):
+        state = jnp.zeros((cutoff,) * num_modes, dtype=dtype)
+        state = state.reshape(-1).at[0].set(1).reshape((cutoff,) * num_modes)
+        pure = True
+        retained = jnp.ones((), dtype=jnp.real(state).dtype)
+        unnormalized = False
+
+        def normalize(state):
+            trace = _trace(jnp, state, pure)
+            return state / (jnp.sqrt(trace) if pure else trace), trace
+
+        for step, operator in zip(structure, operators):
+            if step.kind == "channel":
+                if pure:
+                    state = _mix(jnp, state)
+                    pure = False
+                state = _apply_channel(jnp, operator, state, step.modes)
+                unnormalized = True
+                continue
+            if not step.trace_preserving and unnormalized:
+                state, trace = normalize(state)
+                retained = retained * trace
+                unnormalized = False
+            if pure:
+                state = _apply_ket(jnp, operator, state, step.modes)
+            else:
+                state = _apply_dm(jnp, operator, state, step.modes)
+            if step.trace_preserving:
+                unnormalized = True
+            else:
+                state, _ = normalize(state)
+        if unnormalized:
+            state, trace = normalize(state)
+            retained = retained * trace
+        return state, retained
+
+    return evolve, not any(step.kind == "channel" for step in structure)
+
+
+class CircuitCache(LRUCache):
+    """
+    Bounded LRU cache of compiled circuits, keyed by the circuit
+    structure, the number of modes, the cutoff and the precision
+    """
+
+    def get(self, structure, num_modes, cutoff, dtype):
+        """
+        Returns (compiled evolution, pure)
+        """
+        dtype = np.dtype(dtype)
+        structure = tuple(structure)
+
+        def create():
+            jax, _ = _jax()
+            evolve, pure = build_evolution(structure, num_modes, cutoff, dtype)
+            if any(step.batched for step in structure):
+                in_axes = [0 if step.batched else None for step in structure]
+                evolve = jax.vmap(evolve, in_axes=(in_axes,))
+            return jax.jit(evolve), pure
+
+        return self.get_or_create((structure, num_modes, cutoff, dtype), create)
+
+
+circuit_cache = CircuitCache(maxsize=64)
+
+
+def circuit(experiment):
+    """
+    Returns the structure and the operators of the experiment,
+    in the order in which Experiment.execute applies them
+    """
+    structure, operators = [], []
+    for photon_number, modes in experiment.state_preparations:
+        modes = tuple([modes] if isinstance(modes, int) else modes)
+        structure.append(Step("prepare", modes, trace_preserving=False))
+        operators.append(ops.fock_operator(photon_number, experiment.cutoff))
+    for operation in experiment.operations:
+        modes = tuple(operation.modes)
+        batched = np.ndim(operation.operator) == 2 * len(modes) + 1
+        structure.append(Step("operation", modes, operation.trace_preserving, batched))
+        operators.append(operation.operator)
+    for kraus_ops, modes in experiment.channels:
+        structure.append(Step("channel", tuple(modes)))
+        operators.append([np.asarray(kraus) for kraus in kraus_ops])
+    return structure, operators
+
+
+def execute(experiment):
+    """
+    Evolves the experiment with the compiled circuit,
+    returns (state data, pure, retained trace)
+    """
+    if experiment.mixed_preparations or experiment.releases:
+        raise JaxUnsupportedCircuitException(
+            "The JAX backend does not support mixed preparations "
+            + "and released modes"
+        )
+    if experiment.truncations or experiment.factorized:
+        raise JaxUnsupportedCircuitException(
+            "The JAX backend does not support mode truncations "
+            + "and the factorized kernel"
+        )
+    jax, jnp = _jax()
+    structure, operators = circuit(experiment)
+    dtype = np.dtype(experiment.dtype)
+    with jax.enable_x64(dtype == np.complex128):
+        evolve, pure = circuit_cache.get(
+            structure, experiment.num_modes, experiment.cutoff, dtype
+        )
+        operators = [
+            (
+                [jnp.asarray(k, dtype=dtype) for k in operator]
+                if step.kind == "channel"
+                else jnp.asarray(operator, dtype=dtype)
+            )
+            for step, operator in zip(structure, operators)
+        ]
+        state, retained = evolve(operators)
+    return np.asarray(state), pure, np.asarray(retained)
+
+
+class JaxUnavailableException(Exception):
+    """
+    Exception for the case, when the JAX backend is
+    requested but jax can not be imported
+    """
+
+
+class JaxUnsupportedCircuitException(Exception):
+    """
+    Exception for the case, when the circuit uses a feature
+    which the JAX backend does not trace
+    """
@@ -0,0 +1,19 @@
+"""
+Operation queued in the Experiment
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class Operation:
+    """
+    Operator applied to the given modes, operators tagged as trace
+    preserving (unitaries) do not require renormalization of the state
+    """
+
+    operator: np.ndarray
+    modes: list
+    trace_preserving: bool = False
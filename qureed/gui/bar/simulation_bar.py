@@ -68,4 +68,4 @@ class SimulationBar(ft.UserControl):
         self.sim_warpper.execute()
 
     def on_dimensions_change(self, e):
-        Simulation.set_dimensions(int(e.control.value))
+        Simulation.get_instance().set_dimensions(int(e.control.value))
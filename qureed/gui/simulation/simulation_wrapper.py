@@ -25,20 +25,35 @@ class SimulationWrapper:
 
     __instance = None
 
-    def __new__(cls, *args, **kwargs):
+    def __new__(cls, *args, context=None, **kwargs):
+        if context is not None:
+            instance = super(SimulationWrapper, cls).__new__(cls)
+            instance.initialized = False
+            return instance
         if cls.__instance is None:
             cls.__instance = super(SimulationWrapper, cls).__new__(cls)
             cls.__instance.initialized = False
         return cls.__instance
 
-    def __init__(self):
+    def __init__(self, context=None):
         # pylint: disable=access-member-before-definition
+        if context is not None:
+            # Wrapper of a standalone context does not report to the gui
+            self.initialized = True
+            self.devices = []
+            self.signals = []
+            self.simulation_time = 1
+            self.logger = logging.getLogger("SimulationWrapper")
+            self.context = context
+            self.simulation = context.simulation
+            return
         if not self.initialized:
             self.initialized = True
             self.devices = []
             self.signals = []
             self.simulation_time = 1
             self._setup_logging()
+        self.context = None
         self.simulation = Simulation.get_instance()
 
     def execute(self):
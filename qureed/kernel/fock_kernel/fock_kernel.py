@@ -1,8 +1,14 @@
 """
 This module implements a Fock Kernel
 """
+
+import copy
 from typing import List
 
+import numpy as np
+
+from qureed._math import states
+from qureed._math.fock import ops
 from qureed.kernel.generic_kernel import GenericKernel
 
 
@@ -15,32 +21,215 @@ class FockMode:
         self.truncation = truncation
 
 
+def crop(operator, dims: List[int]):
+    """
+    Crops the operator with shape (out1, in1, ...) to the mode dimensions,
+    operators generated with a larger cutoff keep their matrix elements
+    """
+    operator = np.asarray(operator)
+    axes = [d for d in dims for _ in (0, 1)]
+    if any(size < d for size, d in zip(operator.shape, axes)):
+        raise OperatorDimensionException(
+            f"Operator of shape {operator.shape} can not act on modes of dimensions {dims}"
+        )
+    return operator[tuple(slice(0, d) for d in axes)]
+
+
 class FockState:
     """
-    This class keeps track of the modes
+    This class keeps track of the modes.
+
+    Joint state of a group of modes, each mode has its own truncation.
+    The state is a ket until a channel or a mixed state is applied,
+    afterwards a density matrix with indices (out1, in1, out2, in2, ...).
     """
 
-    def __init__(self, fock_mode: FockMode):
+    def __init__(self, fock_mode: FockMode, dtype=np.complex128):
+        self.modes = [fock_mode]
+        self.data = ops.vacuum_state(1, fock_mode.truncation, dtype)
+        self.pure = True
+        self.modified = True
+
+    @property
+    def dims(self) -> List[int]:
+        """
+        Truncations of the modes in the order of the tensor indices
+        """
+        return [mode.truncation for mode in self.modes]
+
+    def index(self, fock_modes: List[FockMode]) -> List[int]:
+        """
+        Tensor positions of the modes
+        """
+        return [self.modes.index(mode) for mode in fock_modes]
+
+    def promote(self):
+        """
+        Converts the ket into a density matrix
+        """
+        if self.pure:
+            self.data = ops.mix(self.data, len(self.modes))
+            self.pure = False
+
+    def merge(self, other: "FockState"):
+        """
+        Tensors the other state to the end of this state
+        """
+        if self.pure != other.pure:
+            self.promote()
+            other.promote()
+        self.data = np.tensordot(self.data, other.data, axes=0)
+        self.modes += other.modes
+        self.modified = True
+
+    def apply_operator(self, operator, fock_modes: List[FockMode]):
+        """
+        Applies the operator with shape (out1, in1, ...) to the modes
+        """
+        operator = crop(operator, [mode.truncation for mode in fock_modes])
+        operator = operator.astype(self.data.dtype, copy=False)
+        modes = self.index(fock_modes)
+        n = len(self.modes)
+        if self.pure:
+            self.data = ops.apply_gate_ket(operator, self.data, modes, n, None)
+        else:
+            self.data = ops.apply_gate_BLAS(operator, self.data, modes, n, None)
+        self.modified = True
+
+    def apply_channel(self, kraus_ops, fock_modes: List[FockMode]):
+        """
+        Applies the channel given by its Kraus operators to the modes
+        """
+        self.promote()
+        dims = [mode.truncation for mode in fock_modes]
+        kraus_ops = [crop(kraus, dims).astype(self.data.dtype) for kraus in kraus_ops]
+        self.data = ops.apply_channel(self.data, kraus_ops, self.index(fock_modes))
+        self.modified = True
+
+    def remove(self, fock_mode: FockMode):
+        """
+        Traces the mode out of the state
+        """
+        mode = self.modes.index(fock_mode)
+        self.promote()
+        self.data = ops.partial_trace(self.data, len(self.modes), [mode])
+        self.modes.pop(mode)
         self.modified = True
-        pass
 
-    def cleanup(self):
+    def trace(self) -> float:
+        """
+        Trace of the state
+        """
+        if self.pure:
+            return np.vdot(self.data, self.data).real
+        return ops.calculate_trace(self.to_state())
+
+    def normalize(self) -> float:
+        """
+        Divides the state by its trace and returns the trace
+        """
+        trace = self.trace()
+        if self.pure:
+            self.data = self.data / np.sqrt(trace)
+        else:
+            self.data = self.data / trace
+        return trace
+
+    def to_state(self, fock_modes: List[FockMode] = None) -> states.FockState:
+        """
+        Returns the state with the tensor indices in the order of fock_modes
+        """
+        data = self.data
+        if fock_modes is not None:
+            order = self.index(fock_modes)
+            if not self.pure:
+                order = [2 * i + j for i in order for j in (0, 1)]
+            data = np.transpose(data, order)
+        return states.FockState(
+            state_data=data,
+            num_modes=len(self.modes),
+            cutoff_dim=max(self.dims),
+            pure=self.pure,
+        )
+
+    def cleanup(self, tol: float = 1e-10) -> List["FockState"]:
+        """
+        Splits off the modes which are in a product state with the rest
+        of the modes, returns this state followed by the split off modes
+        """
+        factors = [self]
         if self.modified:
-            pass
+            for fock_mode in list(self.modes):
+                if len(self.modes) == 1:
+                    break
+                factor = self._split(fock_mode, tol)
+                if factor is not None:
+                    factors.append(factor)
+            self.modified = False
+        return factors
+
+    def _split(self, fock_mode: FockMode, tol: float):
+        """
+        Splits the mode off if it is not entangled with the other modes
+        """
+        mode = self.modes.index(fock_mode)
+        n = len(self.modes)
+        if self.pure:
+            view = np.moveaxis(self.data, mode, 0)
+            rest_shape = view.shape[1:]
+            u, s, vh = np.linalg.svd(
+                view.reshape((fock_mode.truncation, -1)), full_matrices=False
+            )
+            if s[0] == 0 or np.any(s[1:] > tol * s[0]):
+                return None
+            single = u[:, 0]
+            rest = (s[0] * vh[0]).reshape(rest_shape)
+        else:
+            single = ops.partial_trace(self.data, n, [i for i in range(n) if i != mode])
+            rest = ops.partial_trace(self.data, n, [mode])
+            trace = np.trace(single).real
+            if trace == 0:
+                return None
+            single = single / trace
+            view = np.moveaxis(self.data, [2 * mode, 2 * mode + 1], [0, 1])
+            product = np.tensordot(single, rest, axes=0)
+            if np.linalg.norm(view - product) > tol * np.linalg.norm(view):
+                return None
+        factor = FockState(fock_mode, self.data.dtype)
+        factor.data = single
+        factor.pure = self.pure
+        factor.modified = False
+        self.data = rest
+        self.modes.pop(mode)
+        return factor
 
 
 class FockKernel(GenericKernel):
     """
     This class implements Fock Kernel,
     Fock Kernel allows modes to have varied truncations.
+
+    The state is kept as independent factors, one per group of entangled
+    modes. Factors are merged when an operator spans several of them and
+    split again after measurements and partial traces.
     """
 
-    def __init__(self):
+    def __init__(self, context=None):
         """
         According to the special issue
         """
+        self.context = context
+        self.state = []
+        self.modes = []
+        self.dtype = np.complex128
+
+    def reset(self, dtype=np.complex128):
+        """
+        Removes all modes, new modes are kept in the given precision
+        """
         self.state = []
         self.modes = []
+        self.dtype = dtype
 
     def add_mode(self, truncation: int):  # pylint: disable=arguments-differ
         """
@@ -48,12 +237,267 @@ class FockKernel(GenericKernel):
         """
         fm = FockMode(truncation)
         self.modes.append(fm)
-        self.state.append(FockState(fm))
+        self.state.append(FockState(fm, self.dtype))
+        return len(self.modes) - 1
+
+    def truncation(self, mode_index: int) -> int:
+        """
+        Returns the truncation of the mode
+        """
+        return self.modes[mode_index].truncation
+
+    @property
+    def pure(self) -> bool:
+        """
+        True if the state is kept as a ket
+        """
+        return all(state.pure for state in self.state)
+
+    @property
+    def factor_sizes(self) -> List[int]:
+        """
+        Number of modes in each independent factor of the state
+        """
+        return [len(state.modes) for state in self.state]
+
+    def _factor(self, fock_mode: FockMode) -> FockState:
+        for state in self.state:
+            if fock_mode in state.modes:
+                return state
+        raise ModeNotFoundException("Mode is not part of the kernel state")
+
+    def _state_of(self, mode_indices: List[int]):
+        """
+        Returns the factor holding the modes, factors
+        are merged when the modes span more of them
+        """
+        fock_modes = [self.modes[i] for i in mode_indices]
+        state = self._factor(fock_modes[0])
+        for fock_mode in fock_modes[1:]:
+            other = self._factor(fock_mode)
+            if other is not state:
+                state.merge(other)
+                self.state.remove(other)
+        return state, fock_modes
+
+    def apply_operator(self, operator, mode_indices: List[int]):
+        """
+        Applies the operator with shape (out1, in1, ...) to the modes,
+        the operator is cropped to the truncations of the modes
+        """
+        state, fock_modes = self._state_of(mode_indices)
+        state.apply_operator(operator, fock_modes)
+
+    def apply_channel(self, kraus_ops, mode_indices: List[int]):
+        """
+        Applies the channel given by its Kraus operators to the modes
+        """
+        state, fock_modes = self._state_of(mode_indices)
+        state.apply_channel(kraus_ops, fock_modes)
+
+    def prepare(self, mode_index: int, data):
+        """
+        Replaces the state of the mode with the given single mode
+        ket or density matrix
+        """
+        fock_mode = self.modes[mode_index]
+        self._discard(fock_mode)
+        prepared = FockState(fock_mode, self.dtype)
+        data = np.asarray(data, dtype=self.dtype)
+        if data.ndim == 1:
+            prepared.data = data[: fock_mode.truncation]
+        else:
+            prepared.data = crop(data, [fock_mode.truncation])
+            prepared.pure = False
+        self.state.append(prepared)
+
+    def promote(self):
+        """
+        Converts the state into a density matrix
+        """
+        for state in self.state:
+            state.promote()
+
+    def normalize(self) -> float:
+        """
+        Normalizes the state and returns the trace before the normalization
+        """
+        trace = 1.0
+        for state in self.state:
+            trace *= state.normalize()
+        return trace
+
+    def get_state(self) -> "FactorizedState":
+        """
+        Returns the state with the modes in the kernel order, the state
+        keeps the factors and builds the joint tensor only on request
+        """
+        factors = []
+        for state in self.state:
+            # Later kernel calls replace the data, but modify the mode lists
+            factor = copy.copy(state)
+            factor.modes = list(state.modes)
+            factors.append(factor)
+        return FactorizedState(factors, list(self.modes), self.dtype)
+
+    def measure(self, mode_index: int, outcome: int = None, rng=None) -> int:
+        """
+        Projective photon number measurement of the mode, the outcome is
+        sampled when it is not given. The measured mode is split off.
+        """
+        fock_mode = self.modes[mode_index]
+        state = self._factor(fock_mode)
+        mode = state.modes.index(fock_mode)
+        probs = state.to_state().reduced_dm([mode]).diagonal().real
+        probs = probs / probs.sum()
+        if outcome is None:
+            rng = np.random.default_rng() if rng is None else rng
+            outcome = int(rng.choice(len(probs), p=probs))
+        projector = np.zeros((fock_mode.truncation,) * 2, dtype=self.dtype)
+        projector[outcome, outcome] = 1
+        state.apply_operator(projector, [fock_mode])
+        state.normalize()
+        self._cleanup()
+        return outcome
 
     def _cleanup(self):
         """
         Determines if the modes could be split
         """
+        factors = []
+        for state in self.state:
+            factors.extend(state.cleanup())
+        self.state = factors
+
+    def _discard(self, fock_mode: FockMode):
+        """
+        Traces the mode out of its factor
+        """
+        state = self._factor(fock_mode)
+        if len(state.modes) == 1:
+            self.state.remove(state)
+            return
+        state.remove(fock_mode)
+        self._cleanup()
 
     def remove_mode(self, mode_index: int):  # pylint: disable=arguments-differ
-        pass
+        """
+        Traces the mode out of the state, the indices of the
+        following modes are shifted by one
+        """
+        self._discard(self.modes.pop(mode_index))
+
+
+class FactorizedState(states.FockState):
+    """
+    State kept as the independent factors of the kernel, reductions
+    only use the factors holding the modes. The joint ket or density
+    matrix is built once, when it is requested.
+    """
+
+    def __init__(self, factors: List[FockState], fock_modes: List[FockMode], dtype):
+        dims = [mode.truncation for mode in fock_modes]
+        super().__init__(
+            None,
+            len(fock_modes),
+            max(dims, default=0),
+            pure=all(factor.pure for factor in factors),
+        )
+        self.factors = factors
+        self.fock_modes = fock_modes
+        self.dtype = dtype
+
+    @property
+    def dims(self) -> List[int]:
+        return [mode.truncation for mode in self.fock_modes]
+
+    def _groups(self, modes: List[int]):
+        """
+        Groups the modes by the factor holding them, returns
+        (factor, fock modes, positions in modes) per factor
+        """
+        groups = []
+        for position, mode in enumerate(modes):
+            fock_mode = self.fock_modes[mode]
+            for factor, fock_modes, positions in groups:
+                if fock_mode in factor.modes:
+                    fock_modes.append(fock_mode)
+                    positions.append(position)
+                    break
+            else:
+                factor = next(f for f in self.factors if fock_mode in f.modes)
+                groups.append((factor, [fock_mode], [position]))
+        return groups
+
+    def _joint(self) -> np.ndarray:
+        if self._data is None:
+            data = np.ones((), dtype=self.dtype)
+            fock_modes = []
+            for factor in self.factors:
+                factor_data = factor.data
+                if factor.pure and not self._pure:
+                    factor_data = ops.mix(factor_data, len(factor.modes))
+                data = np.tensordot(data, factor_data, axes=0)
+                fock_modes += factor.modes
+            order = [fock_modes.index(mode) for mode in self.fock_modes]
+            if not self._pure:
+                order = [2 * i + j for i in order for j in (0, 1)]
+            self._data = np.transpose(data, order)
+        return self._data
+
+    def ket(self) -> np.ndarray:
+        if not self._pure:
+            return None
+        return self._joint()
+
+    def dm(self) -> np.ndarray:
+        self._joint()
+        return super().dm()
+
+    def densify(self) -> states.FockState:
+        """
+        Returns the joint state
+        """
+        return states.FockState(
+            self._joint(),
+            self._num_modes,
+            self._cutoff,
+            hbar=self._hbar,
+            pure=self._pure,
+        )
+
+    def all_fock_probs(self):
+        probs = np.ones(())
+        fock_modes = []
+        for factor in self.factors:
+            factor_probs = factor.to_state().all_fock_probs()
+            probs = np.tensordot(probs, factor_probs, axes=0)
+            fock_modes += factor.modes
+        return np.transpose(probs, [fock_modes.index(m) for m in self.fock_modes])
+
+    def reduced_dm(self, modes):
+        if isinstance(modes, int):
+            modes = [modes]
+        reduced = np.ones((), dtype=self.dtype)
+        order = []
+        for factor, fock_modes, positions in self._groups(modes):
+            factor_dm = factor.to_state().reduced_dm(factor.index(fock_modes))
+            reduced = np.tensordot(reduced, factor_dm, axes=0)
+            order += positions
+        return np.transpose(
+            reduced, [2 * i + j for i in np.argsort(order) for j in (0, 1)]
+        )
+
+
+class ModeNotFoundException(Exception):
+    """
+    Exception for the case, when a mode is not held by any factor
+    of the kernel state
+    """
+
+
+class OperatorDimensionException(Exception):
+    """
+    Exception for the case, when an operator is smaller than the
+    truncation of the modes it is applied to
+    """
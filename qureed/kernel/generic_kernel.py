@@ -8,12 +8,15 @@ from abc import ABCMeta, abstractmethod
 
 class SingletonMeta(ABCMeta):
     """
-    All kernels must be singletons
+    All kernels must be singletons,
+    kernels created with a context are independent of the singleton
     """
 
     _instances = {}
 
     def __call__(cls, *args, **kwargs):
+        if kwargs.get("context") is not None:
+            return super().__call__(*args, **kwargs)
         if cls not in cls._instances:
             cls._instances[cls] = super().__call__(*args, **kwargs)
         return cls._instances[cls]
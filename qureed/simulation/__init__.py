@@ -2,5 +2,16 @@
 Module __init__ file
 """
 # pylint: disable=unused-import
+from .context import SimulationContext
 from .mode_manager import ModeManager
+from .scheduler import CalendarQueueScheduler, HeapScheduler, Scheduler
 from .simulation import DeviceInformation, Simulation, SimulationType
+from .time_base import (
+    FEMTOSECOND,
+    NANOSECOND,
+    PICOSECOND,
+    MpfTimeBase,
+    TickTimeBase,
+    TimeBase,
+)
+from .trace import EventTrace, TraceEventKind
@@ -0,0 +1,98 @@
+"""
+Simulation Context
+
+Simulation context owns everything one simulation needs: the
+Simulation object with its devices and event queue, the backend,
+the experiment and the mode manager. Independent contexts can run
+concurrently in threads or worker processes.
+
+The process wide singletons form the default context, which is used
+whenever no other context is active.
+"""
+
+import threading
+
+
+class SimulationContext:
+    """
+    Owns the state of one simulation
+
+    Devices are bound to the current context when constructed,
+    a context becomes current within a with block:
+
+        context = SimulationContext()
+        with context:
+            source = IdealNPhotonSource()
+    """
+
+    _default = None
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    def __init__(self, backend=None):
+        # pylint: disable=import-outside-toplevel
+        from qureed.backend.fock_first_backend import FockBackendFirst
+        from qureed.experiment import Experiment
+        from qureed.simulation.mode_manager import ModeManager
+        from qureed.simulation.simulation import Simulation
+
+        self.simulation = Simulation(context=self)
+        self.experiment = Experiment(context=self)
+        self.mode_manager = ModeManager(context=self)
+        if backend is None:
+            backend = FockBackendFirst(context=self)
+        self.simulation.set_backend(backend)
+
+    @property
+    def backend(self):
+        return self.simulation.get_backend()
+
+    @classmethod
+    def get_default(cls) -> "SimulationContext":
+        """
+        Returns the context formed by the process wide singletons
+        """
+        # pylint: disable=import-outside-toplevel
+        from qureed.experiment import Experiment
+        from qureed.simulation.mode_manager import ModeManager
+        from qureed.simulation.simulation import Simulation
+
+        with cls._lock:
+            if cls._default is None:
+                context = cls.__new__(cls)
+                context.simulation = Simulation.get_default_instance()
+                context.experiment = Experiment.get_default_instance()
+                context.mode_manager = ModeManager.get_default_instance()
+                cls._default = context
+        return cls._default
+
+    @classmethod
+    def get_active(cls):
+        """
+        Returns the context activated in this thread or None
+        """
+        stack = getattr(cls._local, "stack", None)
+        if stack:
+            return stack[-1]
+        return None
+
+    @classmethod
+    def get_current(cls) -> "SimulationContext":
+        """
+        Returns the active context or the default context
+        """
+        context = cls.get_active()
+        if context is None:
+            return cls.get_default()
+        return context
+
+    def __enter__(self):
+        stack = getattr(SimulationContext._local, "stack", None)
+        if stack is None:
+            stack = []
+            SimulationContext._local.stack = stack
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        SimulationContext._local.stack.pop()
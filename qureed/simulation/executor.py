@@ -0,0 +1,169 @@
+"""
+Device graph executor
+
+Computes the outputs of all devices for Simulation.run. Devices are
+ordered topologically by their signal connections and every device is
+submitted to a bounded thread pool only after all devices feeding its
+inputs have finished, so independent branches run in parallel and no
+worker ever blocks waiting for an input.
+
+Cycles and inputs which are never computed are detected before the
+execution starts, instead of blocking forever in wait_till_compute.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+
+
+def _port_signals(port) -> list:
+    """
+    Signals connected to the port, ports can hold multiple signals
+    """
+    if port.signal is None:
+        return []
+    if isinstance(port.signal, list):
+        return port.signal
+    return [port.signal]
+
+
+class DeviceGraphExecutor:
+    """
+    Executes compute_outputs of the devices in topological order
+    on a pool of at most max_workers threads
+    """
+
+    def __init__(self, devices: list, max_workers: int = None, context=None):
+        self.devices = list(devices)
+        self.max_workers = max_workers
+        self.context = context
+        self.dependents, self.in_degree = self._build_graph()
+
+    def _build_graph(self):
+        """
+        Builds the dependency graph, device depends on every device
+        driving a signal connected to one of its inputs
+        """
+        dependents = {device: [] for device in self.devices}
+        in_degree = {device: 0 for device in self.devices}
+        for device in self.devices:
+            for label, port in device.ports.items():
+                if port.direction != "input":
+                    continue
+                for signal in _port_signals(port):
+                    producers = [
+                        p.device
+                        for p in signal.ports
+                        if p.direction == "output" and p.device in dependents
+                    ]
+                    if not producers and not signal.computed.is_set():
+                        raise UnconnectedInputException(
+                            f"Input port {label} of {device.name} "
+                            + f"({type(device).__name__}) is not driven by any device"
+                        )
+                    for producer in producers:
+                        dependents[producer].append(device)
+                        in_degree[device] += 1
+        return dependents, in_degree
+
+    def order(self) -> list:
+        """
+        Returns the devices in topological order
+        """
+        in_degree = dict(self.in_degree)
+        ready = [device for device in self.devices if in_degree[device] == 0]
+        order = []
+        while ready:
+            device = ready.pop()
+            order.append(device)
+            for dependent in self.dependents[device]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.devices):
+            cycle = [d for d in self.devices if in_degree[d] > 0]
+            raise CyclicDeviceGraphException(
+                "Devices form a cycle: "
+                + ", ".join(f"{d.name} ({type(d).__name__})" for d in cycle)
+            )
+        return order
+
+    def run(self):
+        """
+        Computes the outputs of all devices
+        """
+        self.order()
+        in_degree = dict(self.in_degree)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {
+                pool.submit(self._compute, device): device
+                for device in self.devices
+                if in_degree[device] == 0
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    device = pending.pop(future)
+                    future.result()
+                    self._check_outputs(device)
+                    self._discard_outputs(device)
+                    for dependent in self.dependents[device]:
+                        in_degree[dependent] -= 1
+                        if in_degree[dependent] == 0:
+                            pending[pool.submit(self._compute, dependent)] = dependent
+
+    def _compute(self, device):
+        with self.context or nullcontext():
+            device.compute_outputs()
+
+    def _check_outputs(self, device):
+        """
+        Makes sure the device computed every output its dependents wait for
+        """
+        if not self.dependents[device]:
+            return
+        for label, port in device.ports.items():
+            if port.direction != "output":
+                continue
+            for signal in _port_signals(port):
+                if signal.computed.is_set():
+                    continue
+                if any(p.direction == "input" for p in signal.ports):
+                    raise UncomputedOutputException(
+                        f"{device.name} ({type(device).__name__}) did not "
+                        + f"compute the signal on its output port {label}"
+                    )
+
+    def _discard_outputs(self, device):
+        """
+        Modes on outputs which are not connected to any input are released
+        """
+        if self.context is None:
+            return
+        for port in device.ports.values():
+            if port.direction != "output":
+                continue
+            for signal in _port_signals(port):
+                mode_id = getattr(signal, "mode_id", None)
+                if mode_id is None:
+                    continue
+                if not any(p.direction == "input" for p in signal.ports):
+                    self.context.mode_manager.discard(mode_id)
+
+
+class CyclicDeviceGraphException(Exception):
+    """
+    Raised when the devices can not be ordered because of a cycle
+    """
+
+
+class UnconnectedInputException(Exception):
+    """
+    Raised when an input waits for a signal no device computes
+    """
+
+
+class UncomputedOutputException(Exception):
+    """
+    Raised when a device finishes without computing an output
+    other devices are waiting for
+    """
@@ -2,38 +2,81 @@
 This file implements a mode
 manager
 """
+import heapq
+import threading
 import uuid
 
 from qureed._math.fock.ops import vacuum_state
+from qureed.backend.backend import Backend
+from qureed.simulation.context import SimulationContext
 
 
 class ModeManager:
     """
     Mode managing logic
-    SINGLETON
+    SINGLETON, ModeManager() returns the mode manager of the active
+    context, or the default one if no context is active
     """
 
     __instance = None
 
-    def __new__(cls, *args, **kwargs):
-        from qureed.simulation import Simulation
+    def __new__(cls, *args, context=None, **kwargs):
+        if context is None:
+            active = SimulationContext.get_active()
+            if active is not None:
+                return active.mode_manager
+            return cls.get_default_instance()
+        instance = super(ModeManager, cls).__new__(cls)
+        instance.__initialized = False
+        return instance
+
+    def __init__(self, context=None):
+        if not self.__initialized:
+            self.__initialized = True
+            self.context = context
+            self.modes = {}
+            self.free_indices = []
+            self.peak_modes = 0
+            self.garbage_collection = False
+            self._lock = threading.Lock()
+
+    @classmethod
+    def get_default_instance(cls):
+        """
+        Returns the mode manager of the default context
+        """
         if not cls.__instance:
             cls.__instance = super(ModeManager, cls).__new__(cls)
             cls.__instance.__initialized = False
+            cls.__instance.__init__()
         return cls.__instance
 
-    def __init__(self):
-        if not self.__initialized:
-            self.__initialized = True
-            self.simulation = Simulation.get_instance()
-            self.modes = {}
+    @property
+    def simulation(self):
+        if self.context is None:
+            return SimulationContext.get_default().simulation
+        return self.context.simulation
+
+    def set_garbage_collection(self, enabled: bool = True):
+        """
+        Modes consumed by detectors or routed to unconnected
+        outputs are released when garbage collection is enabled
+        """
+        self.garbage_collection = enabled
 
     def create_new_mode(self) -> str:
         """
         Creates a new mode in vacuum state and returns its id.
+        The lowest index of a released mode is reused.
         """
-        new_mode_id = uuid.uuid4()
-        self.modes[new_mode_id] = len(self.modes.keys())
+        with self._lock:
+            new_mode_id = uuid.uuid4()
+            if self.free_indices:
+                index = heapq.heappop(self.free_indices)
+            else:
+                index = len(self.modes.keys())
+            self.modes[new_mode_id] = index
+            self.peak_modes = max(self.peak_modes, index + 1)
         return new_mode_id
 
     def get_mode_index(self, key: str):
@@ -41,9 +84,30 @@ class ModeManager:
 
     def clear_modes(self) -> None:
         self.modes = {}
+        self.free_indices = []
+        self.peak_modes = 0
 
     def get_mode(self, mode_id: str):
         return self.modes[mode_id]
 
     def remove_mode(self, mode_id: str) -> None:
-        pass
+        """
+        Releases the mode, the backend traces it out of the state
+        and its index is reused by the next created mode
+        """
+        with self._lock:
+            index = self.modes.pop(mode_id, None)
+            if index is None:
+                return
+            backend = self.simulation.get_backend()
+            if isinstance(backend, Backend):
+                backend.release_mode(index)
+            heapq.heappush(self.free_indices, index)
+
+    def discard(self, mode_id: str) -> None:
+        """
+        Called for modes no device will use again,
+        releases the mode if garbage collection is enabled
+        """
+        if self.garbage_collection and mode_id is not None:
+            self.remove_mode(mode_id)
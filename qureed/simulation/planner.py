@@ -0,0 +1,268 @@
+"""
+Resource planner for Fock and Gaussian simulations
+
+Estimates the peak memory and the floating point operations of a run
+from the device graph, the cutoff and the state representation, before
+any state is allocated. Representations:
+
+    KET             dense pure state, cutoff^n elements
+    DENSITY_MATRIX  dense mixed state, cutoff^(2n) elements
+    SECTORS         pure state split by total photon number, only the
+                    occupations up to the photon number bound are stored
+    GAUSSIAN        means and covariance matrix, (2n)^2 elements
+
+The planner picks the cheapest applicable representation which fits
+the memory budget and raises MemoryBudgetExceededException otherwise.
+"""
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List
+
+import numpy as np
+
+from qureed._math.fock.sectors import photon_shift
+from qureed.signals.generic_quantum_signal import GenericQuantumSignal
+
+SIZE_UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+class Representation(Enum):
+    KET = "ket"
+    DENSITY_MATRIX = "density_matrix"
+    SECTORS = "sectors"
+    GAUSSIAN = "gaussian"
+
+
+@dataclass
+class ResourceEstimate:
+    """
+    Estimated peak memory in bytes and floating point operations
+    """
+
+    representation: Representation
+    modes: int
+    cutoff: int
+    memory: int
+    flops: int
+
+    def __str__(self):
+        return (
+            f"{self.representation.value:>14}: {format_size(self.memory):>10} "
+            + f"peak, {self.flops:.3e} flops"
+        )
+
+
+@dataclass
+class ResourcePlan:
+    """
+    Estimates of all applicable representations, the cheapest one
+    which fits the budget is selected
+    """
+
+    selected: ResourceEstimate
+    estimates: List[ResourceEstimate] = field(default_factory=list)
+    budget: int = None
+
+    def __str__(self):
+        budget = "unlimited" if self.budget is None else format_size(self.budget)
+        lines = [f"Memory budget: {budget}"]
+        for estimate in self.estimates:
+            marker = "*" if estimate is self.selected else " "
+            lines.append(f"{marker} {estimate}")
+        return "\n".join(lines)
+
+
+def parse_size(size) -> int:
+    """
+    Parses sizes like 512M or 4G (binary units) into bytes
+    """
+    if isinstance(size, (int, float)):
+        return int(size)
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMGT]?)i?B?\s*", str(size).upper())
+    if match is None:
+        raise ValueError(f"Invalid size {size}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def format_size(size: int) -> str:
+    for unit in ("T", "G", "M", "K"):
+        if size >= SIZE_UNITS[unit]:
+            return f"{size / SIZE_UNITS[unit]:.2f} {unit}iB"
+    return f"{size} B"
+
+
+def sector_size(modes: int, cutoff: int, photons: int) -> int:
+    """
+    Number of occupations of the modes with at most photons photons in total
+    """
+    counts = np.zeros(photons + 1, dtype=object)
+    counts[0] = 1
+    for _ in range(modes):
+        updated = np.zeros_like(counts)
+        for n in range(min(cutoff, photons + 1)):
+            updated[n:] += counts[: photons + 1 - n]
+        counts = updated
+    return int(counts.sum())
+
+
+def gate_sizes(devices) -> List[int]:
+    """
+    Number of modes each device acts on, devices with quantum
+    ports are counted as one gate on all of their quantum modes
+    """
+    sizes = []
+    for device in devices:
+        ports = [
+            port
+            for port in device.ports.values()
+            if port.signal_type is GenericQuantumSignal
+        ]
+        inputs = [port for port in ports if port.direction == "input"]
+        if ports:
+            sizes.append(max(len(inputs), len(ports) - len(inputs), 1))
+    return sizes
+
+
+def estimate(
+    representation: Representation,
+    modes: int,
+    cutoff: int,
+    gates: List[int] = (),
+    photons: int = None,
+    dtype=np.complex128,
+) -> ResourceEstimate:
+    """
+    Estimates the peak memory and the flops of the representation,
+    gates lists the number of modes of every applied operator
+    """
+    itemsize = np.dtype(dtype).itemsize
+    largest = max(gates, default=1)
+    operator = itemsize * cutoff ** (2 * largest)
+    if representation is Representation.KET:
+        size = cutoff**modes
+        # Gate application allocates the output next to the input
+        memory = 2 * itemsize * size + operator
+        flops = sum(8 * size * cutoff**k for k in gates)
+    elif representation is Representation.DENSITY_MATRIX:
+        size = cutoff ** (2 * modes)
+        # State, the two alternating channel buffers and the slice of
+        # the state which is copied for the superoperator product
+        memory = 3 * itemsize * size + itemsize * size // cutoff + operator
+        flops = sum(16 * size * cutoff**k for k in gates)
+    elif representation is Representation.SECTORS:
+        if photons is None:
+            photons = modes * (cutoff - 1)
+        size = sector_size(modes, cutoff, min(photons, modes * (cutoff - 1)))
+        # Amplitudes, occupation basis and the sparse transition structure
+        transitions = 3 * 8 * size * cutoff ** (largest - 1)
+        memory = 2 * itemsize * size + 8 * modes * size + transitions + operator
+        flops = sum(8 * size * cutoff ** (k - 1) for k in gates)
+    else:
+        size = (2 * modes) ** 2
+        memory = 2 * 8 * (size + 2 * modes)
+        flops = sum(16 * k * k * 2 * modes for k in gates)
+    return ResourceEstimate(representation, modes, cutoff, int(memory), int(flops))
+
+
+def plan(
+    modes: int,
+    cutoff: int,
+    gates: List[int] = (),
+    budget: int = None,
+    pure: bool = False,
+    photons: int = None,
+    gaussian: bool = False,
+    dtype=np.complex128,
+) -> ResourcePlan:
+    """
+    Selects the cheapest applicable representation within the budget.
+
+    Args:
+        modes (int): number of modes
+        cutoff (int): Fock cutoff
+        gates (list<int>): number of modes of every operator
+        budget (int): memory budget in bytes, None for no limit
+        pure (bool): the state stays pure, no channels or mixed preparations
+        photons (int): bound of the total photon number, enables sectors
+        gaussian (bool): the circuit is Gaussian
+    """
+    if gaussian:
+        candidates = [Representation.GAUSSIAN]
+    elif pure:
+        candidates = [Representation.KET]
+        if photons is not None:
+            candidates.append(Representation.SECTORS)
+    else:
+        candidates = [Representation.DENSITY_MATRIX]
+    estimates = [
+        estimate(r, modes, cutoff, gates, photons=photons, dtype=dtype)
+        for r in candidates
+    ]
+    estimates.sort(key=lambda e: (e.memory, e.flops))
+    fitting = [e for e in estimates if budget is None or e.memory <= budget]
+    if not fitting:
+        raise MemoryBudgetExceededException(
+            f"{modes} modes with cutoff {cutoff} need at least "
+            + f"{format_size(estimates[0].memory)} "
+            + f"({estimates[0].representation.value}), "
+            + f"the budget is {format_size(budget)}"
+        )
+    return ResourcePlan(fitting[0], estimates, budget)
+
+
+def queued_hints(experiment) -> dict:
+    """
+    Purity and photon number bound of the circuit queued in the
+    experiment, photons is None if an operator does not shift the
+    total photon number by a fixed amount
+    """
+    pure = not (experiment.channels or experiment.mixed_preparations)
+    photons = 0
+    for photon_number, modes in experiment.state_preparations:
+        photons += photon_number * (1 if isinstance(modes, int) else len(modes))
+    for operation in experiment.operations:
+        size = len(operation.modes)
+        operator = np.asarray(operation.operator)
+        shift = None
+        if operator.ndim == 2 * size:
+            shift = photon_shift(operator, size, operator.shape[0])
+        if shift is None:
+            photons = None
+            break
+        photons += max(shift, 0)
+    return {"pure": pure, "photons": photons if pure else None}
+
+
+def check_hints(hints: dict, queued: dict):
+    """
+    Raises PlanHintException if the hints promise a cheaper
+    circuit than the queued one
+    """
+    if hints.get("pure") and not queued["pure"]:
+        raise PlanHintException(
+            "The state was planned as pure, the circuit has channels "
+            + "or mixed preparations"
+        )
+    photons = hints.get("photons")
+    if photons is not None and (
+        queued["photons"] is None or queued["photons"] > photons
+    ):
+        bound = "unbounded" if queued["photons"] is None else queued["photons"]
+        raise PlanHintException(
+            f"The state was planned with at most {photons} photons, "
+            + f"the circuit needs {bound}"
+        )
+
+
+class MemoryBudgetExceededException(Exception):
+    """
+    Raised when no representation of the state fits the memory budget
+    """
+
+
+class PlanHintException(Exception):
+    """
+    Raised when the planning hints contradict the queued circuit
+    """
@@ -0,0 +1,223 @@
+"""
+Event schedulers for the discrete event simulation.
+
+Scheduler keeps the pending simulation events ordered by time.
+Events scheduled for the same device at the same time are merged
+into a single event.
+"""
+
+import heapq
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort_right
+
+
+class Scheduler(ABC):
+    """
+    All schedulers must extend this class
+    """
+
+    @abstractmethod
+    def push(self, event):
+        """
+        Adds the event, if an event for the same device at the
+        same time is already pending the events are merged
+        """
+
+    @abstractmethod
+    def pop(self):
+        """
+        Removes and returns the earliest event
+        """
+
+    @abstractmethod
+    def get(self, time, device):
+        """
+        Returns the pending event for the device at the given time or None
+        """
+
+    @abstractmethod
+    def events(self) -> list:
+        """
+        Returns the pending events, the first event is the earliest one
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Drops all pending events
+        """
+
+    @abstractmethod
+    def __len__(self):
+        """
+        Number of pending events
+        """
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class HeapScheduler(Scheduler):
+    """
+    Binary heap scheduler, O(log n) per push and pop
+    """
+
+    def __init__(self):
+        self.queue = []
+        self.event_map = {}
+
+    def push(self, event):
+        key = (event.event_time, event.device)
+        existing_event = self.event_map.get(key)
+        if existing_event is not None:
+            existing_event.merge_event(event)
+        else:
+            heapq.heappush(self.queue, event)
+            self.event_map[key] = event
+
+    def pop(self):
+        event = heapq.heappop(self.queue)
+        key = (event.event_time, event.device)
+        if self.event_map.get(key) is event:
+            del self.event_map[key]
+        return event
+
+    def get(self, time, device):
+        return self.event_map.get((time, device))
+
+    def events(self) -> list:
+        return self.queue
+
+    def clear(self):
+        self.queue = []
+        self.event_map = {}
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class CalendarQueueScheduler(Scheduler):
+    """
+    Calendar queue scheduler (R. Brown, 1988), amortized O(1) per push and pop.
+
+    Events are hashed into buckets (days) by time, each bucket covers
+    bucket_width of time and the buckets together cover one year.
+    The number of buckets and the bucket width are adapted to the
+    pending events whenever the queue grows or shrinks by a factor of two.
+    """
+
+    # Number of events used to estimate the new bucket width
+    sample_size = 25
+
+    def __init__(self, bucket_count: int = 2, bucket_width=1.0):
+        self.size = 0
+        self._resize_enabled = True
+        self._initialize(bucket_count, bucket_width, 0)
+
+    def _initialize(self, bucket_count, bucket_width, start_time):
+        self.bucket_count = bucket_count
+        self.bucket_width = bucket_width
+        self.buckets = [[] for _ in range(bucket_count)]
+        self._last_day = self._day(start_time)
+        self._last_bucket = self._last_day % bucket_count
+        self._grow_threshold = 2 * bucket_count
+        self._shrink_threshold = bucket_count // 2 - 2
+
+    def _day(self, time) -> int:
+        """
+        Virtual bucket number of the given time
+        """
+        return math.floor(float(time) / self.bucket_width)
+
+    def push(self, event):
+        time = event.event_time
+        day = self._day(time)
+        bucket = self.buckets[day % self.bucket_count]
+        i = bisect_left(bucket, event)
+        while i < len(bucket) and bucket[i].event_time == time:
+            if bucket[i].device is event.device:
+                bucket[i].merge_event(event)
+                return
+            i += 1
+        insort_right(bucket, event)
+        self.size += 1
+        if day < self._last_day:
+            # Event is scheduled before the current position in the calendar
+            self._last_day = day
+            self._last_bucket = day % self.bucket_count
+        if self.size > self._grow_threshold:
+            self._resize(2 * self.bucket_count)
+
+    def pop(self):
+        if self.size == 0:
+            raise IndexError("pop from an empty scheduler")
+        for _ in range(self.bucket_count):
+            bucket = self.buckets[self._last_bucket]
+            if bucket and self._day(bucket[0].event_time) == self._last_day:
+                return self._remove_first(bucket)
+            self._last_day += 1
+            self._last_bucket = (self._last_bucket + 1) % self.bucket_count
+
+        # No event within one year, jump directly to the earliest event
+        bucket = min((b for b in self.buckets if b), key=lambda b: b[0])
+        self._last_day = self._day(bucket[0].event_time)
+        self._last_bucket = self._last_day % self.bucket_count
+        return self._remove_first(bucket)
+
+    def _remove_first(self, bucket):
+        event = bucket.pop(0)
+        self.size -= 1
+        if self.size < self._shrink_threshold:
+            self._resize(self.bucket_count // 2)
+        return event
+
+    def get(self, time, device):
+        bucket = self.buckets[self._day(time) % self.bucket_count]
+        for event in bucket:
+            if event.event_time == time and event.device is device:
+                return event
+        return None
+
+    def events(self) -> list:
+        return sorted(event for bucket in self.buckets for event in bucket)
+
+    def clear(self):
+        self.size = 0
+        self._initialize(2, self.bucket_width, 0)
+
+    def __len__(self):
+        return self.size
+
+    def _resize(self, bucket_count):
+        """
+        Rehashes all events into the new number of buckets
+        """
+        if not self._resize_enabled:
+            return
+        events = [event for bucket in self.buckets for event in bucket]
+        width = self._estimate_width(events)
+        start_time = min(events).event_time if events else 0
+        self._initialize(bucket_count, width, start_time)
+        self._resize_enabled = False
+        self.size = 0
+        for event in events:
+            self.push(event)
+        self._resize_enabled = True
+
+    def _estimate_width(self, events):
+        """
+        Estimates the bucket width from the average separation
+        of the earliest events, ignoring unusually large separations
+        """
+        if len(events) < 2:
+            return self.bucket_width
+        times = [float(e.event_time) for e in heapq.nsmallest(self.sample_size, events)]
+        separations = [b - a for a, b in zip(times, times[1:])]
+        average = sum(separations) / len(separations)
+        separations = [s for s in separations if s <= 2 * average]
+        if separations:
+            average = sum(separations) / len(separations)
+        if average <= 0:
+            return self.bucket_width
+        return 3 * average
@@ -9,6 +9,7 @@ import pickle
 import socket
 import struct
 import sys
+from contextlib import nullcontext
 from logging.handlers import SocketHandler
 from pathlib import Path
 
@@ -16,6 +17,9 @@ from qureed.extra import Loggers, get_custom_logger
 from qureed.gui.board.board import get_class_from_string
 from qureed.gui.board.ports import BoardConnector
 from qureed.gui.simulation import SimulationWrapper
+from qureed.simulation.planner import parse_size
+from qureed.simulation.simulation import SimulationType
+from qureed.simulation.sweep import SIM_TYPES, ParameterSweep
 
 
 class LengthPrefixedSocketHandler(logging.handlers.SocketHandler):
@@ -33,21 +37,30 @@ class JsonExecution:
         self.simulation_type = kwargs.get("sim_type")
         self.duration = kwargs.get("duration")
         self.port = kwargs.get("port")
-        self.sw = SimulationWrapper()
-        self.schemes = {}
+        self.context = kwargs.get("context")
+        self.sw = SimulationWrapper(context=self.context)
+        self.schemes = kwargs.get("schemes") or {}
+        self.memory_budget = kwargs.get("memory_budget")
+        if self.memory_budget is not None:
+            self.sw.simulation.set_memory_budget(parse_size(self.memory_budget))
 
         base_path = Path(self.main_scheme).parent
         if str(base_path) not in sys.path:
             sys.path.append(str(base_path))
 
     def assemble_simulation(self):
-        self._get_scheme_dict(self.main_scheme)
+        with self.context or nullcontext():
+            self._assemble_simulation()
+
+    def _assemble_simulation(self):
+        if self.main_scheme not in self.schemes:
+            self._get_scheme_dict(self.main_scheme)
         if self.schemes[self.main_scheme].get("devices") is not None:
             for d in self.schemes[self.main_scheme]["devices"]:
                 dev_class = get_class_from_string(d["device"])
                 dev_instance = dev_class(uid=d["uuid"], name=d["name"])
                 if "values" in d:
-                    dev_instance.values = d["values"]
+                    dev_instance.values = dict(d["values"])
                 self.sw.add_device(dev_instance)
             for connection in self.schemes[self.main_scheme]["connections"]:
                 signal_class = get_class_from_string(connection["signal"])
@@ -73,18 +86,45 @@ class JsonExecution:
             loggerB.addHandler(socket_handler)
             loggerC.addHandler(socket_handler)
 
+    def plan(self):
+        """
+        Resource estimate of the assembled scheme
+        """
+        with self.context or nullcontext():
+            return self.sw.simulation.plan()
+
+    def simulate(self):
+        """
+        Runs the assembled scheme, errors are raised to the caller.
+        fock and gaussian evaluate the device graph once with the
+        respective backend, des runs the discrete event simulation.
+        """
+        with self.context or nullcontext():
+            simulation = self.sw.simulation
+            match self.simulation_type:
+                case "des":
+                    simulation.run_des(self.duration)
+                case "fock" | "gaussian":
+                    simulation.set_simulation_type(
+                        SimulationType[self.simulation_type.upper()]
+                    )
+                    simulation.run()
+                case _:
+                    raise ValueError(
+                        f"Unknown simulation type {self.simulation_type}, "
+                        + f"expected one of {SIM_TYPES}"
+                    )
+
     def run(self):
         simulation_logger = get_custom_logger(Loggers.Simulation)
         print(f"duration: {self.duration}")
 
-        match self.simulation_type:
-            case "des":
-                try:
-                    self.sw.simulation.run_des(self.duration)
-                except Exception as e:
-                    simulation_logger.error(
-                        f"An error occurred during DES simulation: {e}"
-                    )
+        try:
+            self.simulate()
+        except Exception as e:
+            simulation_logger.error(
+                f"An error occurred during {self.simulation_type} simulation: {e}"
+            )
 
     def _get_scheme_dict(self, scheme):
         with open(scheme, "r", encoding="UTF-8") as f:
@@ -102,7 +142,11 @@ def main():
         help="Path to the main json scheme to execute",
     )
     parser.add_argument(
-        "--sim_type", type=str, default="des", help="Type of simulation"
+        "--sim_type",
+        type=str,
+        default="des",
+        choices=SIM_TYPES,
+        help="Type of simulation",
     )
     parser.add_argument(
         "--duration",
@@ -111,14 +155,63 @@ def main():
     )
 
     parser.add_argument("--port", type=int, help="Log connection port", required=False)
+    parser.add_argument(
+        "--sweep",
+        type=str,
+        help="Path to the json sweep specification, runs a parameter sweep",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes used by the sweep",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="sweep.npz",
+        help="Path to the columnar sweep output file",
+    )
+
+    parser.add_argument(
+        "--memory_budget",
+        type=str,
+        help="Memory budget of the state, e.g. 4G, the run fails fast if exceeded",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Prints the memory and flops estimate and exits",
+    )
 
     args = parser.parse_args()
 
     if args.sim_type == "des" and args.duration is None:
         parser.error("The --duration argument is required when --sim_type is 'des'")
 
+    if args.sweep is not None and args.plan:
+        parser.error("The --plan argument can not be combined with --sweep")
+
+    if args.sweep is not None:
+        sweep = ParameterSweep.from_file(
+            args.scheme,
+            args.duration,
+            args.sweep,
+            workers=args.workers,
+            sim_type=args.sim_type,
+            memory_budget=args.memory_budget,
+        )
+        print(f"Running sweep over {len(sweep.points())} points")
+        columns = sweep.run()
+        sweep.save(args.output, columns)
+        print(f"Completed, results written to {args.output}")
+        return
+
     JE = JsonExecution(**vars(args))
     JE.assemble_simulation()
+    if args.plan or args.memory_budget is not None:
+        print(JE.plan())
+        if args.plan:
+            return
     print("Running Simulation")
     JE.configure_loggers()
     JE.run()
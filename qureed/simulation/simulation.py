@@ -3,21 +3,30 @@ Simulation Module
 """
 
 # pylint: skip-file
-import heapq
 import uuid
 from dataclasses import dataclass
 from enum import Enum, auto
-from threading import Thread
 from typing import TYPE_CHECKING, Type
 
-import mpmath
-
 from qureed.backend.backend import Backend, FockBackend
 from qureed.backend.fock_first_backend import FockBackendFirst
-from qureed.experiment.experiment_manager import Experiment
+from qureed.backend.gaussian_backend import GaussianBackend
 from qureed.extra import Loggers, get_custom_logger
 from qureed.signals.generic_bool_signal import GenericBoolSignal
 from qureed.signals.generic_quantum_signal import GenericQuantumSignal
+from qureed.simulation.context import SimulationContext
+from qureed.simulation.executor import DeviceGraphExecutor
+from qureed.simulation.planner import (
+    Representation,
+    ResourcePlan,
+    check_hints,
+    gate_sizes,
+    plan,
+    queued_hints,
+)
+from qureed.simulation.scheduler import HeapScheduler, Scheduler
+from qureed.simulation.time_base import MpfTimeBase, TimeBase
+from qureed.simulation.trace import EventTrace, TraceEventKind
 
 if TYPE_CHECKING:
     from qureed.devices import GenericDevice
@@ -110,7 +119,10 @@ class SimulationEvent:
 
 
 class Simulation:
-    """Singleton object"""
+    """
+    Singleton object, additional independent simulations
+    are owned by a SimulationContext
+    """
 
     __instance = None
 
@@ -123,30 +135,60 @@ class Simulation:
     @staticmethod
     def get_instance():
         """
-        Method that returns a single Simulation object
+        Method that returns the Simulation object of the active context,
+        or the single default Simulation object
+        """
+        context = SimulationContext.get_active()
+        if context is not None:
+            return context.simulation
+        return Simulation.get_default_instance()
+
+    @staticmethod
+    def get_default_instance():
+        """
+        Method that returns the single default Simulation object
         """
         if Simulation.__instance is None:
             Simulation()
         return Simulation.__instance
 
-    def __init__(self):
+    def __init__(self, context=None):
         """
         Initialization method
         """
-        if Simulation.__instance is None:
-            Simulation.__instance = self
+        if context is not None or Simulation.__instance is None:
+            if context is None:
+                Simulation.__instance = self
+            self._context = context
             self.backend = FockBackendFirst
             self.devices = []
             self.initial_trigger_devices = []
             self.simulation_type = SimulationType.FOCK
-            self.event_queue = []
-            self.event_map = {}
-            mpmath.mp.prec = 256
-            self.current_time = mpmath.mpf("0")
-            self.end_time = mpmath.mpf("0")
+            self.scheduler = HeapScheduler()
+            self.fast_mode = False
+            self.trace = None
+            self.processed_events = 0
+            self.max_workers = None
+            self.memory_budget = None
+            self.plan_hints = {}
+            self.resource_plan = None
+            self.routing_table = None
+            self.dangling_ports = []
+            self.time_base = MpfTimeBase()
+            self.current_time = self.time_base.zero
+            self.end_time = self.time_base.zero
         else:
             raise Exception("Simulation is a singleton class")
 
+    @property
+    def context(self) -> SimulationContext:
+        """
+        Context owning this simulation
+        """
+        if self._context is None:
+            return SimulationContext.get_default()
+        return self._context
+
     def register_device(self, device_information: DeviceInformation):
         """
         Component registration in the simulation singleton object
@@ -157,47 +199,260 @@ class Simulation:
     def set_simulation_type(self, simulation_type: SimulationType):
         self.simulation_type = simulation_type
 
-    @classmethod
-    def set_dimensions(cls, dimensions):
-        cls.dimensions = dimensions
+    def set_time_base(self, time_base: TimeBase):
+        """
+        Selects the time base used by the scheduler,
+        already scheduled events are converted to the new time base
+        """
+        old_time_base = self.time_base
+        self.time_base = time_base
+
+        def convert(time):
+            return time_base.from_seconds(old_time_base.to_seconds(time))
+
+        self.current_time = convert(self.current_time)
+        self.end_time = convert(self.end_time)
+        events = list(self.scheduler.events())
+        self.scheduler.clear()
+        for event in events:
+            event.event_time = convert(event.event_time)
+            self.scheduler.push(event)
+
+    def set_scheduler(self, scheduler: Scheduler):
+        """
+        Selects the event scheduler,
+        already scheduled events are moved to the new scheduler
+        """
+        events = list(self.scheduler.events())
+        self.scheduler.clear()
+        for event in events:
+            scheduler.push(event)
+        self.scheduler = scheduler
+
+    def get_scheduler(self) -> Scheduler:
+        return self.scheduler
+
+    def compile(self) -> dict:
+        """
+        Freezes the connection graph into a routing table, which maps
+        (device, output port label) to (device, input port label).
+        Signal type mismatches raise an exception, ports which are not
+        connected to any other port are collected in dangling_ports.
+        Signals sent from dangling output ports are dropped, they are
+        reported with a warning.
+        """
+        routing_table = {}
+        dangling_ports = []
+        for device_information in self.devices:
+            device = device_information.obj_ref
+            for label, port in device.ports.items():
+                signal = port.signal
+                if signal is None:
+                    dangling_ports.append((device, label))
+                    continue
+                if not isinstance(signal, port.signal_type):
+                    raise NetlistSignalMismatchException(
+                        f"Signal {type(signal).__name__} can not be connected to "
+                        + f"port {label} of {device.name} ({type(device).__name__})"
+                    )
+                connected_ports = [p for p in signal.ports if p is not port]
+                if not connected_ports:
+                    dangling_ports.append((device, label))
+                    continue
+                if port.direction != "output":
+                    continue
+                connected_port = connected_ports[0]
+                if connected_port.direction == "output":
+                    raise NetlistDirectionException(
+                        f"Output port {label} of {device.name} is connected to "
+                        + f"output port {connected_port.label} of "
+                        + f"{connected_port.device.name}"
+                    )
+                routing_table[(device, label)] = (
+                    connected_port.device,
+                    connected_port.label,
+                )
+        self.routing_table = routing_table
+        self.dangling_ports = dangling_ports
+        dangling_outputs = [
+            f"{device.name}.{label}"
+            for device, label in dangling_ports
+            if device.ports[label].direction == "output"
+        ]
+        if dangling_outputs:
+            get_custom_logger(Loggers.Simulation).warning(
+                "Output ports are not connected, their signals are dropped: "
+                + ", ".join(dangling_outputs)
+            )
+        return routing_table
 
-    @classmethod
-    def get_dimensions(cls):
-        return cls.dimensions
+    def invalidate_routing(self):
+        """
+        Drops the compiled routing table, called when connections change
+        """
+        self.routing_table = None
+
+    def route(self, device, port_label: str):
+        """
+        Returns the device and the port label connected to the output port
+        """
+        if self.routing_table is None:
+            return device.get_next_device_and_port(port_label)
+        return self.routing_table.get((device, port_label), (None, None))
+
+    def set_max_workers(self, max_workers: int):
+        """
+        Bounds the number of threads computing device outputs in run,
+        None selects the thread pool default
+        """
+        self.max_workers = max_workers
+
+    def set_memory_budget(self, budget: int = None, pure=False, photons=None):
+        """
+        Limits the memory of the state, run checks the estimate before
+        allocating it. pure tells that the state stays pure, photons
+        bounds the total photon number of a passive circuit, both
+        allow cheaper representations for the check before the devices
+        run. The queued circuit is checked against them before the
+        state is allocated. None removes the limit.
+        """
+        self.memory_budget = budget
+        self.plan_hints = {"pure": pure, "photons": photons}
+
+    def set_precision(self, dtype):
+        """
+        Precision of the Fock state, see Experiment.set_precision
+        """
+        self.context.experiment.set_precision(dtype)
+
+    def plan(self, modes: int = None, **hints) -> ResourcePlan:
+        """
+        Estimates the peak memory and flops of the run from the device
+        graph and selects the cheapest representation within the budget
+        """
+        if modes is None:
+            modes = sum([d.new_modes for d in self.devices])
+        hints = {**self.plan_hints, **hints}
+        self.resource_plan = plan(
+            modes,
+            self.dimensions,
+            gate_sizes([d.obj_ref for d in self.devices]),
+            budget=self.memory_budget,
+            gaussian=self.simulation_type == SimulationType.GAUSSIAN,
+            dtype=self.context.experiment.dtype,
+            **hints,
+        )
+        return self.resource_plan
+
+    def set_fast_mode(self, fast_mode: bool = True):
+        """
+        In fast mode no per event log messages are constructed,
+        use enable_trace to record the events instead
+        """
+        self.fast_mode = fast_mode
+
+    def enable_trace(self, capacity: int = 1_000_000) -> EventTrace:
+        """
+        Records processed and scheduled events into a binary trace buffer
+        """
+        self.trace = EventTrace(capacity)
+        return self.trace
+
+    def disable_trace(self):
+        self.trace = None
+
+    @property
+    def event_queue(self) -> list:
+        """
+        Pending events, the first event is the earliest one
+        """
+        return self.scheduler.events()
+
+    def get_time_base(self) -> TimeBase:
+        return self.time_base
+
+    def to_seconds(self, time):
+        """
+        Converts simulation time into seconds
+        """
+        return self.time_base.to_seconds(time)
+
+    def from_seconds(self, seconds):
+        """
+        Converts seconds into simulation time
+        """
+        return self.time_base.from_seconds(seconds)
+
+    def set_dimensions(self, dimensions):
+        self.dimensions = dimensions
+
+    def get_dimensions(self):
+        return self.dimensions
 
     def run_des(self, simulation_time):
+        """
+        Runs the discrete event simulation,
+        simulation_time is given in seconds
+        """
         logger = get_custom_logger(Loggers.Simulation)
         logger.info("Starting Simulation")
-        self.end_time += simulation_time
-        while self.event_queue and self.current_time <= self.end_time:
-            event = heapq.heappop(self.event_queue)
-            time_as_float = float(event.event_time)
-            logger.info(
-                f"[{time_as_float:.3e}s] Processing Event for {event.device.name} of type {event.device.__class__.__name__}"
-            )
+        if self.routing_table is None:
+            self.compile()
+        self.end_time += self.time_base.from_seconds(simulation_time)
+        scheduler = self.scheduler
+        fast_mode = self.fast_mode
+        trace = self.trace
+        to_seconds = self.time_base.to_seconds
+        processed_events = 0
+        while scheduler and self.current_time <= self.end_time:
+            event = scheduler.pop()
+            if trace is not None:
+                trace.record(
+                    TraceEventKind.PROCESS, to_seconds(event.event_time), event.device
+                )
+            if not fast_mode:
+                time_as_float = to_seconds(event.event_time)
+                logger.info(
+                    f"[{time_as_float:.3e}s] Processing Event for {event.device.name} of type {event.device.__class__.__name__}"
+                )
             event.device.des(event.event_time, *event.args, **event.kwargs)
-            # remove from the event map
             self.current_time = event.event_time
-            key = (self.current_time, event.device)
-            if key in self.event_map:
-                del self.event_map[key]
+            processed_events += 1
+        self.processed_events += processed_events
 
     def schedule_event(self, time, device, *args, **kwargs):
+        """
+        Schedules an event, time is given in time base units
+        """
         event = SimulationEvent(time, device, *args, **kwargs)
-        key = (time, device)
-        if key in self.event_map:
-            existing_event = self.event_map[key]
-            existing_event.merge_event(event)
+        self.scheduler.push(event)
+
+    def schedule_signal(self, time, device, port_label: str, signal):
+        """
+        Schedules delivery of the signal to the input port of the device,
+        signals for an already pending event are added to that event
+        """
+        event = self.scheduler.get(time, device)
+        if event is not None:
+            event.kwargs["signals"][port_label] = signal
         else:
-            heapq.heappush(self.event_queue, event)
-            self.event_map[key] = event
+            self.scheduler.push(
+                SimulationEvent(time, device, signals={port_label: signal})
+            )
 
     def run(self):
         """
         Executes the experiment
         """
+        if self.simulation_type == SimulationType.GAUSSIAN and not isinstance(
+            self.backend, GaussianBackend
+        ):
+            self.set_backend(GaussianBackend(context=self._context))
         # Determine number of modes
         modes = sum([d.new_modes for d in self.devices])
+        if self.memory_budget is not None:
+            # Fails before the devices run, with the hints of the caller
+            self.plan(modes)
         if isinstance(self.backend, FockBackend):
             self.backend.set_number_of_modes(modes)
             self.backend.set_dimensions(self.dimensions)
@@ -208,18 +463,31 @@ class Simulation:
             sig = d.ports["TRIGGER"].signal
             sig.set_contents = True
             sig.set_computed()
-        processes = []
-        for d in self.devices:
-            p = Thread(target=d.obj_ref.compute_outputs, args=(d.obj_ref,))
-            processes.append(p)
-        for p in processes:
-            p.start()
-        for p in processes:
-            p.join()
-
+        executor = DeviceGraphExecutor(
+            [d.obj_ref for d in self.devices],
+            max_workers=self.max_workers,
+            context=self.context,
+        )
+        executor.run()
+
+        mode_manager = self.context.mode_manager
+        if mode_manager.garbage_collection and isinstance(self.backend, FockBackend):
+            # Released indices were reused, the state only needs the peak
+            self.backend.set_number_of_modes(mode_manager.peak_modes)
+            modes = mode_manager.peak_modes
+        if self.memory_budget is not None and (
+            self.simulation_type == SimulationType.FOCK
+        ):
+            # The queued circuit decides, before the state is allocated
+            experiment = self.context.experiment
+            hints = queued_hints(experiment)
+            check_hints(self.plan_hints, hints)
+            selected = self.plan(modes, **hints).selected.representation
+            experiment.set_sector_representation(selected is Representation.SECTORS)
         if self.simulation_type == SimulationType.FOCK:
-            exp = Experiment.get_instance()
-            exp.execute()
+            self.context.experiment.execute()
+        elif self.simulation_type == SimulationType.GAUSSIAN:
+            self.backend.execute()
 
     def register_triggers(self, *devices):
         """
@@ -272,5 +540,16 @@ class Simulation:
         return self.backend
 
     def stop_simulation(self) -> None:
-        while self.event_queue:
-            heapq.heappop(self.event_queue)
+        self.scheduler.clear()
+
+
+class NetlistSignalMismatchException(Exception):
+    """
+    Raised when a signal is connected to a port of a different signal type
+    """
+
+
+class NetlistDirectionException(Exception):
+    """
+    Raised when an output port is connected to another output port
+    """
@@ -0,0 +1,275 @@
+"""
+Parameter sweeps over json schemes
+
+A sweep runs one scheme for many combinations of device values.
+Sweep specification lists the swept (device uuid, value) pairs:
+
+    {
+        "mode": "grid",
+        "parameters": [
+            {"device": "<uuid>", "value": "value", "values": [1, 2, 3]},
+            {"device": "<uuid>", "value": "value", "values": [0.1, 0.2]}
+        ]
+    }
+
+In "grid" mode every combination of the values is simulated, in "list"
+mode the value lists must have equal length and are zipped into points.
+Points are distributed over a pool of spawned worker processes, each
+worker imports the device classes and loads the scheme once and keeps
+them for all the points it runs. Every point runs in a fresh
+SimulationContext.
+
+Next to the run statistics every point reports the mean photon number
+and the photon number probabilities of every mode of the final state,
+rows are padded with NaN. DES runs on envelopes leave no final state
+and only report the statistics.
+"""
+
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from qureed.simulation.context import SimulationContext
+
+SWEEP_MODES = ("grid", "list")
+SIM_TYPES = ("des", "fock", "gaussian")
+
+# Scheme loaded once by every worker process
+_worker_scheme = None
+
+
+@dataclass
+class SweepParameter:
+    """
+    Swept value of one device
+    """
+
+    device: str
+    value: str
+    values: list
+
+    @property
+    def column(self) -> str:
+        return f"{self.device}:{self.value}"
+
+
+class ParameterSweep:
+    """
+    Runs a json scheme for every point of the sweep specification
+    and collects the results into columns
+    """
+
+    def __init__(
+        self,
+        scheme,
+        duration,
+        spec: dict,
+        workers: int = None,
+        sim_type="des",
+        memory_budget=None,
+    ):
+        self.scheme = str(scheme)
+        self.duration = duration
+        self.workers = workers
+        # Applied to the simulation of every point, e.g. 4G
+        self.memory_budget = memory_budget
+        if sim_type not in SIM_TYPES:
+            raise SweepSpecException(
+                f"Unknown simulation type {sim_type}, expected one of {SIM_TYPES}"
+            )
+        self.sim_type = sim_type
+        self.mode = spec.get("mode", "grid")
+        if self.mode not in SWEEP_MODES:
+            raise SweepSpecException(
+                f"Unknown sweep mode {self.mode}, expected one of {SWEEP_MODES}"
+            )
+        try:
+            self.parameters = [SweepParameter(**p) for p in spec["parameters"]]
+        except (KeyError, TypeError) as exc:
+            raise SweepSpecException(
+                "Sweep parameters must define device, value and values"
+            ) from exc
+        if not self.parameters:
+            raise SweepSpecException("Sweep defines no parameters")
+        if self.mode == "list":
+            lengths = {len(p.values) for p in self.parameters}
+            if len(lengths) != 1:
+                raise SweepSpecException(
+                    "All value lists must have the same length in list mode"
+                )
+
+    @classmethod
+    def from_file(cls, scheme, duration, path, **kwargs):
+        with open(path, "r", encoding="UTF-8") as f:
+            spec = json.load(f)
+        return cls(scheme, duration, spec, **kwargs)
+
+    def points(self) -> list:
+        """
+        Values of the swept parameters for every point
+        """
+        values = [p.values for p in self.parameters]
+        if self.mode == "grid":
+            return list(itertools.product(*values))
+        return list(zip(*values))
+
+    def run(self) -> dict:
+        """
+        Runs all points on the worker pool, returns the result columns
+        """
+        points = self.points()
+        overrides = [
+            [(p.device, p.value, v) for p, v in zip(self.parameters, point)]
+            for point in points
+        ]
+        # Forking a process which already runs jax threads can deadlock
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.scheme,),
+        ) as executor:
+            rows = list(
+                executor.map(
+                    _run_point,
+                    overrides,
+                    itertools.repeat(self.duration),
+                    itertools.repeat(self.sim_type),
+                    itertools.repeat(self.memory_budget),
+                )
+            )
+
+        columns = {}
+        for i, parameter in enumerate(self.parameters):
+            columns[parameter.column] = np.asarray([point[i] for point in points])
+        for key in ("status", "error", "events", "end_time", "wall_time"):
+            columns[key] = np.asarray([row[key] for row in rows])
+        columns["mean_photons"] = _pad([row["mean_photons"] for row in rows], 1)
+        columns["probabilities"] = _pad([row["probabilities"] for row in rows], 2)
+        return columns
+
+    @staticmethod
+    def save(path, columns: dict):
+        """
+        Writes the result columns into a single npz file
+        """
+        np.savez(path, **columns)
+
+
+def _initialize_worker(scheme):
+    """
+    Loads the scheme and imports the device classes once per worker
+    """
+    # pylint: disable=import-outside-toplevel,global-statement
+    from qureed.gui.board.board import get_class_from_string
+
+    global _worker_scheme
+    base_path = str(Path(scheme).parent)
+    if base_path not in sys.path:
+        sys.path.append(base_path)
+    with open(scheme, "r", encoding="UTF-8") as f:
+        scheme_dict = json.load(f)
+    for device in scheme_dict.get("devices") or []:
+        get_class_from_string(device["device"])
+    for connection in scheme_dict.get("connections") or []:
+        get_class_from_string(connection["signal"])
+    _worker_scheme = (scheme, scheme_dict)
+
+
+def _pad(arrays, ndim: int) -> np.ndarray:
+    """
+    Stacks the arrays with ndim dimensions, padding them with NaN
+    to a common shape. No arrays give an empty stack of that shape.
+    """
+    arrays = [np.asarray(a, dtype=float) for a in arrays]
+    # Empty observables, e.g. of a state without modes, keep their dimensions
+    arrays = [a.reshape((0,) * ndim) if a.size == 0 else a for a in arrays]
+    if any(a.ndim != ndim for a in arrays):
+        raise ValueError(f"Observables must have {ndim} dimensions")
+    if not arrays:
+        return np.zeros((0,) * (ndim + 1))
+    shape = tuple(max(sizes) for sizes in zip(*[a.shape for a in arrays]))
+    padded = np.full((len(arrays),) + shape, np.nan)
+    for row, a in zip(padded, arrays):
+        row[tuple(slice(0, size) for size in a.shape)] = a
+    return padded
+
+
+def _observables(context, sim_type):
+    """
+    Mean photon numbers with shape (modes,) and photon number
+    probabilities with shape (modes, cutoff) of the final state
+    """
+    if sim_type == "gaussian":
+        state = context.backend.state
+    else:
+        state = context.experiment.state
+    if state is None:
+        return np.zeros(0), np.zeros((0, 0))
+    if sim_type == "gaussian":
+        modes = range(len(state.means()) // 2)
+        cutoff = context.simulation.get_dimensions()
+        probabilities = [state.all_fock_probs(cutoff, modes=[m]) for m in modes]
+    else:
+        modes = range(len(state.dims))
+        probabilities = [state.reduced_dm([m]).diagonal().real for m in modes]
+    means = np.array([state.mean_photon(mode) for mode in modes])
+    return means, _pad(probabilities, 1)
+
+
+def _run_point(overrides, duration, sim_type, memory_budget) -> dict:
+    """
+    Simulates one point of the sweep in a fresh context
+    """
+    # pylint: disable=import-outside-toplevel
+    from qureed.simulation.simulate_from_json import JsonExecution
+
+    scheme, scheme_dict = _worker_scheme
+    context = SimulationContext()
+    context.simulation.set_fast_mode()
+    execution = JsonExecution(
+        scheme=scheme,
+        sim_type=sim_type,
+        duration=duration,
+        context=context,
+        schemes={scheme: scheme_dict},
+        memory_budget=memory_budget,
+    )
+    row = {
+        "status": "ok",
+        "error": "",
+        "events": 0,
+        "end_time": 0.0,
+        "mean_photons": np.zeros(0),
+        "probabilities": np.zeros((0, 0)),
+    }
+    start = time.perf_counter()
+    try:
+        execution.assemble_simulation()
+        for device_uuid, value, v in overrides:
+            device = execution.sw.get_device(device_uuid)
+            if device is None:
+                raise SweepSpecException(f"Device {device_uuid} is not in the scheme")
+            device.values = {**device.values, value: v}
+        execution.simulate()
+        row["mean_photons"], row["probabilities"] = _observables(context, sim_type)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["wall_time"] = time.perf_counter() - start
+    row["events"] = context.simulation.processed_events
+    row["end_time"] = context.simulation.to_seconds(context.simulation.current_time)
+    return row
+
+
+class SweepSpecException(Exception):
+    """
+    Raised when the sweep specification can not be used
+    """
@@ -0,0 +1,99 @@
+"""
+Time bases for the discrete event simulation.
+
+A time base decides how the simulation represents time internally.
+Devices and users talk in seconds, the scheduler talks in the units of
+the selected time base, conversion happens at the edges.
+"""
+
+from abc import ABC, abstractmethod
+
+import mpmath
+
+FEMTOSECOND = 1e-15
+PICOSECOND = 1e-12
+NANOSECOND = 1e-9
+
+
+class TimeBase(ABC):
+    """
+    All time bases must extend this class
+    """
+
+    # Differences smaller than tolerance are considered simultaneous
+    tolerance = 0
+
+    @property
+    @abstractmethod
+    def zero(self):
+        """
+        Start of the simulation in time base units
+        """
+
+    @abstractmethod
+    def from_seconds(self, seconds):
+        """
+        Converts seconds into time base units
+        """
+
+    @abstractmethod
+    def to_seconds(self, time):
+        """
+        Converts time base units into seconds
+        """
+
+
+class MpfTimeBase(TimeBase):
+    """
+    Arbitrary precision time base, times are kept in seconds
+    and the simulation clock uses mpmath.mpf numbers.
+    """
+
+    tolerance = 1e-9
+
+    def __init__(self, precision: int = 256):
+        self.precision = precision
+        mpmath.mp.prec = precision
+
+    @property
+    def zero(self):
+        return mpmath.mpf("0")
+
+    def from_seconds(self, seconds):
+        return seconds
+
+    def to_seconds(self, time):
+        return float(time)
+
+
+class TickTimeBase(TimeBase):
+    """
+    Fixed resolution time base, times are integer number of ticks.
+    The default resolution of one tick is one femtosecond.
+    """
+
+    tolerance = 1
+
+    def __init__(self, resolution: float = FEMTOSECOND):
+        if resolution <= 0:
+            raise InvalidTimeResolutionException(
+                f"Time resolution must be positive, got {resolution}"
+            )
+        self.resolution = resolution
+        self._ticks_per_second = 1 / resolution
+
+    @property
+    def zero(self):
+        return 0
+
+    def from_seconds(self, seconds) -> int:
+        return int(round(seconds * self._ticks_per_second))
+
+    def to_seconds(self, time) -> float:
+        return time * self.resolution
+
+
+class InvalidTimeResolutionException(Exception):
+    """
+    Raised when the time resolution can not be used
+    """
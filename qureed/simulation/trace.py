@@ -0,0 +1,106 @@
+"""
+Binary event trace for the discrete event simulation.
+
+In fast mode the simulation does not log individual events,
+instead processed and scheduled events can be recorded into a
+preallocated ring buffer of fixed size records.
+"""
+
+import struct
+from enum import IntEnum
+
+import numpy as np
+
+
+class TraceEventKind(IntEnum):
+    """
+    Kind of the recorded event
+    """
+
+    PROCESS = 0
+    SCHEDULE = 1
+
+
+class EventTrace:
+    """
+    Ring buffer of fixed size binary records.
+
+    Each record holds the event time in seconds, the event kind,
+    the id of the device and the id of the target device (-1 if none).
+    Device ids are assigned in order of appearance, `devices` maps them
+    back to the device objects. When the buffer is full the oldest
+    records are overwritten.
+    """
+
+    record_struct = struct.Struct("<dBii")
+    dtype = np.dtype(
+        [("time", "<f8"), ("kind", "u1"), ("device", "<i4"), ("target", "<i4")]
+    )
+
+    def __init__(self, capacity: int = 1_000_000):
+        if capacity <= 0:
+            raise InvalidTraceCapacityException("Trace capacity must be positive")
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * self.record_struct.size)
+        self.count = 0
+        self.devices = []
+        self._device_ids = {}
+        self._pack_into = self.record_struct.pack_into
+
+    def device_id(self, device) -> int:
+        """
+        Returns the id of the device, registering it if needed
+        """
+        device_id = self._device_ids.get(device)
+        if device_id is None:
+            device_id = len(self.devices)
+            self._device_ids[device] = device_id
+            self.devices.append(device)
+        return device_id
+
+    def record(self, kind: TraceEventKind, time: float, device, target=None):
+        """
+        Records one event
+        """
+        device_id = self.device_id(device)
+        target_id = -1 if target is None else self.device_id(target)
+        offset = (self.count % self.capacity) * self.record_struct.size
+        self._pack_into(self.buffer, offset, time, kind, device_id, target_id)
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Returns the recorded events as a structured array in chronological order
+        """
+        records = np.frombuffer(self.buffer, dtype=self.dtype)
+        if self.count <= self.capacity:
+            return records[: self.count].copy()
+        start = self.count % self.capacity
+        return np.concatenate((records[start:], records[:start]))
+
+    def device_names(self) -> list:
+        """
+        Names of the devices indexed by their ids
+        """
+        return [device.name for device in self.devices]
+
+    def save(self, path):
+        """
+        Writes the raw records in chronological order to the file
+        """
+        with open(path, "wb") as f:
+            f.write(self.to_numpy().tobytes())
+
+    def clear(self):
+        self.count = 0
+        self.devices = []
+        self._device_ids = {}
+
+
+class InvalidTraceCapacityException(Exception):
+    """
+    Raised when the trace buffer can not hold any records
+    """
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import batch, ops
+from qureed.experiment.experiment_manager import BatchSizeException
+from qureed.simulation import SimulationContext
+
+
+class TestBatchedGenerators(unittest.TestCase):
+    def test_matches_scalar_generators(self):
+        theta = np.linspace(0, np.pi, 5)
+        phi = 0.3
+        for batched, scalar in [
+            (batch.phase_batch(theta, 4), [ops.phase(t, 4) for t in theta]),
+            (
+                batch.displacement_batch(theta, phi, 4),
+                [ops.displacement(t, phi, 4) for t in theta],
+            ),
+            (
+                batch.squeezing_batch(theta / 4, phi, 4),
+                [ops.squeezing(t / 4, phi, 4) for t in theta],
+            ),
+            (
+                batch.beamsplitter_batch(theta, phi, 4),
+                [ops.beamsplitter(t, phi, 4) for t in theta],
+            ),
+        ]:
+            np.testing.assert_allclose(batched, np.stack(scalar), atol=1e-14)
+
+
+class TestBatchedExperiment(unittest.TestCase):
+    def run_circuit(self, theta, channel=False):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(3)
+        backend.set_dimensions(4)
+        backend.initialize_number_state(1, [0])
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1], True)
+        backend.apply_operator(backend.phase_shift(theta, 0), [1], True)
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1], True)
+        backend.apply_operator(backend.displace(0.2, 0.1, 0), [2], True)
+        if channel:
+            context.experiment.add_channel(ops.lossChannel(0.7, 4), [0])
+        context.experiment.execute()
+        return context.experiment
+
+    def test_phase_sweep(self):
+        thetas = np.linspace(0, 2 * np.pi, 7)
+        for channel in (False, True):
+            experiment = self.run_circuit(thetas, channel)
+            self.assertEqual(len(experiment.state), len(thetas))
+            self.assertEqual(experiment.truncation_error.shape, (len(thetas),))
+            for theta, state in zip(thetas, experiment.state):
+                reference = self.run_circuit(theta, channel).state
+                self.assertEqual(state.is_pure, not channel)
+                np.testing.assert_allclose(state.dm(), reference.dm(), atol=1e-12)
+
+    def test_mismatched_batches(self):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(1)
+        backend.set_dimensions(3)
+        backend.apply_operator(backend.phase_shift(np.zeros(2), 0), [0], True)
+        backend.apply_operator(backend.phase_shift(np.zeros(3), 0), [0], True)
+        with self.assertRaises(BatchSizeException):
+            context.experiment.execute()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.experiment import Operation
+from qureed.experiment.fusion import fuse_operations
+from qureed.simulation import SimulationContext
+
+
+class TestGateFusion(unittest.TestCase):
+    def setUp(self):
+        self.cutoff = 4
+        self.context = SimulationContext()
+        self.backend = self.context.backend
+        self.backend.set_number_of_modes(3)
+        self.backend.set_dimensions(self.cutoff)
+        self.experiment = self.context.experiment
+
+    def add_circuit(self):
+        backend = self.backend
+        backend.initialize_number_state(1, [0])
+        backend.initialize_number_state(2, [1])
+        backend.apply_operator(backend.phase_shift(0.3, 0), [0])
+        backend.apply_operator(backend.displace(0.2, 0.4, 0), [0])
+        backend.apply_operator(backend.beam_splitter(np.pi / 5, 0.2), [0, 1])
+        backend.apply_operator(backend.squeeze(0.1, 0), [2])
+        backend.apply_operator(backend.beam_splitter(0.3, 0.1), [1, 0])
+        backend.apply_operator(backend.phase_shift(0.7, 0), [1])
+        backend.apply_operator(backend.displace(0.1, 0.0, 0), [2])
+
+    def test_fused_operations(self):
+        self.add_circuit()
+        fused, removed = fuse_operations(self.experiment.operations, self.cutoff)
+        self.assertEqual(removed, 3)
+        self.assertEqual([op.modes for op in fused], [[0], [0, 1], [2], [1]])
+
+    def test_fused_state_matches(self):
+        self.add_circuit()
+        self.experiment.set_fusion(False)
+        self.experiment.execute()
+        expected = self.experiment.state.ket()
+        self.assertEqual(self.experiment.removed_contractions, 0)
+
+        self.experiment.set_fusion(True)
+        self.experiment.execute()
+        self.assertEqual(self.experiment.removed_contractions, 3)
+        np.testing.assert_allclose(self.experiment.state.ket(), expected, atol=1e-12)
+
+    def test_overlapping_modes_block_fusion(self):
+        displacement = ops.displacement(0.2, 0.0, self.cutoff)
+        splitter = ops.beamsplitter(0.3, 0.0, self.cutoff).transpose((0, 2, 1, 3))
+        operations = [
+            Operation(displacement, [0]),
+            Operation(splitter, [0, 1]),
+            Operation(displacement, [0]),
+        ]
+        fused, removed = fuse_operations(operations, self.cutoff)
+        self.assertEqual(removed, 0)
+        self.assertIs(fused[1].operator, splitter)
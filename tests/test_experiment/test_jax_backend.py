@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.experiment import jax_backend
+from qureed.simulation import SimulationContext
+
+
+class TestJaxBackend(unittest.TestCase):
+    def run_circuit(self, theta, channel=False, jax=True):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(3)
+        backend.set_dimensions(4)
+        backend.initialize_number_state(1, [0])
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1], True)
+        backend.apply_operator(backend.phase_shift(theta, 0), [1], True)
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1], True)
+        backend.apply_operator(backend.displace(0.2, 0.1, 0), [2], True)
+        if channel:
+            context.experiment.add_channel(ops.lossChannel(0.7, 4), [0])
+        context.experiment.set_jax(jax)
+        context.experiment.execute()
+        return context.experiment
+
+    def test_matches_numpy(self):
+        for channel in (False, True):
+            experiment = self.run_circuit(0.4, channel)
+            reference = self.run_circuit(0.4, channel, jax=False)
+            self.assertEqual(experiment.pure, not channel)
+            np.testing.assert_allclose(
+                experiment.state.dm(), reference.state.dm(), atol=1e-12
+            )
+            self.assertAlmostEqual(
+                experiment.truncation_error, reference.truncation_error
+            )
+
+    def test_compiled_once(self):
+        jax_backend.circuit_cache.clear()
+        first = self.run_circuit(0.1).state.dm()
+        second = self.run_circuit(0.2).state.dm()
+        info = jax_backend.circuit_cache.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 1))
+        self.assertFalse(np.allclose(first, second))
+
+    def test_phase_sweep(self):
+        thetas = np.linspace(0, 2 * np.pi, 5)
+        experiment = self.run_circuit(thetas, channel=True)
+        self.assertEqual(len(experiment.state), len(thetas))
+        for theta, state in zip(thetas, experiment.state):
+            reference = self.run_circuit(theta, True, jax=False).state
+            np.testing.assert_allclose(state.dm(), reference.dm(), atol=1e-12)
+
+    def test_precision(self):
+        context = SimulationContext()
+        experiment = context.experiment
+        experiment.update_mode_number(1)
+        experiment.update_dimensions(4)
+        experiment.set_precision(np.complex64)
+        experiment.add_operation(ops.displacement(0.3, 0, 4), [0], True)
+        experiment.set_jax()
+        experiment.execute()
+        self.assertEqual(experiment.state.ket().dtype, np.complex64)
+
+
+if __name__ == "__main__":
+    unittest.main()
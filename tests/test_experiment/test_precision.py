@@ -0,0 +1,48 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.experiment.experiment_manager import UnsupportedPrecisionException
+from qureed.simulation import SimulationContext
+
+
+class TestPrecision(unittest.TestCase):
+    def run_circuit(self, dtype, channel=True, **settings):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(3)
+        backend.set_dimensions(6)
+        experiment = context.experiment
+        experiment.set_precision(dtype)
+        for setting, value in settings.items():
+            getattr(experiment, setting)(value)
+        backend.initialize_number_state(1, [0])
+        backend.apply_operator(backend.displace(0.3, 0.2, 1), [1], True)
+        backend.apply_operator(backend.squeeze(0.2j, 2), [2], True)
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0.1), [0, 1], True)
+        backend.apply_operator(backend.beam_splitter(0.3, 0), [1, 2], True)
+        backend.apply_operator(backend.phase_shift(0.7, 0), [0], True)
+        if channel:
+            experiment.add_channel(ops.lossChannel(0.8, 6), [1])
+        experiment.execute()
+        return experiment.state
+
+    def test_single_precision_error(self):
+        for channel in (False, True):
+            reference = self.run_circuit(np.complex128, channel)
+            state = self.run_circuit(np.complex64, channel)
+            self.assertEqual(state.dm().dtype, np.complex64)
+            error = np.max(np.abs(state.dm() - reference.dm()))
+            self.assertLess(error, 1e-5)
+
+    def test_kernel_and_sectors(self):
+        reference = self.run_circuit(np.complex128, channel=False)
+        for setting in ("set_factorized", "set_sector_representation"):
+            state = self.run_circuit(np.complex64, channel=False, **{setting: True})
+            self.assertEqual(state.ket().dtype, np.complex64)
+            np.testing.assert_allclose(state.ket(), reference.ket(), atol=1e-5)
+
+    def test_unsupported_precision(self):
+        with self.assertRaises(UnsupportedPrecisionException):
+            SimulationContext().experiment.set_precision(np.float32)
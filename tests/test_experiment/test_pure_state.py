@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.simulation import SimulationContext
+
+
+class TestPureStateExecution(unittest.TestCase):
+    def setUp(self):
+        self.context = SimulationContext()
+        self.backend = self.context.backend
+        self.backend.set_number_of_modes(3)
+        self.backend.set_dimensions(4)
+        self.experiment = self.context.experiment
+
+    def add_circuit(self):
+        self.backend.initialize_number_state(1, [0])
+        self.backend.apply_operator(self.backend.beam_splitter(np.pi / 4, 0), [0, 2])
+        self.backend.apply_operator(self.backend.phase_shift(0.3, 0), [2])
+        self.backend.apply_operator(self.backend.displace(0.2, 0.1, 0), [1])
+
+    def test_unitary_circuit_stays_pure(self):
+        self.add_circuit()
+        self.experiment.execute()
+        state = self.experiment.state
+        self.assertTrue(state.is_pure)
+        self.assertEqual(state.ket().shape, (4, 4, 4))
+        self.assertAlmostEqual(np.linalg.norm(state.ket()), 1)
+
+        rho = ops.vacuumStateMixed(3, 4)
+        operator = ops.fock_operator(1, 4)
+        rho = ops.apply_gate_BLAS(operator, rho, [0], 3, 4)
+        for operation in self.experiment.operations:
+            rho = ops.apply_gate_BLAS(operation.operator, rho, operation.modes, 3, 4)
+        rho /= np.einsum("aabbcc", rho).real
+        np.testing.assert_allclose(state.dm(), rho, atol=1e-12)
+        np.testing.assert_allclose(
+            state.all_fock_probs(), np.einsum("aabbcc->abc", rho).real, atol=1e-12
+        )
+
+    def test_reduced_from_ket(self):
+        self.add_circuit()
+        self.experiment.execute()
+        state = self.experiment.state
+        rho = state.dm()
+        for modes, subscripts in [([0], "abccdd->ab"), ([0, 2], "abccde->abde")]:
+            np.testing.assert_allclose(
+                state.reduced_dm(modes), np.einsum(subscripts, rho), atol=1e-12
+            )
+        diagonal = np.einsum("aabbcc->b", rho).real
+        self.assertAlmostEqual(state.mean_photon(1), np.dot(np.arange(4), diagonal))
+
+    def test_channel_promotes(self):
+        self.add_circuit()
+        self.experiment.add_channel(ops.lossChannel(0.5, 4), [0])
+        self.experiment.execute()
+        state = self.experiment.state
+        self.assertFalse(state.is_pure)
+        self.assertIsNone(state.ket())
+        self.assertEqual(state.dm().shape, (4,) * 6)
+        self.assertAlmostEqual(ops.calculate_trace(state), 1)
+
+    def test_mixed_preparation_promotes(self):
+        thermal = ops.thermalState(0.2, 4)
+        thermal /= np.trace(thermal)
+        self.experiment.mixed_state_init(thermal, 1)
+        self.backend.initialize_number_state(1, [0])
+        self.experiment.execute()
+        state = self.experiment.state
+        self.assertFalse(state.is_pure)
+        np.testing.assert_allclose(state.reduced_dm([1]), thermal, atol=1e-12)
+        self.assertAlmostEqual(state.mean_photon([0]), 1)
@@ -0,0 +1,38 @@
+import unittest
+
+import numpy as np
+
+from qureed.simulation import SimulationContext
+
+
+class TestModeRelease(unittest.TestCase):
+    def setUp(self):
+        self.context = SimulationContext()
+        self.backend = self.context.backend
+        self.backend.set_number_of_modes(2)
+        self.backend.set_dimensions(4)
+        self.experiment = self.context.experiment
+
+    def test_release_resets_mode(self):
+        backend = self.backend
+        backend.initialize_number_state(1, [0])
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1], True)
+        backend.release_mode(1)
+        self.experiment.execute()
+        state = self.experiment.state
+        self.assertEqual(self.experiment.kernel.factor_sizes, [1, 1])
+        np.testing.assert_allclose(
+            state.reduced_dm([0]).diagonal().real, [0.5, 0.5, 0, 0]
+        )
+        np.testing.assert_allclose(state.reduced_dm([1]).diagonal().real, [1, 0, 0, 0])
+
+    def test_reused_index(self):
+        backend = self.backend
+        backend.initialize_number_state(1, [1])
+        backend.release_mode(1)
+        # A new mode reuses index 1 after the release
+        backend.initialize_number_state(2, [1])
+        self.experiment.execute()
+        state = self.experiment.state
+        self.assertAlmostEqual(state.mean_photon(1), 2)
+        self.assertAlmostEqual(state.mean_photon(0), 0)
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.simulation import SimulationContext
+
+
+class TestLazyRenormalization(unittest.TestCase):
+    def setUp(self):
+        self.cutoff = 5
+        context = SimulationContext()
+        context.backend.set_number_of_modes(2)
+        context.backend.set_dimensions(self.cutoff)
+        self.experiment = context.experiment
+        self.experiment.set_fusion(False)
+        self.experiment.state_init(1, [0])
+        self.gates = [
+            (ops.displacement(0.8, 0.3, self.cutoff), [0]),
+            (ops.beamsplitter(0.6, 0.0, self.cutoff).transpose((0, 2, 1, 3)), [0, 1]),
+            (ops.displacement(0.5, 0.0, self.cutoff), [1]),
+        ]
+        for operator, modes in self.gates:
+            self.experiment.add_operation(operator, modes, trace_preserving=True)
+
+    def reference(self):
+        ket = ops.vacuum_state(2, self.cutoff)
+        ket = ops.apply_gate_ket(
+            ops.fock_operator(1, self.cutoff), ket, [0], 2, self.cutoff
+        )
+        ket /= np.linalg.norm(ket)
+        for operator, modes in self.gates:
+            ket = ops.apply_gate_ket(operator, ket, modes, 2, self.cutoff)
+        return ket
+
+    def test_truncation_error(self):
+        self.experiment.execute()
+        ket = self.reference()
+        norm = np.vdot(ket, ket).real
+        self.assertGreater(self.experiment.truncation_error, 1e-3)
+        self.assertAlmostEqual(self.experiment.truncation_error, 1 - norm)
+        np.testing.assert_allclose(
+            self.experiment.state.ket(), ket / np.sqrt(norm), atol=1e-12
+        )
+
+    def test_interval(self):
+        self.experiment.execute()
+        lazy_error = self.experiment.truncation_error
+        lazy_state = self.experiment.state.ket()
+        self.experiment.set_renormalize_interval(1)
+        self.experiment.execute()
+        self.assertAlmostEqual(self.experiment.truncation_error, lazy_error)
+        np.testing.assert_allclose(self.experiment.state.ket(), lazy_state, atol=1e-12)
+
+    def test_mixed_state(self):
+        self.experiment.add_channel(ops.lossChannel(0.7, self.cutoff), [0])
+        self.experiment.execute()
+        ket = self.reference()
+        self.assertAlmostEqual(
+            self.experiment.truncation_error, 1 - np.vdot(ket, ket).real
+        )
+        self.assertAlmostEqual(ops.calculate_trace(self.experiment.state), 1)
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock.sectors import SectorState
+from qureed.simulation import SimulationContext
+
+
+class TestSectorRepresentation(unittest.TestCase):
+    def run_circuit(self, sectors, displace=False):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(3)
+        backend.set_dimensions(4)
+        experiment = context.experiment
+        experiment.set_sector_representation(sectors)
+        backend.initialize_number_state(1, [0])
+        backend.initialize_number_state(1, [1])
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1])
+        backend.apply_operator(backend.phase_shift(0.3, 0), [1], True)
+        backend.apply_operator(backend.beam_splitter(0.4, 0.1), [1, 2])
+        if displace:
+            backend.apply_operator(backend.displace(0.2, 0.1, 0), [2])
+        experiment.execute()
+        return experiment.state
+
+    def test_passive_circuit(self):
+        state = self.run_circuit(True)
+        self.assertIsInstance(state, SectorState)
+        self.assertEqual(list(state.sectors), [2])
+        np.testing.assert_allclose(
+            state.ket(), self.run_circuit(False).ket(), atol=1e-12
+        )
+
+    def test_dense_fallback(self):
+        state = self.run_circuit(True, displace=True)
+        self.assertNotIsInstance(state, SectorState)
+        np.testing.assert_allclose(
+            state.ket(), self.run_circuit(False, displace=True).ket(), atol=1e-12
+        )
@@ -0,0 +1,110 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.kernel.fock_kernel.fock_kernel import FockKernel
+from qureed.simulation import SimulationContext
+
+
+class TestFactorization(unittest.TestCase):
+    def setUp(self):
+        self.cutoff = 3
+        self.kernel = FockKernel(context=SimulationContext())
+        for _ in range(4):
+            self.kernel.add_mode(self.cutoff)
+        self.bs = ops.beamsplitter(np.pi / 4, 0, self.cutoff).transpose((0, 2, 1, 3))
+
+    def test_merge_on_entangle(self):
+        self.kernel.apply_operator(ops.adagger(self.cutoff), [0])
+        self.kernel.apply_operator(ops.adagger(self.cutoff), [3])
+        self.assertEqual(self.kernel.factor_sizes, [1, 1, 1, 1])
+        self.kernel.apply_operator(self.bs, [1, 0])
+        self.assertEqual(sorted(self.kernel.factor_sizes), [1, 1, 2])
+        self.kernel.apply_operator(self.bs, [1, 2])
+        self.assertEqual(sorted(self.kernel.factor_sizes), [1, 3])
+
+        ket = ops.vacuum_state(4, self.cutoff)
+        for operator, modes in [
+            (ops.adagger(self.cutoff), [0]),
+            (ops.adagger(self.cutoff), [3]),
+            (self.bs, [1, 0]),
+            (self.bs, [1, 2]),
+        ]:
+            ket = ops.apply_gate_ket(operator, ket, modes, 4, self.cutoff)
+        np.testing.assert_allclose(self.kernel.get_state().ket(), ket, atol=1e-12)
+
+    def test_measurement_splits(self):
+        self.kernel.apply_operator(ops.adagger(self.cutoff), [0])
+        self.kernel.apply_operator(self.bs, [0, 1])
+        self.assertEqual(self.kernel.measure(1, outcome=1), 1)
+        self.assertEqual(self.kernel.factor_sizes, [1, 1, 1, 1])
+        probs = self.kernel.get_state().all_fock_probs()
+        self.assertAlmostEqual(probs[0, 1, 0, 0], 1)
+
+    def test_partial_trace_splits(self):
+        self.kernel.apply_operator(ops.adagger(self.cutoff), [0])
+        self.kernel.apply_operator(self.bs, [0, 1])
+        self.kernel.apply_operator(ops.phase(0.2, self.cutoff), [0])
+        # Merges mode 2, which stays in the vacuum
+        identity = ops.beamsplitter(0, 0, self.cutoff).transpose((0, 2, 1, 3))
+        self.kernel.apply_operator(identity, [1, 2])
+        self.assertEqual(sorted(self.kernel.factor_sizes), [1, 3])
+        self.kernel.remove_mode(0)
+        self.assertEqual(self.kernel.factor_sizes, [1, 1, 1])
+        dm = self.kernel.get_state().reduced_dm([0])
+        np.testing.assert_allclose(np.diag(dm).real, [0.5, 0.5, 0], atol=1e-12)
+
+    def test_experiment(self):
+        def run(factorized):
+            context = SimulationContext()
+            backend = context.backend
+            backend.set_number_of_modes(4)
+            backend.set_dimensions(self.cutoff)
+            experiment = context.experiment
+            experiment.set_factorized(factorized)
+            backend.initialize_number_state(1, [0])
+            backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1])
+            backend.apply_operator(backend.phase_shift(0.3, 0), [3], True)
+            experiment.add_channel(ops.lossChannel(0.5, self.cutoff), [1])
+            experiment.execute()
+            return experiment
+
+        experiment = run(True)
+        self.assertEqual(sorted(experiment.kernel.factor_sizes), [1, 1, 2])
+        np.testing.assert_allclose(
+            experiment.state.dm(), run(False).state.dm(), atol=1e-12
+        )
+
+    def test_state_stays_factorized(self):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(10)
+        backend.set_dimensions(4)
+        experiment = context.experiment
+        experiment.set_factorized()
+        for mode in range(0, 10, 2):
+            backend.initialize_number_state(1, [mode])
+            backend.apply_operator(
+                backend.beam_splitter(np.pi / 4, 0), [mode, mode + 1]
+            )
+        experiment.add_channel(ops.lossChannel(0.5, 4), [0])
+        experiment.execute()
+
+        tracemalloc.start()
+        experiment.execute()
+        state = experiment.state
+        means = [state.mean_photon(mode) for mode in range(10)]
+        pair = state.reduced_dm([1, 2])
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # The joint ket of the ten modes would take 16 MB
+        self.assertLess(peak, 4**10 * 16 // 100)
+        largest = max(factor.data.nbytes for factor in state.factors)
+        self.assertEqual(largest, 4**4 * 16)
+        np.testing.assert_allclose(means, [0.25] + [0.5] * 9, atol=1e-12)
+        np.testing.assert_allclose(
+            pair, np.tensordot(state.reduced_dm(1), state.reduced_dm(2), axes=0)
+        )
+
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.kernel.fock_kernel.fock_kernel import (
+    FockKernel,
+    OperatorDimensionException,
+)
+from qureed.simulation import SimulationContext
+
+
+class TestFockKernel(unittest.TestCase):
+    def setUp(self):
+        self.kernel = FockKernel(context=SimulationContext())
+        self.cutoff = 4
+        self.bs = ops.beamsplitter(0.5, 0.2, self.cutoff).transpose((0, 2, 1, 3))
+
+    def test_mixed_truncations(self):
+        for truncation in (4, 2, 3):
+            self.kernel.add_mode(truncation)
+        self.kernel.apply_operator(ops.adagger(self.cutoff), [0])
+        self.kernel.apply_operator(self.bs, [0, 1])
+        self.kernel.apply_operator(self.bs, [1, 2])
+        state = self.kernel.get_state()
+        self.assertEqual(state.dims, [4, 2, 3])
+
+        ket = ops.vacuum_state(3, self.cutoff)
+        ket = ops.apply_gate_ket(ops.adagger(self.cutoff), ket, [0], 3, self.cutoff)
+        ket = ops.apply_gate_ket(self.bs, ket, [0, 1], 3, self.cutoff)
+        ket = ops.apply_gate_ket(self.bs, ket, [1, 2], 3, self.cutoff)
+        # A single photon is represented exactly by every truncation
+        np.testing.assert_allclose(state.ket(), ket[:, :2, :3], atol=1e-12)
+        self.assertAlmostEqual(self.kernel.normalize(), 1)
+
+    def test_remove_mode(self):
+        self.kernel.add_mode(3)
+        self.kernel.add_mode(2)
+        self.kernel.prepare(0, ops.fock_state(1, 3))
+        self.kernel.apply_channel(ops.lossChannel(0.5, self.cutoff), [0])
+        self.kernel.remove_mode(1)
+        self.assertEqual(len(self.kernel.modes), 1)
+        dm = self.kernel.get_state().dm()
+        np.testing.assert_allclose(np.diag(dm).real, [0.5, 0.5, 0], atol=1e-12)
+
+    def test_operator_too_small(self):
+        self.kernel.add_mode(5)
+        with self.assertRaises(OperatorDimensionException):
+            self.kernel.apply_operator(ops.adagger(3), [0])
+
+    def test_experiment_truncations(self):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_number_of_modes(3)
+        backend.set_dimensions(self.cutoff)
+        experiment = context.experiment
+        experiment.set_truncation(1, 2)
+        backend.initialize_number_state(1, [0])
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1])
+        backend.apply_operator(backend.beam_splitter(0.3, 0), [0, 2])
+        experiment.add_channel(ops.lossChannel(0.5, self.cutoff), [1])
+        experiment.execute()
+        state = experiment.state
+        self.assertEqual(state.dims, [4, 2, 4])
+
+        experiment.set_truncation(1)
+        experiment.execute()
+        dense = experiment.state.dm()[:, :, :2, :2, :, :]
+        np.testing.assert_allclose(state.dm(), dense, atol=1e-12)
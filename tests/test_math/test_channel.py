@@ -0,0 +1,71 @@
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed._math.states import FockState
+
+from .test_gate_application import random_dm
+
+
+def reference(kraus_ops, state, modes, n):
+    return sum(ops.apply_gate_einsum(k, state, modes, n) for k in kraus_ops)
+
+
+class TestApplyChannel(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+        self.trunc = 4
+        self.state = random_dm(3, self.trunc, self.rng)
+
+    def test_loss_channel(self):
+        kraus_ops = ops.lossChannel(0.6, self.trunc)
+        for modes in ([0], [1], [2]):
+            result = ops.apply_channel(self.state, kraus_ops, modes)
+            expected = reference(kraus_ops, self.state, modes, 3)
+            np.testing.assert_allclose(result, expected, atol=1e-12)
+        self.assertAlmostEqual(np.einsum("aabbcc", result).real, 1)
+
+    def test_two_mode_kraus(self):
+        splitter = ops.beamsplitter(0.4, 0.2, self.trunc).transpose((0, 2, 1, 3))
+        phase = np.einsum(
+            "ab,cd->acbd", ops.phase(0.5, self.trunc), ops.phase(0.1, self.trunc)
+        )
+        kraus_ops = [np.sqrt(0.3) * splitter, np.sqrt(0.7) * phase]
+        for modes in ([0, 2], [2, 1]):
+            result = ops.apply_channel(self.state, kraus_ops, modes)
+            expected = reference(kraus_ops, self.state, modes, 3)
+            np.testing.assert_allclose(result, expected, atol=1e-12)
+
+    def test_output_buffer(self):
+        kraus_ops = ops.lossChannel(0.5, self.trunc)
+        out = np.empty_like(self.state)
+        state = FockState(self.state, 3, self.trunc)
+        result = ops.apply_channel(state, kraus_ops, [1], out=out)
+        self.assertTrue(np.shares_memory(result, out))
+        np.testing.assert_allclose(
+            result, reference(kraus_ops, self.state, [1], 3), atol=1e-12
+        )
+
+    def test_no_state_copy(self):
+        state = random_dm(4, 6, self.rng)
+        kraus_ops = ops.lossChannel(0.6, 6)
+        out = np.empty_like(state)
+        for mode in range(4):
+            expected = reference(kraus_ops, state, [mode], 4)
+            tracemalloc.start()
+            result = ops.apply_channel(state, kraus_ops, [mode], out=out)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            np.testing.assert_allclose(result, expected, atol=1e-12)
+            # Only a slice of the permuted state is copied besides the buffer
+            self.assertLess(peak, state.nbytes / 2)
+
+    def test_negligible_kraus_dropped(self):
+        kraus_ops = ops.lossChannel(0.5, self.trunc)
+        expected = ops.apply_channel(self.state, kraus_ops, [0])
+        result = ops.apply_channel(
+            self.state, kraus_ops + [1e-9 * np.eye(self.trunc)], [0]
+        )
+        np.testing.assert_array_equal(result, expected)
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.contraction_plans import (
+    ContractionPlanCache,
+    partial_trace_subscripts,
+    reduced_dm_subscripts,
+)
+from qureed._math.fock import ops
+from qureed._math.states import FockState
+from tests.test_math.test_gate_application import random_dm
+
+
+class TestContractionPlanCache(unittest.TestCase):
+    def test_plan_reused(self):
+        cache = ContractionPlanCache(maxsize=8)
+        rho = random_dm(3, 3, np.random.default_rng(0))
+        first = cache.contract("reduced_dm", 3, [1], reduced_dm_subscripts, rho)
+        second = cache.contract("reduced_dm", 3, [1], reduced_dm_subscripts, rho)
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        np.testing.assert_allclose(first, np.einsum("aabcdd->bc", rho))
+        np.testing.assert_allclose(first, second)
+
+    def test_key_includes_shape(self):
+        cache = ContractionPlanCache(maxsize=8)
+        for cutoff in (2, 3):
+            rho = random_dm(2, cutoff, np.random.default_rng(cutoff))
+            cache.contract("partial_trace", 2, [0], partial_trace_subscripts, rho)
+        self.assertEqual(cache.cache_info().misses, 2)
+
+    def test_state_reductions(self):
+        rng = np.random.default_rng(1)
+        rho = random_dm(3, 3, rng)
+        state = FockState(rho, 3, 3)
+        np.testing.assert_allclose(
+            state.reduced_dm([0, 2]), np.einsum("abccde->abde", rho)
+        )
+        np.testing.assert_allclose(
+            ops.reduced_dm(state, [2]), np.einsum("aabbcd->cd", rho)
+        )
+        np.testing.assert_allclose(
+            ops.partial_trace(rho, 3, [1]), np.einsum("abccde->abde", rho)
+        )
+        self.assertAlmostEqual(
+            ops.calculate_trace(state), np.einsum("aabbcc", rho).real
+        )
+
+        ket = rng.normal(size=(3, 3)) + 1j * rng.normal(size=(3, 3))
+        pure = FockState(ket, 2, 3, pure=True)
+        np.testing.assert_allclose(
+            pure.dm(), np.einsum("ab,cd->acbd", ket, ket.conj()), atol=1e-12
+        )
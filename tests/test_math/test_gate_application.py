@@ -0,0 +1,44 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+
+
+def random_dm(n, trunc, rng):
+    ket = rng.normal(size=(trunc,) * n) + 1j * rng.normal(size=(trunc,) * n)
+    ket /= np.linalg.norm(ket)
+    return ops.mix(ket, n)
+
+
+class TestGateApplication(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+
+    def test_matches_loop(self):
+        trunc = 3
+        single = ops.displacement(0.3, 0.2, trunc)
+        pair = ops.beamsplitter(0.4, 0.1, trunc).transpose((0, 2, 1, 3))
+        for n, mat, modes in [
+            (1, single, [0]),
+            (3, single, [1]),
+            (3, pair, [0, 2]),
+            (3, pair, [2, 0]),
+            (4, pair, [1, 2]),
+        ]:
+            state = random_dm(n, trunc, self.rng)
+            expected = ops.apply_gate_loop(mat, state, modes, n, trunc)
+            result = ops.apply_gate_BLAS(mat, state, modes, n, trunc)
+            np.testing.assert_allclose(result, expected, atol=1e-12)
+            if n > 1:
+                np.testing.assert_allclose(
+                    result, ops.apply_gate_einsum(mat, state, modes, n), atol=1e-12
+                )
+
+    def test_matches_ket(self):
+        trunc = 4
+        pair = ops.beamsplitter(0.7, 0.0, trunc).transpose((0, 2, 1, 3))
+        ket = self.rng.normal(size=(trunc,) * 3) + 0j
+        result = ops.apply_gate_BLAS(pair, ops.mix(ket, 3), [2, 1], 3, trunc)
+        expected = ops.apply_gate_ket(pair, ket, [2, 1], 3, trunc)
+        np.testing.assert_allclose(result, ops.mix(expected, 3), atol=1e-12)
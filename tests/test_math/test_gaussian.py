@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed._math.gaussian import ops as gaussian
+from qureed._math.states import GaussianState
+
+
+class TestGaussianOps(unittest.TestCase):
+    def test_matches_fock(self):
+        cutoff, large = 4, 30
+        means, cov = gaussian.vacuum(3)
+        ket = ops.vacuum_state(3, large)
+        bs = ops.beamsplitter(0.4, 0.7, large).transpose((0, 2, 1, 3))
+        for operator, fock_operator, modes in [
+            (gaussian.displacement(0.5, 0.3), ops.displacement(0.5, 0.3, large), [0]),
+            (gaussian.squeezing(0.3, 0.4), ops.squeezing(0.3, 0.4, large), [1]),
+            (gaussian.beamsplitter(0.4, 0.7), bs, [0, 1]),
+            (gaussian.phase(0.9), ops.phase(0.9, large), [1]),
+            (gaussian.beamsplitter(0.4, 0.7), bs, [2, 1]),
+        ]:
+            gaussian.apply_operator(means, cov, operator, modes)
+            ket = ops.apply_gate_ket(fock_operator, ket, modes, 3, large)
+
+        state = GaussianState(means, cov, 3)
+        probs = np.abs(ket) ** 2
+        np.testing.assert_allclose(
+            state.all_fock_probs(cutoff), probs[:cutoff, :cutoff, :cutoff], atol=1e-10
+        )
+        np.testing.assert_allclose(
+            state.all_fock_probs(cutoff, modes=[2]),
+            probs.sum(axis=(0, 1))[:cutoff],
+            atol=1e-10,
+        )
+        self.assertAlmostEqual(state.fock_prob([1, 0, 1]), probs[1, 0, 1], places=10)
+        self.assertAlmostEqual(
+            state.mean_photon(1), np.sum(probs.sum(axis=(0, 2)) * np.arange(large))
+        )
+
+    def test_hafnian(self):
+        A = np.array([[1, 2, 3, 4], [2, 5, 6, 7], [3, 6, 8, 9], [4, 7, 9, 10]])
+        self.assertEqual(gaussian.hafnian(A), 2 * 9 + 3 * 7 + 4 * 6)
+        self.assertEqual(gaussian.hafnian(A[:3, :3]), 0)
+        self.assertEqual(gaussian.hafnian(A[:2, :2], loop=True), 2 + 1 * 5)
@@ -0,0 +1,142 @@
+import unittest
+
+import numpy as np
+from scipy.special import factorial
+
+from qureed._math.fock import ops
+
+
+def reference_beamsplitter(theta, phi, cutoff):
+    """
+    Serial recurrence of the previous implementation
+    """
+    sqrt = np.sqrt(np.arange(cutoff))
+    ct, st = np.cos(theta), np.sin(theta) * np.exp(1j * phi)
+    V = np.array([[0, 0, ct, -np.conj(st)], [0, 0, st, ct]])
+    B = np.zeros((cutoff,) * 4, dtype=np.complex128)
+    B[0, 0, 0, 0] = 1
+    for m in range(cutoff):
+        for n in range(cutoff - m):
+            p = m + n
+            if 0 < p < cutoff:
+                B[m, n, p, 0] = (
+                    V[0, 2] * sqrt[m] * B[m - 1, n, p - 1, 0]
+                    + V[1, 2] * sqrt[n] * B[m, n - 1, p - 1, 0]
+                ) / sqrt[p]
+    for m in range(cutoff):
+        for n in range(cutoff):
+            for p in range(cutoff):
+                q = m + n - p
+                if 0 < q < cutoff:
+                    B[m, n, p, q] = (
+                        V[0, 3] * sqrt[m] * B[m - 1, n, p, q - 1]
+                        + V[1, 3] * sqrt[n] * B[m, n - 1, p, q - 1]
+                    ) / sqrt[q]
+    return B
+
+
+def reference_displacement(r, phi, cutoff):
+    sqrt = np.sqrt(np.arange(cutoff))
+    mu = [r * np.exp(1j * phi), -r * np.exp(-1j * phi)]
+    D = np.zeros((cutoff, cutoff), dtype=np.complex128)
+    D[0, 0] = np.exp(-0.5 * r**2)
+    for m in range(1, cutoff):
+        D[m, 0] = mu[0] / sqrt[m] * D[m - 1, 0]
+    for m in range(cutoff):
+        for n in range(1, cutoff):
+            D[m, n] = (
+                mu[1] / sqrt[n] * D[m, n - 1] + sqrt[m] / sqrt[n] * D[m - 1, n - 1]
+            )
+    return D
+
+
+def reference_squeezing(r, phi, cutoff):
+    sqrt = np.sqrt(np.arange(cutoff))
+    R = [
+        [-np.exp(1j * phi) * np.tanh(r), 1 / np.cosh(r)],
+        [1 / np.cosh(r), np.conj(np.exp(1j * phi) * np.tanh(r))],
+    ]
+    S = np.zeros((cutoff, cutoff), dtype=np.complex128)
+    S[0, 0] = np.sqrt(1 / np.cosh(r))
+    for m in range(2, cutoff, 2):
+        S[m, 0] = sqrt[m - 1] / sqrt[m] * R[0][0] * S[m - 2, 0]
+    for m in range(cutoff):
+        for n in range(1, cutoff):
+            if (m + n) % 2 == 0:
+                S[m, n] = (
+                    sqrt[n - 1] / sqrt[n] * R[1][1] * S[m, n - 2]
+                    + sqrt[m] / sqrt[n] * R[0][1] * S[m - 1, n - 1]
+                )
+    return S
+
+
+class TestGenerators(unittest.TestCase):
+    def test_recurrences(self):
+        for cutoff in (1, 2, 5, 8):
+            np.testing.assert_allclose(
+                ops.beamsplitter(0.3, 0.7, cutoff),
+                reference_beamsplitter(0.3, 0.7, cutoff),
+                atol=1e-13,
+            )
+            np.testing.assert_allclose(
+                ops.displacement(0.4, 1.1, cutoff),
+                reference_displacement(0.4, 1.1, cutoff),
+                atol=1e-13,
+            )
+            np.testing.assert_allclose(
+                ops.squeezing(0.3, 0.5, cutoff),
+                reference_squeezing(0.3, 0.5, cutoff),
+                atol=1e-13,
+            )
+
+    def test_states_and_phases(self):
+        alpha = 1.2 * np.exp(0.3j)
+        n = np.arange(30)
+        coherent = np.exp(-0.72) * alpha**n / np.sqrt(factorial(n))
+        np.testing.assert_allclose(ops.coherent_state(1.2, 0.3, 30), coherent)
+        np.testing.assert_allclose(
+            ops.phase(0.4, 6), np.diag(np.exp(0.4j * np.arange(6)))
+        )
+        np.testing.assert_array_equal(ops.fock_state(2, 4), [0, 0, 1, 0])
+        np.testing.assert_allclose(
+            np.diag(ops.thermalState(0.5, 5)), 0.5 ** n[:5] / 1.5 ** (n[:5] + 1)
+        )
+
+    def test_fock_operator(self):
+        adagger = ops.adagger(6)
+        np.testing.assert_allclose(adagger, ops.a(6).conj().T)
+        for n in range(5):
+            np.testing.assert_allclose(
+                ops.fock_operator(n, 6), np.linalg.matrix_power(adagger, n)
+            )
+
+
+class TestLadderTable(unittest.TestCase):
+    def test_powers(self):
+        for cutoff in (1, 4, 7):
+            for n in range(cutoff + 2):
+                np.testing.assert_allclose(
+                    ops.annihilation_power(n, cutoff),
+                    np.linalg.matrix_power(ops.a(cutoff), n),
+                )
+                np.testing.assert_allclose(
+                    ops.creation_power(n, cutoff),
+                    np.linalg.matrix_power(ops.adagger(cutoff), n),
+                )
+        self.assertFalse(ops.ladder_table(5).flags.writeable)
+
+    def test_loss_channel(self):
+        for T in (0.0, 0.3, 1.0):
+            kraus = ops.lossChannel(T, 5)
+            completeness = sum(k.conj().T @ k for k in kraus)
+            np.testing.assert_allclose(completeness, np.identity(5), atol=1e-12)
+        # T = 0 sends every number state to the vacuum
+        for n, k in enumerate(ops.lossChannel(0.0, 5)):
+            np.testing.assert_allclose(k, ops.proj(n, 0, 5))
+
+    def test_matrix_power(self):
+        matrix = np.random.default_rng(0).normal(size=(5, 5)) + 0j
+        for n in range(9):
+            np.testing.assert_allclose(
+                ops.matrix_power(matrix, n), np.linalg.matrix_power(matrix, n)
+            )
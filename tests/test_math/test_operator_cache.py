@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import OperatorCache, beamsplitter, displacement, phase
+from qureed._math.fock.cache import InvalidCacheSizeException
+from qureed.simulation import SimulationContext
+
+
+class TestOperatorCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = OperatorCache()
+        first = cache.get(beamsplitter, np.pi / 4, 0.0, cutoff=4)
+        second = cache.get(beamsplitter, np.pi / 4, 0.0, cutoff=4)
+        self.assertIs(first, second)
+        np.testing.assert_array_equal(first, beamsplitter(np.pi / 4, 0.0, 4))
+        cache.get(beamsplitter, np.pi / 4, 0.0, cutoff=5)
+        cache.get(beamsplitter, np.pi / 4, 0.0, cutoff=4, dtype=np.complex64)
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 3, 3))
+
+    def test_read_only(self):
+        operator = OperatorCache().get(phase, 0.5, cutoff=3)
+        with self.assertRaises(ValueError):
+            operator[0, 0] = 0
+
+    def test_least_recently_used_eviction(self):
+        cache = OperatorCache(maxsize=2)
+        cache.get(phase, 0.1, cutoff=3)
+        cache.get(phase, 0.2, cutoff=3)
+        cache.get(phase, 0.1, cutoff=3)
+        cache.get(phase, 0.3, cutoff=3)
+        self.assertEqual(cache.cache_info().currsize, 2)
+        cache.get(phase, 0.1, cutoff=3)
+        self.assertEqual(cache.cache_info().hits, 2)
+        cache.get(phase, 0.2, cutoff=3)
+        self.assertEqual(cache.cache_info().misses, 4)
+        with self.assertRaises(InvalidCacheSizeException):
+            OperatorCache(maxsize=0)
+
+    def test_backend_uses_cache(self):
+        backend = SimulationContext().backend
+        backend.set_dimensions(4)
+        for _ in range(3):
+            backend.beam_splitter(np.pi / 4, 0)
+            backend.displace(0.5, 0.1, 0)
+        self.assertEqual(backend.operator_cache.cache_info().misses, 2)
+        self.assertEqual(backend.operator_cache.cache_info().hits, 4)
+        np.testing.assert_array_equal(
+            backend.displace(0.5, 0.1, 0), displacement(0.5, 0.1, 4)
+        )
+
+    def test_numpy_scalar_parameters(self):
+        backend = SimulationContext().backend
+        backend.set_dimensions(4)
+        operator = backend.displace(np.array(0.2), np.float64(0.0), 0)
+        np.testing.assert_array_equal(operator, displacement(0.2, 0.0, 4))
+        self.assertIs(backend.displace(0.2, 0.0, 0), operator)
+        cache = OperatorCache()
+        theta = np.array([0.5])
+        np.testing.assert_array_equal(
+            cache.get(phase, theta, cutoff=3), phase(theta, 3)
+        )
+        self.assertEqual(cache.cache_info().currsize, 0)
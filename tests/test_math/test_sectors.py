@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed._math.fock.sectors import SectorState, photon_shift
+
+
+class TestSectorState(unittest.TestCase):
+    def setUp(self):
+        self.cutoff = 4
+        self.bs = ops.beamsplitter(0.6, 0.2, self.cutoff).transpose((0, 2, 1, 3))
+
+    def test_photon_shift(self):
+        cutoff = self.cutoff
+        self.assertEqual(photon_shift(self.bs, 2, cutoff), 0)
+        self.assertEqual(photon_shift(ops.phase(0.4, cutoff), 1, cutoff), 0)
+        self.assertEqual(photon_shift(ops.adagger(cutoff), 1, cutoff), 1)
+        self.assertIsNone(photon_shift(ops.displacement(0.3, 0, cutoff), 1, cutoff))
+
+    def test_matches_dense(self):
+        n, cutoff = 4, self.cutoff
+        gates = [
+            (ops.adagger(cutoff), [0]),
+            (ops.adagger(cutoff), [2]),
+            (self.bs, [0, 1]),
+            (self.bs, [2, 1]),
+            (ops.phase(0.3, cutoff), [1]),
+            (self.bs, [3, 0]),
+        ]
+        state = SectorState.vacuum(n, cutoff)
+        ket = ops.vacuum_state(n, cutoff)
+        for operator, modes in gates:
+            shift = photon_shift(operator, len(modes), cutoff)
+            state = state.apply(operator, modes, shift)
+            ket = ops.apply_gate_ket(operator, ket, modes, n, cutoff)
+
+        self.assertEqual(list(state.sectors), [2])
+        np.testing.assert_allclose(state.ket(), ket, atol=1e-12)
+        self.assertAlmostEqual(state.norm(), np.vdot(ket, ket).real)
+        self.assertAlmostEqual(state.fock_prob((1, 0, 1, 0)), abs(ket[1, 0, 1, 0]) ** 2)
+        self.assertAlmostEqual(
+            state.mean_photon(1),
+            np.sum(np.abs(ket) ** 2 * np.arange(cutoff)[None, :, None, None]),
+        )
@@ -0,0 +1,62 @@
+import unittest
+
+from qureed.devices.control import SimpleTrigger
+from qureed.devices.sources import IdealNPhotonSource
+from qureed.signals import GenericBoolSignal, GenericIntSignal
+from qureed.simulation import Simulation
+from qureed.simulation.simulation import NetlistSignalMismatchException
+
+
+class TestCompile(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation.get_instance()
+        self.simulation.stop_simulation()
+
+    def tearDown(self):
+        self.simulation.stop_simulation()
+        self.simulation.invalidate_routing()
+
+    def test_routing_table(self):
+        trigger = SimpleTrigger(name="Trigger")
+        source = IdealNPhotonSource(name="Source")
+        signal = GenericBoolSignal()
+        trigger.register_signal(signal=signal, port_label="trigger")
+        source.register_signal(signal=signal, port_label="trigger")
+
+        with self.assertLogs("simulation", level="WARNING") as logs:
+            routing_table = self.simulation.compile()
+        self.assertIn("Source.output", logs.output[0])
+        self.assertEqual(routing_table[(trigger, "trigger")], (source, "trigger"))
+        self.assertEqual(
+            self.simulation.route(trigger, "trigger"),
+            trigger.get_next_device_and_port("trigger"),
+        )
+        self.assertIn((source, "output"), self.simulation.dangling_ports)
+        self.assertEqual(self.simulation.route(source, "output"), (None, None))
+
+        # Changing the connections invalidates the table
+        source.register_signal(signal=GenericIntSignal(), port_label="photon_num")
+        self.assertIsNone(self.simulation.routing_table)
+
+    def test_signal_mismatch(self):
+        source = IdealNPhotonSource(name="Source")
+        signal = GenericBoolSignal()
+        source.register_signal(signal=signal, port_label="trigger")
+        # Bypass the check done at registration time
+        source.ports["photon_num"].signal = signal
+        with self.assertRaises(NetlistSignalMismatchException):
+            self.simulation.compile()
+        source.ports["photon_num"].signal = None
+
+    def test_schedule_signal_merges(self):
+        source = IdealNPhotonSource(name="Source")
+        trigger_signal = GenericBoolSignal()
+        photon_signal = GenericIntSignal()
+        self.simulation.schedule_signal(1, source, "trigger", trigger_signal)
+        self.simulation.schedule_signal(1, source, "photon_num", photon_signal)
+        self.assertEqual(len(self.simulation.scheduler), 1)
+        event = self.simulation.scheduler.get(1, source)
+        self.assertEqual(
+            event.kwargs["signals"],
+            {"trigger": trigger_signal, "photon_num": photon_signal},
+        )
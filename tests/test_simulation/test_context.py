@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from qureed.devices.control import SimpleTrigger
+from qureed.experiment import Experiment
+from qureed.signals import GenericBoolSignal
+from qureed.simulation import ModeManager, Simulation, SimulationContext
+
+from .test_trace import Sink
+
+
+def assemble(context, name):
+    trigger = SimpleTrigger(name=f"{name}-trigger", context=context)
+    sink = Sink(name=f"{name}-sink", context=context)
+    signal = GenericBoolSignal()
+    trigger.register_signal(signal=signal, port_label="trigger")
+    sink.register_signal(signal=signal, port_label="input")
+    return sink
+
+
+class TestSimulationContext(unittest.TestCase):
+    def test_default_context(self):
+        default = SimulationContext.get_default()
+        self.assertIs(default.simulation, Simulation.get_instance())
+        self.assertIs(default.mode_manager, ModeManager())
+        self.assertIs(SimulationContext.get_current(), default)
+        self.assertIs(default.simulation.context, default)
+
+    def test_active_context(self):
+        context = SimulationContext()
+        with context:
+            self.assertIs(SimulationContext.get_active(), context)
+            self.assertIs(Simulation.get_instance(), context.simulation)
+            self.assertIs(ModeManager(), context.mode_manager)
+            self.assertIs(Experiment.get_instance(), context.experiment)
+            sink = Sink(name="Sink")
+        self.assertIsNone(SimulationContext.get_active())
+        self.assertIs(sink.simulation, context.simulation)
+        self.assertIsNot(Simulation.get_instance(), context.simulation)
+        self.assertIs(context.backend.experiment, context.experiment)
+
+    def test_independent_contexts(self):
+        default_devices = list(Simulation.get_instance().devices)
+        contexts = [SimulationContext() for _ in range(4)]
+        sinks = [assemble(c, str(i)) for i, c in enumerate(contexts)]
+
+        threads = [
+            threading.Thread(target=c.simulation.run_des, args=(1,)) for c in contexts
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for context, sink in zip(contexts, sinks):
+            self.assertEqual(sink.received, [0])
+            self.assertEqual(len(context.simulation.devices), 2)
+        self.assertEqual(Simulation.get_instance().devices, default_devices)
+
+    def test_independent_modes(self):
+        first, second = SimulationContext(), SimulationContext()
+        first.mode_manager.create_new_mode()
+        first.backend.set_dimensions(4)
+        self.assertEqual(len(first.mode_manager.modes), 1)
+        self.assertEqual(len(second.mode_manager.modes), 0)
+        self.assertEqual(first.experiment.cutoff, 4)
+        self.assertEqual(second.experiment.cutoff, 10)
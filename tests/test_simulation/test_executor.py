@@ -0,0 +1,114 @@
+import threading
+import time
+import unittest
+
+from qureed.devices import GenericDevice, wait_input_compute
+from qureed.devices.port import Port
+from qureed.signals import GenericBoolSignal
+from qureed.simulation import SimulationContext, SimulationType
+from qureed.simulation.executor import (
+    CyclicDeviceGraphException,
+    DeviceGraphExecutor,
+    UncomputedOutputException,
+    UnconnectedInputException,
+)
+
+
+class Relay(GenericDevice):
+    ports = {
+        "input": Port(
+            label="input",
+            direction="input",
+            signal=None,
+            signal_type=GenericBoolSignal,
+            device=None,
+        ),
+        "output": Port(
+            label="output",
+            direction="output",
+            signal=None,
+            signal_type=GenericBoolSignal,
+            device=None,
+        ),
+    }
+    gui_icon = None
+    gui_name = "Relay"
+    reference = None
+
+    computed = []
+    threads = set()
+
+    def __init__(self, name=None, uid=None, context=None, silent=False):
+        super().__init__(name=name, uid=uid, context=context)
+        self.silent = silent
+
+    @wait_input_compute
+    def compute_outputs(self, *args, **kwargs):
+        time.sleep(0.01)
+        Relay.threads.add(threading.current_thread().name)
+        Relay.computed.append(self.name)
+        signal = self.ports["output"].signal
+        if signal is not None and not self.silent:
+            signal.set_computed()
+
+
+def connect(first, second):
+    signal = GenericBoolSignal()
+    first.register_signal(signal=signal, port_label="output")
+    second.register_signal(signal=signal, port_label="input")
+
+
+class TestDeviceGraphExecutor(unittest.TestCase):
+    def setUp(self):
+        Relay.computed = []
+        Relay.threads = set()
+        self.context = SimulationContext()
+        self.context.simulation.set_simulation_type(SimulationType.GAUSSIAN)
+
+    def relays(self, n, **kwargs):
+        return [Relay(name=str(i), context=self.context, **kwargs) for i in range(n)]
+
+    def test_topological_order(self):
+        devices = self.relays(4)
+        connect(devices[2], devices[0])
+        connect(devices[0], devices[3])
+        connect(devices[3], devices[1])
+        executor = DeviceGraphExecutor(devices)
+        self.assertEqual([d.name for d in executor.order()], ["2", "0", "3", "1"])
+        executor.run()
+        self.assertEqual(Relay.computed, ["2", "0", "3", "1"])
+
+    def test_bounded_parallel_branches(self):
+        devices = self.relays(32)
+        for first, second in zip(devices[::2], devices[1::2]):
+            connect(first, second)
+        self.context.simulation.set_max_workers(3)
+        self.context.simulation.run()
+        self.assertEqual(len(Relay.computed), 32)
+        self.assertLessEqual(len(Relay.threads), 3)
+        for i in range(0, 32, 2):
+            self.assertLess(
+                Relay.computed.index(str(i)), Relay.computed.index(str(i + 1))
+            )
+
+    def test_cycle(self):
+        devices = self.relays(3)
+        connect(devices[0], devices[1])
+        connect(devices[1], devices[2])
+        connect(devices[2], devices[0])
+        with self.assertRaises(CyclicDeviceGraphException):
+            self.context.simulation.run()
+        self.assertEqual(Relay.computed, [])
+
+    def test_unconnected_input(self):
+        device = self.relays(1)[0]
+        device.register_signal(signal=GenericBoolSignal(), port_label="input")
+        with self.assertRaises(UnconnectedInputException):
+            self.context.simulation.run()
+
+    def test_uncomputed_output(self):
+        devices = self.relays(2, silent=True)
+        connect(devices[0], devices[1])
+        with self.assertRaises(UncomputedOutputException):
+            self.context.simulation.run()
+        self.assertEqual(Relay.computed, ["0"])
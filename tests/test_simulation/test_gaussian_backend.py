@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from qureed.backend.gaussian_backend import (
+    GaussianBackend,
+    NonGaussianOperatorException,
+)
+from qureed.devices.phase_shifters import IdealPhaseShifter
+from qureed.devices.sources import IdealCoherentSource
+from qureed.signals import GenericBoolSignal, GenericFloatSignal, GenericQuantumSignal
+from qureed.simulation import SimulationContext, SimulationType
+
+
+def constant(device, port_label, value):
+    signal = GenericFloatSignal()
+    signal.set_float(value)
+    signal.set_computed()
+    device.register_signal(signal=signal, port_label=port_label)
+
+
+class TestGaussianBackend(unittest.TestCase):
+    def test_simulation_dispatch(self):
+        context = SimulationContext()
+        context.simulation.set_simulation_type(SimulationType.GAUSSIAN)
+        source = IdealCoherentSource(name="source", context=context)
+        shifter = IdealPhaseShifter(name="shifter", context=context)
+        constant(source, "alpha", 0.5)
+        constant(source, "phi", 0.0)
+        constant(shifter, "theta", np.pi / 2)
+        trigger = GenericBoolSignal()
+        trigger.set_computed()
+        source.register_signal(signal=trigger, port_label="trigger")
+        signal = GenericQuantumSignal()
+        source.register_signal(signal=signal, port_label="output")
+        shifter.register_signal(signal=signal, port_label="input")
+        shifter.register_signal(signal=GenericQuantumSignal(), port_label="output")
+
+        context.simulation.run()
+        backend = context.backend
+        self.assertIsInstance(backend, GaussianBackend)
+        np.testing.assert_allclose(backend.state.means(), [0, 1], atol=1e-12)
+        probs = backend.fock_probabilities([0], cutoff=3)
+        np.testing.assert_allclose(probs, np.exp(-0.25) * np.array([1, 0.25, 0.03125]))
+
+    def test_many_modes(self):
+        backend = GaussianBackend(context=SimulationContext())
+        backend.set_number_of_modes(300)
+        backend.apply_operator(backend.displace(1, 0, 0), [0])
+        backend.apply_operator(backend.squeeze(0.2, 1), [1])
+        for mode in range(299):
+            backend.apply_operator(
+                backend.beam_splitter(np.pi / 4, 0), [mode, mode + 1]
+            )
+        state = backend.execute()
+        total = sum(state.mean_photon(mode) for mode in range(300))
+        self.assertAlmostEqual(total, 1 + np.sinh(0.2) ** 2)
+
+    def test_non_gaussian(self):
+        backend = GaussianBackend(context=SimulationContext())
+        with self.assertRaises(NonGaussianOperatorException):
+            backend.initialize_number_state(1, 0)
+        with self.assertRaises(NonGaussianOperatorException):
+            backend.apply_operator(np.identity(3), [0])
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from qureed.devices.phase_shifters import IdealPhaseShifter
+from qureed.devices.sources import IdealCoherentSource
+from qureed.signals import GenericBoolSignal, GenericQuantumSignal
+from qureed.simulation import SimulationContext, SimulationType
+from tests.test_simulation.test_gaussian_backend import constant
+
+
+class TestModeManager(unittest.TestCase):
+    def test_index_reuse(self):
+        mode_manager = SimulationContext().mode_manager
+        ids = [mode_manager.create_new_mode() for _ in range(3)]
+        mode_manager.remove_mode(ids[1])
+        mode_manager.remove_mode(ids[0])
+        self.assertEqual(mode_manager.get_mode_index(mode_manager.create_new_mode()), 0)
+        self.assertEqual(mode_manager.get_mode_index(mode_manager.create_new_mode()), 1)
+        self.assertEqual(mode_manager.get_mode_index(mode_manager.create_new_mode()), 3)
+        self.assertEqual(mode_manager.peak_modes, 4)
+
+    def test_discard_requires_collection(self):
+        mode_manager = SimulationContext().mode_manager
+        mode_id = mode_manager.create_new_mode()
+        mode_manager.discard(mode_id)
+        self.assertIn(mode_id, mode_manager.modes)
+        mode_manager.set_garbage_collection()
+        mode_manager.discard(mode_id)
+        self.assertNotIn(mode_id, mode_manager.modes)
+
+    def test_unconnected_output_released(self):
+        context = SimulationContext()
+        context.simulation.set_simulation_type(SimulationType.GAUSSIAN)
+        context.mode_manager.set_garbage_collection()
+        source = IdealCoherentSource(name="source", context=context)
+        shifter = IdealPhaseShifter(name="shifter", context=context)
+        constant(source, "alpha", 0.5)
+        constant(source, "phi", 0.0)
+        constant(shifter, "theta", np.pi / 2)
+        trigger = GenericBoolSignal()
+        trigger.set_computed()
+        source.register_signal(signal=trigger, port_label="trigger")
+        signal = GenericQuantumSignal()
+        source.register_signal(signal=signal, port_label="output")
+        shifter.register_signal(signal=signal, port_label="input")
+        shifter.register_signal(signal=GenericQuantumSignal(), port_label="output")
+
+        context.simulation.run()
+        self.assertEqual(context.mode_manager.modes, {})
+        np.testing.assert_allclose(context.backend.state.means(), [0, 0], atol=1e-12)
@@ -0,0 +1,110 @@
+import unittest
+
+import numpy as np
+
+from qureed._math.fock import ops
+from qureed.devices.phase_shifters import IdealPhaseShifter
+from qureed.devices.sources import IdealCoherentSource
+from qureed.signals import GenericBoolSignal, GenericFloatSignal, GenericQuantumSignal
+from qureed.simulation import SimulationContext, SimulationType
+from qureed.simulation.planner import (
+    MemoryBudgetExceededException,
+    PlanHintException,
+    Representation,
+    check_hints,
+    estimate,
+    parse_size,
+    plan,
+    queued_hints,
+    sector_size,
+)
+
+
+class TestPlanner(unittest.TestCase):
+    def test_sector_size(self):
+        # Occupations of 3 modes with cutoff 4 and at most 2 photons
+        brute = sum(1 for occ in np.ndindex(4, 4, 4) if sum(occ) <= 2)
+        self.assertEqual(sector_size(3, 4, 2), brute)
+        self.assertEqual(sector_size(3, 4, 9), 4**3)
+
+    def test_dense_memory(self):
+        ket = estimate(Representation.KET, 6, 8, [2])
+        dm = estimate(Representation.DENSITY_MATRIX, 6, 8, [2])
+        self.assertEqual(ket.memory, 2 * 16 * 8**6 + 16 * 8**4)
+        self.assertEqual(dm.memory, 3 * 16 * 8**12 + 16 * 8**11 + 16 * 8**4)
+
+    def test_selects_cheapest(self):
+        selected = plan(6, 8, [2, 2], pure=True, photons=2).selected
+        self.assertIs(selected.representation, Representation.SECTORS)
+        selected = plan(6, 8, [2, 2], pure=True).selected
+        self.assertIs(selected.representation, Representation.KET)
+
+    def test_budget(self):
+        with self.assertRaises(MemoryBudgetExceededException):
+            plan(6, 8, [2], budget=parse_size("1G"))
+        result = plan(6, 8, [2], budget=parse_size("1G"), pure=True)
+        self.assertIs(result.selected.representation, Representation.KET)
+        self.assertEqual(parse_size("512M"), 512 * 2**20)
+
+    def test_simulation_fails_fast(self):
+        context = SimulationContext()
+        simulation = context.simulation
+        for i in range(12):
+            IdealCoherentSource(name=f"source{i}", context=context)
+        IdealPhaseShifter(name="shifter", context=context)
+        simulation.set_dimensions(10)
+        simulation.set_memory_budget(parse_size("1G"))
+        with self.assertRaises(MemoryBudgetExceededException):
+            simulation.run()
+        self.assertIsNone(context.experiment.state)
+
+        simulation.set_simulation_type(SimulationType.GAUSSIAN)
+        result = simulation.plan()
+        self.assertIs(result.selected.representation, Representation.GAUSSIAN)
+
+    def test_queued_hints(self):
+        context = SimulationContext()
+        backend = context.backend
+        backend.set_dimensions(4)
+        backend.initialize_number_state(1, [0])
+        backend.apply_operator(backend.beam_splitter(np.pi / 4, 0), [0, 1], True)
+        hints = queued_hints(context.experiment)
+        self.assertEqual(hints, {"pure": True, "photons": 1})
+        check_hints({"pure": True, "photons": 2}, hints)
+        with self.assertRaises(PlanHintException):
+            check_hints({"photons": 0}, hints)
+
+        backend.apply_operator(backend.displace(0.2, 0, 0), [1], True)
+        self.assertIsNone(queued_hints(context.experiment)["photons"])
+        context.experiment.add_channel(ops.lossChannel(0.5, 4), [0])
+        hints = queued_hints(context.experiment)
+        self.assertFalse(hints["pure"])
+        with self.assertRaises(PlanHintException):
+            check_hints({"pure": True}, hints)
+
+    def test_simulation_rejects_hints(self):
+        context = SimulationContext()
+        source = IdealCoherentSource(name="source", context=context)
+        shifter = IdealPhaseShifter(name="shifter", context=context)
+        for device, label, value in [
+            (source, "alpha", 0.5),
+            (source, "phi", 0.0),
+            (shifter, "theta", 0.3),
+        ]:
+            signal = GenericFloatSignal()
+            signal.set_float(value)
+            signal.set_computed()
+            device.register_signal(signal=signal, port_label=label)
+        trigger = GenericBoolSignal()
+        trigger.set_computed()
+        source.register_signal(signal=trigger, port_label="trigger")
+        signal = GenericQuantumSignal()
+        source.register_signal(signal=signal, port_label="output")
+        shifter.register_signal(signal=signal, port_label="input")
+        shifter.register_signal(signal=GenericQuantumSignal(), port_label="output")
+        context.simulation.set_dimensions(4)
+        # Displacement does not conserve the photon number
+        context.simulation.set_memory_budget(parse_size("1G"), pure=True, photons=1)
+        with self.assertRaises(PlanHintException):
+            context.simulation.run()
+        self.assertIsNone(context.experiment.state)
@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from qureed.simulation import CalendarQueueScheduler, HeapScheduler
+from qureed.simulation.simulation import SimulationEvent
+
+
+class Device:
+    pass
+
+
+class SchedulerTestMixin:
+    def make_scheduler(self):
+        raise NotImplementedError
+
+    def test_order(self):
+        scheduler = self.make_scheduler()
+        devices = [Device() for _ in range(10)]
+        times = [random.uniform(-1, 100) for _ in range(1000)]
+        for i, time in enumerate(times):
+            scheduler.push(SimulationEvent(time, devices[i % 10]))
+        self.assertEqual(len(scheduler), 1000)
+        popped = [scheduler.pop().event_time for _ in range(1000)]
+        self.assertEqual(popped, sorted(times))
+        self.assertFalse(scheduler)
+
+    def test_hold(self):
+        scheduler = self.make_scheduler()
+        now = 0
+        for _ in range(100):
+            scheduler.push(SimulationEvent(random.randint(0, 10**6), Device()))
+        for _ in range(5000):
+            event = scheduler.pop()
+            self.assertGreaterEqual(event.event_time, now)
+            now = event.event_time
+            scheduler.push(SimulationEvent(now + random.randint(1, 10**6), Device()))
+        self.assertEqual(len(scheduler), 100)
+
+    def test_merge(self):
+        scheduler = self.make_scheduler()
+        device = Device()
+        scheduler.push(SimulationEvent(5, device, signals={"A": 1}))
+        scheduler.push(SimulationEvent(5, device, signals={"B": 2}))
+        scheduler.push(SimulationEvent(5, Device(), signals={"A": 3}))
+        self.assertEqual(len(scheduler), 2)
+        event = scheduler.get(5, device)
+        self.assertEqual(event.kwargs["signals"], {"A": 1, "B": 2})
+        self.assertIsNone(scheduler.get(6, device))
+
+    def test_past_event(self):
+        scheduler = self.make_scheduler()
+        device = Device()
+        for time in range(100, 200):
+            scheduler.push(SimulationEvent(time, device))
+        self.assertEqual(scheduler.pop().event_time, 100)
+        scheduler.push(SimulationEvent(-1, device))
+        self.assertEqual(scheduler.pop().event_time, -1)
+        self.assertEqual(scheduler.pop().event_time, 101)
+
+    def test_clear(self):
+        scheduler = self.make_scheduler()
+        scheduler.push(SimulationEvent(1, Device()))
+        scheduler.clear()
+        self.assertEqual(len(scheduler), 0)
+        self.assertEqual(scheduler.events(), [])
+
+
+class TestHeapScheduler(SchedulerTestMixin, unittest.TestCase):
+    def make_scheduler(self):
+        return HeapScheduler()
+
+
+class TestCalendarQueueScheduler(SchedulerTestMixin, unittest.TestCase):
+    def make_scheduler(self):
+        return CalendarQueueScheduler()
+
+    def test_resize(self):
+        scheduler = self.make_scheduler()
+        device = Device()
+        for time in range(1000):
+            scheduler.push(SimulationEvent(time * 7, device))
+        self.assertGreaterEqual(scheduler.bucket_count, 500)
+        for _ in range(990):
+            scheduler.pop()
+        self.assertLess(scheduler.bucket_count, 64)
+        self.assertEqual(scheduler.pop().event_time, 990 * 7)
@@ -0,0 +1,152 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from qureed.simulation.sweep import ParameterSweep, SweepSpecException, _pad
+
+SCHEME = {
+    "devices": [
+        {
+            "device": "qureed.devices.variables.IntVariable",
+            "uuid": "variable",
+            "name": "Variable",
+            "values": {"value": 1},
+        },
+        {
+            "device": "qureed.devices.sources.IdealNPhotonSource",
+            "uuid": "source",
+            "name": "Source",
+        },
+    ],
+    "connections": [
+        {
+            "signal": "qureed.signals.GenericIntSignal",
+            "conn": [
+                {"device_uuid": "variable", "port": "int"},
+                {"device_uuid": "source", "port": "photon_num"},
+            ],
+        }
+    ],
+}
+
+
+FOCK_SCHEME = {
+    "devices": SCHEME["devices"]
+    + [
+        {
+            "device": "qureed.devices.detectors.IdealDetector",
+            "uuid": "detector",
+            "name": "Detector",
+        }
+    ],
+    "connections": SCHEME["connections"]
+    + [
+        {
+            "signal": "qureed.signals.GenericQuantumSignal",
+            "conn": [
+                {"device_uuid": "source", "port": "output"},
+                {"device_uuid": "detector", "port": "input"},
+            ],
+        }
+    ],
+}
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.scheme = Path(self.directory.name) / "experiment.json"
+        with open(self.scheme, "w", encoding="UTF-8") as f:
+            json.dump(SCHEME, f)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_points(self):
+        parameters = [
+            {"device": "a", "value": "x", "values": [1, 2]},
+            {"device": "b", "value": "y", "values": [3, 4]},
+        ]
+        grid = ParameterSweep(self.scheme, 1, {"parameters": parameters})
+        self.assertEqual(grid.points(), [(1, 3), (1, 4), (2, 3), (2, 4)])
+        zipped = ParameterSweep(
+            self.scheme, 1, {"mode": "list", "parameters": parameters}
+        )
+        self.assertEqual(zipped.points(), [(1, 3), (2, 4)])
+
+    def test_invalid_spec(self):
+        parameters = [{"device": "a", "value": "x", "values": [1]}]
+        with self.assertRaises(SweepSpecException):
+            ParameterSweep(self.scheme, 1, {"parameters": parameters}, sim_type="x")
+        with self.assertRaises(SweepSpecException):
+            ParameterSweep(self.scheme, 1, {"mode": "random", "parameters": []})
+        with self.assertRaises(SweepSpecException):
+            ParameterSweep(self.scheme, 1, {"parameters": [{"device": "a"}]})
+        with self.assertRaises(SweepSpecException):
+            ParameterSweep(
+                self.scheme,
+                1,
+                {
+                    "mode": "list",
+                    "parameters": [
+                        {"device": "a", "value": "x", "values": [1, 2]},
+                        {"device": "b", "value": "y", "values": [3]},
+                    ],
+                },
+            )
+
+    def test_run(self):
+        spec = {
+            "parameters": [
+                {"device": "variable", "value": "value", "values": [1, 2, 3]},
+                {"device": "missing", "value": "value", "values": [0]},
+            ]
+        }
+        sweep = ParameterSweep(self.scheme, 1, spec, workers=2)
+        columns = sweep.run()
+        output = Path(self.directory.name) / "sweep.npz"
+        sweep.save(output, columns)
+
+        results = np.load(output)
+        self.assertEqual(list(results["variable:value"]), [1, 2, 3])
+        self.assertEqual(list(results["status"]), ["error"] * 3)
+        self.assertIn("missing", results["error"][0])
+
+        spec["parameters"].pop()
+        columns = ParameterSweep(self.scheme, 1, spec, workers=2).run()
+        self.assertEqual(list(columns["status"]), ["ok"] * 3)
+        self.assertTrue(np.all(columns["events"] == 2))
+        self.assertEqual(columns["mean_photons"].shape, (3, 0))
+
+    def test_fock_observables(self):
+        with open(self.scheme, "w", encoding="UTF-8") as f:
+            json.dump(FOCK_SCHEME, f)
+        spec = {
+            "parameters": [
+                {"device": "variable", "value": "value", "values": [1, 2]},
+            ]
+        }
+        columns = ParameterSweep(
+            self.scheme, None, spec, workers=2, sim_type="fock"
+        ).run()
+        self.assertEqual(list(columns["status"]), ["ok"] * 2)
+        np.testing.assert_allclose(columns["mean_photons"], [[1], [2]], atol=1e-12)
+        self.assertEqual(columns["probabilities"].shape, (2, 1, 10))
+        np.testing.assert_allclose(columns["probabilities"][:, 0, :3], np.eye(3)[1:])
+
+        columns = ParameterSweep(
+            self.scheme, None, spec, workers=2, sim_type="fock", memory_budget="1K"
+        ).run()
+        self.assertEqual(list(columns["status"]), ["error"] * 2)
+        self.assertIn("MemoryBudgetExceededException", columns["error"][0])
+        self.assertEqual(columns["probabilities"].shape, (2, 0, 0))
+
+    def test_pad(self):
+        self.assertEqual(_pad([], 2).shape, (0, 0, 0))
+        padded = _pad([np.zeros((0, 0)), np.ones((1, 2)), np.zeros(0)], 2)
+        self.assertEqual(padded.shape, (3, 1, 2))
+        self.assertTrue(np.all(np.isnan(padded[0])))
+        np.testing.assert_array_equal(padded[1], [[1, 1]])
@@ -0,0 +1,80 @@
+import unittest
+
+import mpmath
+
+from qureed.devices.control import ClockTrigger
+from qureed.devices.variables import FloatVariable, IntVariable, TimeVariable
+from qureed.simulation import (
+    FEMTOSECOND,
+    PICOSECOND,
+    MpfTimeBase,
+    Simulation,
+    TickTimeBase,
+)
+from qureed.simulation.time_base import InvalidTimeResolutionException
+
+
+class TestTickTimeBase(unittest.TestCase):
+    def test_conversion(self):
+        time_base = TickTimeBase(FEMTOSECOND)
+        self.assertEqual(time_base.zero, 0)
+        self.assertEqual(time_base.from_seconds(1e-9), 1_000_000)
+        self.assertEqual(time_base.from_seconds(mpmath.mpf("1e-9")), 1_000_000)
+        self.assertIsInstance(time_base.from_seconds(2.5e-12), int)
+        self.assertAlmostEqual(time_base.to_seconds(1_000_000), 1e-9)
+
+    def test_resolution(self):
+        time_base = TickTimeBase(PICOSECOND)
+        self.assertEqual(time_base.from_seconds(1e-9), 1000)
+        with self.assertRaises(InvalidTimeResolutionException):
+            TickTimeBase(0)
+
+    def test_mpf_time_base(self):
+        time_base = MpfTimeBase()
+        self.assertEqual(time_base.from_seconds(0.5), 0.5)
+        self.assertIsInstance(time_base.to_seconds(mpmath.mpf("0.5")), float)
+
+
+class TestSimulationTimeBase(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation.get_instance()
+        self.previous = self.simulation.get_time_base()
+
+    def tearDown(self):
+        self.simulation.set_time_base(self.previous)
+
+    def test_set_time_base_converts_events(self):
+        self.simulation.set_time_base(TickTimeBase(FEMTOSECOND))
+        trigger = ClockTrigger(name="Clock", time=1e-9)
+        times = [
+            e.event_time for e in self.simulation.event_queue if e.device is trigger
+        ]
+        self.assertEqual(times, [1_000_000])
+
+        self.simulation.set_time_base(TickTimeBase(PICOSECOND))
+        times = [
+            e.event_time for e in self.simulation.event_queue if e.device is trigger
+        ]
+        self.assertEqual(times, [1000])
+        self.assertIsNotNone(self.simulation.scheduler.get(1000, trigger))
+
+    def test_clock_trigger_period(self):
+        self.simulation.set_time_base(TickTimeBase(FEMTOSECOND))
+        trigger = ClockTrigger(name="Clock")
+        trigger.frequency = 1e6
+        self.assertEqual(trigger._period(), 1_000_000_000)
+        self.assertTrue(trigger._should_trigger(3_000_000_000))
+        self.assertFalse(trigger._should_trigger(3_000_000_001))
+
+    def test_variable_time_in_seconds(self):
+        self.simulation.set_time_base(TickTimeBase(PICOSECOND))
+        variable = IntVariable(name="Variable", time=2e-9)
+        self.assertEqual(variable.time, 2000)
+        self.assertIsNotNone(self.simulation.scheduler.get(2000, variable))
+        self.simulation.stop_simulation()
+
+    def test_variables_start_before_zero(self):
+        self.simulation.set_time_base(TickTimeBase(PICOSECOND))
+        for variable in (FloatVariable(name="Float"), TimeVariable(name="Time")):
+            self.assertIsNotNone(self.simulation.scheduler.get(-(10**12), variable))
+        self.simulation.stop_simulation()
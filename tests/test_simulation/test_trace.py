@@ -0,0 +1,81 @@
+import unittest
+
+from qureed.devices import GenericDevice, log_action, schedule_next_event
+from qureed.devices.control import SimpleTrigger
+from qureed.devices.port import Port
+from qureed.extra import Loggers, get_custom_logger
+from qureed.signals import GenericBoolSignal
+from qureed.simulation import EventTrace, Simulation, TraceEventKind
+from qureed.simulation.trace import InvalidTraceCapacityException
+
+
+class Sink(GenericDevice):
+    ports = {
+        "input": Port(
+            label="input",
+            direction="input",
+            signal=None,
+            signal_type=GenericBoolSignal,
+            device=None,
+        ),
+    }
+    gui_icon = None
+    gui_name = "Sink"
+    reference = None
+
+    def __init__(self, name=None, uid=None, context=None):
+        super().__init__(name=name, uid=uid, context=context)
+        self.received = []
+
+    @log_action
+    @schedule_next_event
+    def des(self, time, *args, **kwargs):
+        self.received.append(time)
+
+
+class TestEventTrace(unittest.TestCase):
+    def test_ring_buffer(self):
+        trace = EventTrace(capacity=3)
+        a, b = object(), object()
+        for i in range(5):
+            trace.record(TraceEventKind.SCHEDULE, float(i), a, b)
+        records = trace.to_numpy()
+        self.assertEqual(len(trace), 3)
+        self.assertEqual(list(records["time"]), [2.0, 3.0, 4.0])
+        self.assertEqual(list(records["device"]), [0, 0, 0])
+        self.assertEqual(list(records["target"]), [1, 1, 1])
+        with self.assertRaises(InvalidTraceCapacityException):
+            EventTrace(capacity=0)
+
+
+class TestFastMode(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation.get_instance()
+        self.simulation.stop_simulation()
+
+    def tearDown(self):
+        self.simulation.set_fast_mode(False)
+        self.simulation.disable_trace()
+        self.simulation.stop_simulation()
+
+    def test_fast_mode_trace(self):
+        trigger = SimpleTrigger(name="Trigger")
+        sink = Sink(name="Sink")
+        signal = GenericBoolSignal()
+        trigger.register_signal(signal=signal, port_label="trigger")
+        sink.register_signal(signal=signal, port_label="input")
+
+        self.simulation.set_fast_mode()
+        trace = self.simulation.enable_trace(capacity=16)
+        with self.assertNoLogs(get_custom_logger(Loggers.Devices)):
+            self.simulation.run_des(1)
+
+        self.assertEqual(sink.received, [0])
+        records = trace.to_numpy()
+        self.assertEqual(
+            list(records["kind"]),
+            [TraceEventKind.PROCESS, TraceEventKind.SCHEDULE, TraceEventKind.PROCESS],
+        )
+        names = trace.device_names()
+        self.assertEqual(names[records["device"][1]], "Trigger")
+        self.assertEqual(names[records["target"][1]], "Sink")